@@ -0,0 +1,141 @@
+"""
+Микробенчмарки классов lab21, lab23 и lab24 на основе их doctest-примеров.
+
+Каждый doctest (все примеры одной docstring) компилируется в один фрагмент
+кода и многократно исполняется в копии пространства имён модуля. Результаты
+сохраняются в JSON и сравниваются с базовым прогоном.
+
+Пример:
+    python benchmarks/doctest_bench.py --save baseline.json
+    python benchmarks/doctest_bench.py --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import doctest
+import importlib.util
+import io
+import json
+import os
+import statistics
+import sys
+import timeit
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = {
+    "lab21": os.path.join("lab21", "main.py"),
+    "lab23": os.path.join("lab23", "task01.py"),
+    "lab24": os.path.join("lab24", "task01.py"),
+}
+
+# В lab23 нет doctest-примеров, поэтому нагрузка для него задана явно
+EXTRA_WORKLOADS = {
+    "lab23": {
+        "PaperBook": "PaperBook('name', 'author', 123)",
+        "AudioBook": "AudioBook('name', 'author', 12.3)",
+        "PaperBook.pages.setter": "book = PaperBook('name', 'author', 123)\nbook.pages = 200",
+        "PaperBook.__repr__": "repr(PaperBook('name', 'author', 123))",
+    },
+}
+
+
+def load_module(label: str, path: str) -> ModuleType:
+    """
+    Загрузка модуля по пути под уникальным именем; каталог модуля добавляется
+    в sys.path, чтобы работали импорты соседних файлов.
+    """
+    directory = os.path.join(ROOT, os.path.dirname(path))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(f"{label}_{os.path.basename(path)[:-3]}", os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_workloads() -> Dict[str, Tuple[str, dict]]:
+    """
+    Сбор нагрузок: имя → (исходный код, пространство имён модуля).
+    """
+    workloads = {}
+    finder = doctest.DocTestFinder(exclude_empty=True)
+    for label, path in MODULES.items():
+        module = load_module(label, path)
+        for test in finder.find(module):
+            if test.examples:
+                name = f"{label}.{test.name.split('.', 1)[1]}" if "." in test.name else label
+                workloads[name] = ("".join(example.source for example in test.examples), vars(module))
+        for name, source in EXTRA_WORKLOADS.get(label, {}).items():
+            workloads[f"{label}.{name}"] = (source, vars(module))
+    return workloads
+
+
+def measure(source: str, namespace: dict, repeat: int, warmup: float) -> Dict[str, float]:
+    """
+    Замер одной нагрузки: прогрев, подбор числа повторов и repeat замеров.
+
+    Возвращает лучшее и медианное время одного исполнения в секундах.
+    """
+    code = compile(source, "<doctest>", "exec")
+    timer = timeit.Timer(lambda: exec(code, dict(namespace)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        number, elapsed = timer.autorange()
+        while elapsed < warmup:
+            elapsed += timer.timeit(number)
+        runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(runs), "median": statistics.median(runs), "number": number}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Поиск регрессий: лучшее время выросло больше чем на threshold относительно базового.
+
+    >>> compare({"a": {"best": 1.3}, "b": {"best": 1.0}}, {"a": {"best": 1.0}, "b": {"best": 1.0}}, 0.2)
+    ['a: 1.000e+00 -> 1.300e+00 с (+30.0%)']
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = result["best"] / base["best"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {base['best']:.3e} -> {result['best']:.3e} с ({change:+.1%})")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", help="сохранить результаты в JSON-файл")
+    parser.add_argument("--baseline", help="JSON-файл базового прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустимый рост времени (доля)")
+    parser.add_argument("--repeat", type=int, default=5, help="количество замеров")
+    parser.add_argument("--warmup", type=float, default=0.2, help="время прогрева в секундах")
+    parser.add_argument("--filter", default="", help="замерять только нагрузки, содержащие подстроку")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (source, namespace) in collect_workloads().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(source, namespace, args.repeat, args.warmup)
+        print(f"{name:<55} {results[name]['best'] * 1e6:>10.2f} мкс  (медиана "
+              f"{results[name]['median'] * 1e6:.2f} мкс)")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for line in regressions:
+            print("РЕГРЕССИЯ", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
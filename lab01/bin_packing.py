@@ -0,0 +1,252 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Iterable, Tuple
+
+# Упаковка элементов разного размера в тома заданной ёмкости (обобщение task02.py).
+# Все функции возвращают пару (номера томов для каждого элемента в исходном
+# порядке, количество использованных томов).
+
+DISK_SIZE = 1.44 * 1024 * 1024
+
+
+def book_size(pages: int, lines: int, symbols: int, char: int) -> int:
+    """
+    Размер книги в байтах, как в task02.py.
+
+    >>> book_size(100, 50, 25, 4)
+    500000
+    >>> int(DISK_SIZE / book_size(100, 50, 25, 4))
+    3
+    """
+    return pages * lines * symbols * char
+
+
+class _MaxTree:
+    """
+    Дерево отрезков с максимумом свободного места по томам.
+
+    Позволяет за O(log n) найти первый том, в который помещается элемент.
+    Неоткрытые тома считаются пустыми, при нехватке листьев дерево удваивается.
+    """
+
+    def __init__(self, capacity: float, size: int = 1024):
+        self.capacity = capacity
+        self.leaves = 1
+        while self.leaves < size:
+            self.leaves *= 2
+        self.tree = array('d', [capacity]) * (2 * self.leaves)
+        self.used = 0
+
+    def _grow(self) -> None:
+        old_leaves, old_tree = self.leaves, self.tree
+        self.leaves *= 2
+        self.tree = array('d', [self.capacity]) * (2 * self.leaves)
+        self.tree[self.leaves:self.leaves + old_leaves] = old_tree[old_leaves:]
+        for node in range(self.leaves - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def place(self, size: float) -> int:
+        """
+        Кладёт элемент в первый подходящий том и возвращает его номер.
+        """
+        tree = self.tree
+        if tree[1] < size:
+            self._grow()
+            tree = self.tree
+        node = 1
+        while node < self.leaves:
+            node *= 2
+            if tree[node] < size:
+                node += 1
+        tree[node] -= size
+        index = node - self.leaves
+        node //= 2
+        while node:
+            best = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node //= 2
+        if index >= self.used:
+            self.used = index + 1
+        return index
+
+
+class _SortedBins:
+    """
+    Отсортированный список, разбитый на блоки ограниченного размера.
+
+    Вставка и удаление стоят O(log n + load) вместо O(n) у одного списка.
+    """
+
+    def __init__(self, load: int = 512):
+        self.load = load
+        self.blocks = []
+        self.maxes = []
+
+    def add(self, item: tuple) -> None:
+        """
+        Вставляет элемент с сохранением порядка.
+        """
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(item)
+            return
+        pos = bisect_left(self.maxes, item)
+        if pos == len(self.maxes):
+            pos -= 1
+        block = self.blocks[pos]
+        insort(block, item)
+        self.maxes[pos] = block[-1]
+        if len(block) > 2 * self.load:
+            self.blocks[pos:pos + 1] = [block[:self.load], block[self.load:]]
+            self.maxes[pos:pos + 1] = [block[self.load - 1], block[-1]]
+
+    def pop_ceiling(self, item: tuple):
+        """
+        Удаляет и возвращает наименьший элемент не меньше item или None.
+        """
+        pos = bisect_left(self.maxes, item)
+        if pos == len(self.maxes):
+            return None
+        block = self.blocks[pos]
+        found = block.pop(bisect_left(block, item))
+        if block:
+            self.maxes[pos] = block[-1]
+        else:
+            del self.blocks[pos]
+            del self.maxes[pos]
+        return found
+
+
+def _check_sizes(sizes: array, capacity: float) -> None:
+    if capacity <= 0:
+        raise ValueError("Ёмкость тома должна быть положительной")
+    if sizes and (max(sizes) > capacity or min(sizes) < 0):
+        raise ValueError("Размер элемента должен быть в диапазоне от 0 до ёмкости тома")
+
+
+def _place_decreasing(sizes: array, place: Callable[[float], int]) -> array:
+    """
+    Вызывает place для размеров по убыванию (равные — в исходном порядке) и
+    возвращает номера томов в исходном порядке элементов.
+
+    Сортируется копия размеров в array('d'), а не список индексов: номер тома
+    элемента находится бинарным поиском его размера в отсортированном массиве,
+    taken считает уже выданные номера для равных размеров.
+
+    >>> order = []
+    >>> _place_decreasing(array('d', [1, 3, 1, 2]), lambda size: order.append(size) or len(order) - 1), order
+    (array('l', [2, 0, 3, 1]), [3.0, 2.0, 1.0, 1.0])
+    """
+    ordered = array('d', sorted(sizes))
+    placed = array('l', [0]) * len(ordered)
+    for k in range(len(ordered) - 1, -1, -1):
+        placed[k] = place(ordered[k])
+    taken = array('l', [0]) * len(ordered)
+    assignment = array('l', [0]) * len(sizes)
+    for i, size in enumerate(sizes):
+        last = bisect_right(ordered, size) - 1  # равные размеры размещались с конца своего отрезка
+        assignment[i] = placed[last - taken[last]]
+        taken[last] += 1
+    return assignment
+
+
+def first_fit(sizes: Iterable[float], capacity: float) -> Tuple[array, int]:
+    """
+    Онлайн-упаковка First Fit: элементы обрабатываются в порядке поступления.
+
+    Подходит для потока размеров: в памяти хранятся только номера томов
+    и дерево свободного места.
+
+    >>> first_fit(iter([5, 7, 5, 3]), 10)
+    (array('l', [0, 1, 0, 1]), 2)
+    """
+    if capacity <= 0:
+        raise ValueError("Ёмкость тома должна быть положительной")
+    tree = _MaxTree(capacity)
+    assignment = array('l')
+    for size in sizes:
+        if not 0 <= size <= capacity:
+            raise ValueError("Размер элемента должен быть в диапазоне от 0 до ёмкости тома")
+        assignment.append(tree.place(size))
+    return assignment, tree.used
+
+
+def first_fit_decreasing(sizes: Iterable[float], capacity: float) -> Tuple[array, int]:
+    """
+    First Fit Decreasing: элементы по убыванию размера кладутся в первый подходящий том.
+
+    Размеры читаются из потока в компактный array('d') и сортируются без
+    списка индексов (см. _place_decreasing). Поиск тома — O(log n) по дереву
+    отрезков.
+
+    >>> first_fit_decreasing([2, 5, 4, 7, 1, 3, 8], 10)
+    (array('l', [0, 2, 2, 1, 2, 1, 0]), 3)
+    """
+    sizes = array('d', sizes)
+    _check_sizes(sizes, capacity)
+    tree = _MaxTree(capacity, len(sizes))
+    return _place_decreasing(sizes, tree.place), tree.used
+
+
+def best_fit_decreasing(sizes: Iterable[float], capacity: float) -> Tuple[array, int]:
+    """
+    Best Fit Decreasing: элемент кладётся в том с наименьшим подходящим остатком.
+
+    Открытые тома хранятся в блочном отсортированном по остатку списке,
+    подходящий том ищется бинарным поиском за O(log n).
+
+    >>> best_fit_decreasing([2, 5, 4, 7, 1, 3, 8], 10)
+    (array('l', [0, 2, 2, 1, 2, 1, 0]), 3)
+    """
+    sizes = array('d', sizes)
+    _check_sizes(sizes, capacity)
+    remaining = _SortedBins()  # пары (остаток, номер тома), упорядоченные по остатку
+    used = 0
+
+    def place(size: float) -> int:
+        nonlocal used
+        found = remaining.pop_ceiling((size, -1))
+        if found is None:
+            free, bin_id = capacity, used
+            used += 1
+        else:
+            free, bin_id = found
+        if free - size > 0:
+            remaining.add((free - size, bin_id))
+        return bin_id
+
+    return _place_decreasing(sizes, place), used
+
+
+def lower_bound(sizes: Iterable[float], capacity: float) -> int:
+    """
+    Нижняя оценка количества томов: суммарный размер, делённый на ёмкость.
+
+    >>> lower_bound([2, 5, 4, 7, 1, 3, 8], 10)
+    3
+    """
+    total = sum(sizes)
+    return int(-(-total // capacity))
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    import sys
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    print("Количество книг, помещающихся на дискету:", int(DISK_SIZE / book_size(100, 50, 25, 4)))
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rnd = random.Random(0)
+    items = array('d', (book_size(rnd.randint(10, 280), 50, 25, rnd.choice((1, 2, 4))) for _ in range(count)))
+    print(f"{count} элементов, нижняя оценка: {lower_bound(items, DISK_SIZE)} томов")
+    for name, func in (("first fit", first_fit), ("first fit decreasing", first_fit_decreasing),
+                       ("best fit decreasing", best_fit_decreasing)):
+        start = default_timer()
+        _, used = func(items, DISK_SIZE)
+        print(f"{name}: {used} томов за {default_timer() - start:.1f} с")
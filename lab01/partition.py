@@ -0,0 +1,166 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, List, Optional, Sequence
+
+# Разбиение участников на k команд.
+# Игрок — любой объект, рейтинг берётся функцией key (по умолчанию сам объект —
+# число). Для пакетной обработки в пуле процессов key должен быть picklable,
+# например operator.itemgetter(1) для пар (имя, рейтинг).
+
+
+def _check_teams(teams: int) -> None:
+    if not isinstance(teams, int) or teams <= 0:
+        raise ValueError("Количество команд должно быть положительным целым числом")
+
+
+def split_by_slice(players: Sequence, teams: int = 2) -> List[list]:
+    """
+    Быстрое разбиение срезами по порядку в списке, как в task03.py.
+
+    Первые команды получают по len(players) // teams игроков, остаток уходит
+    в последнюю команду.
+
+    >>> split_by_slice(["Маша", "Петя", "Саша", "Оля", "Кирилл", "Коля"])
+    [['Маша', 'Петя', 'Саша'], ['Оля', 'Кирилл', 'Коля']]
+    >>> split_by_slice([1, 2, 3, 4, 5], teams=2)
+    [[1, 2], [3, 4, 5]]
+    """
+    _check_teams(teams)
+    team_size = len(players) // teams
+    bounds = [team_size * i for i in range(teams)] + [len(players)]
+    return [list(players[bounds[i]:bounds[i + 1]]) for i in range(teams)]
+
+
+def split_greedy(players: Iterable, teams: int = 2, key: Optional[Callable] = None) -> List[list]:
+    """
+    Жадное разбиение LPT: игроки по убыванию рейтинга уходят в самую слабую команду.
+
+    Команды хранятся в куче по сумме рейтинга, каждая вставка — O(log k).
+
+    >>> split_greedy([8, 7, 6, 5, 4], teams=2)
+    [[8, 5, 4], [7, 6]]
+    >>> split_greedy([("Маша", 3), ("Петя", 1), ("Саша", 2)], teams=2, key=lambda p: p[1])
+    [[('Маша', 3)], [('Саша', 2), ('Петя', 1)]]
+    """
+    _check_teams(teams)
+    key = key or _identity
+    result = [[] for _ in range(teams)]
+    heap = [(0, i) for i in range(teams)]
+    for player in sorted(players, key=key, reverse=True):
+        total, i = heapq.heappop(heap)
+        result[i].append(player)
+        heapq.heappush(heap, (total + key(player), i))
+    return result
+
+
+def split_karmarkar_karp(players: Iterable, teams: int = 2, key: Optional[Callable] = None) -> List[list]:
+    """
+    Разбиение методом Кармаркара–Карпа (largest differencing method) на k команд.
+
+    Каждый игрок начинается как частичное разбиение с одной непустой командой.
+    Два разбиения с наибольшим разбросом сумм сливаются так, что самая сильная
+    команда одного объединяется с самой слабой другого. Обычно даёт меньший
+    разброс, чем жадный метод.
+
+    >>> teams = split_karmarkar_karp([8, 7, 6, 5, 4], teams=2)
+    >>> sorted(sum(team) for team in teams)
+    [14, 16]
+    """
+    _check_teams(teams)
+    key = key or _identity
+    heap = []
+    for order, player in enumerate(players):
+        rating = key(player)
+        # Разбиение: список (сумма, игроки) по убыванию суммы
+        subsets = [(rating, [player])] + [(0, []) for _ in range(teams - 1)]
+        heap.append((-rating, order, subsets))
+    if not heap:
+        return [[] for _ in range(teams)]
+    heapq.heapify(heap)
+
+    while len(heap) > 1:
+        _, order, first = heapq.heappop(heap)
+        _, _, second = heapq.heappop(heap)
+        merged = [(a_sum + b_sum, a_players + b_players)
+                  for (a_sum, a_players), (b_sum, b_players) in zip(first, reversed(second))]
+        merged.sort(key=lambda subset: subset[0], reverse=True)
+        heapq.heappush(heap, (-(merged[0][0] - merged[-1][0]), order, merged))
+
+    return [subset for _, subset in heap[0][2]]
+
+
+def spread(teams: Sequence[Sequence], key: Optional[Callable] = None) -> float:
+    """
+    Разброс сумм рейтинга между сильнейшей и слабейшей командой.
+
+    >>> spread([[8, 5, 4], [7, 6]])
+    4
+    """
+    key = key or _identity
+    totals = [sum(key(player) for player in team) for team in teams]
+    return max(totals) - min(totals)
+
+
+METHODS = {
+    "slice": lambda players, teams, key: split_by_slice(players, teams),
+    "lpt": split_greedy,
+    "kk": split_karmarkar_karp,
+}
+
+
+def _split(players: Sequence, teams: int, key: Optional[Callable], method: str) -> List[list]:
+    return METHODS[method](players, teams, key)
+
+
+def split_many(tournaments: Iterable[Sequence], teams: int = 2, key: Optional[Callable] = None,
+               method: str = "kk", workers: Optional[int] = None, chunksize: int = 64) -> List[List[list]]:
+    """
+    Разбиение множества турниров в пуле процессов.
+
+    :param tournaments: Списки игроков по турнирам
+    :param teams: Количество команд в каждом турнире
+    :param key: Функция рейтинга (должна быть picklable)
+    :param method: "slice", "lpt" или "kk"
+    :param workers: Количество процессов, по умолчанию — число ядер
+    :param chunksize: Сколько турниров передавать процессу за раз
+    :return: Разбиения в порядке исходных турниров
+
+    >>> split_many([[4, 3, 2, 1], [5, 5]], teams=2, method="lpt", workers=1)
+    [[[4, 1], [3, 2]], [[5], [5]]]
+    """
+    _check_teams(teams)
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method!r}")
+    func = partial(_split, teams=teams, key=key, method=method)
+    if workers == 1:
+        return [func(players) for players in tournaments]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tournaments, chunksize=chunksize))
+
+
+def _identity(value):
+    return value
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    from timeit import timeit
+
+    doctest.testmod()
+
+    list_players = ["Маша", "Петя", "Саша", "Оля", "Кирилл", "Коля"]
+    for team in split_by_slice(list_players):
+        print(team)
+
+    # Бенчмарк: качество баланса и время на 2000 турниров по 300 игроков
+    rnd = random.Random(0)
+    tournaments = [[rnd.randint(1000, 3000) for _ in range(300)] for _ in range(2000)]
+    for method in METHODS:
+        result = []
+        elapsed = timeit(lambda: result.extend(split_many(tournaments, teams=8, method=method, workers=1)), number=1)
+        avg_spread = sum(spread(teams) for teams in result) / len(result)
+        print(f"{method}: {elapsed:.2f} с, средний разброс {avg_spread:.1f}")
+    elapsed = timeit(lambda: split_many(tournaments, teams=8, method="kk"), number=1)
+    print(f"kk в пуле процессов: {elapsed:.2f} с")
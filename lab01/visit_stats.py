@@ -0,0 +1,281 @@
+import math
+from hashlib import blake2b
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# Потоковая статистика посещений, обобщающая task04.py.
+# Уникальные пользователи считаются точно, пока их не больше threshold,
+# затем множество заменяется на HyperLogLog с фиксированным объёмом памяти.
+
+TOTAL_KEY = "Общее количество"
+UNIQUE_KEY = "Уникальные посещения"
+
+
+class HyperLogLog:
+    """
+    Вероятностный счётчик уникальных значений.
+
+    Использует 2 ** precision однобайтовых регистров, стандартная ошибка
+    около 1.04 / sqrt(2 ** precision) (0.8% при precision=14).
+
+    >>> hll = HyperLogLog(precision=10)
+    >>> for i in range(1000):
+    ...     hll.add(f"user{i % 500}")
+    >>> abs(len(hll) - 500) < 25
+    True
+    """
+
+    def __init__(self, precision: int = 14):
+        if not isinstance(precision, int) or not 4 <= precision <= 18:
+            raise ValueError("Precision должен быть целым числом от 4 до 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Hashable) -> None:
+        """
+        Добавляет значение в счётчик.
+        """
+        x = int.from_bytes(blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Объединяет счётчик с другим счётчиком той же точности.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Нельзя объединить HyperLogLog с разной точностью")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def __len__(self) -> int:
+        """
+        Возвращает оценку количества уникальных значений.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Поправка для малых значений: линейный подсчёт
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class UniqueCounter:
+    """
+    Счётчик уникальных значений: точное множество до threshold, затем HyperLogLog.
+
+    Значения сравниваются по str(value) в обоих режимах, как их хеширует
+    HyperLogLog, поэтому 1 и "1" — одно значение и до, и после перехода.
+
+    >>> counter = UniqueCounter(threshold=2)
+    >>> for user in ['user1', 'user2', 'user1']:
+    ...     counter.add(user)
+    >>> len(counter), counter.is_exact
+    (2, True)
+    >>> counter.add('user3')
+    >>> len(counter), counter.is_exact
+    (3, False)
+    >>> counter = UniqueCounter()
+    >>> for user in [1, '1', 2]:
+    ...     counter.add(user)
+    >>> len(counter)
+    2
+    """
+
+    def __init__(self, threshold: int = 100_000, precision: int = 14):
+        self.threshold = threshold
+        self.precision = precision
+        self.exact: Optional[set] = set()
+        self.sketch: Optional[HyperLogLog] = None
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        True, пока значение считается точно.
+        """
+        return self.exact is not None
+
+    def add(self, value: Hashable) -> None:
+        """
+        Добавляет значение, переходя на HyperLogLog при превышении порога.
+        """
+        if self.exact is None:
+            self.sketch.add(value)
+            return
+        self.exact.add(str(value))
+        if len(self.exact) > self.threshold:
+            self._to_sketch()
+
+    def merge(self, other: "UniqueCounter") -> None:
+        """
+        Объединяет счётчик с частичным результатом другого обработчика.
+        """
+        if self.exact is not None and other.exact is not None:
+            self.exact |= other.exact
+            if len(self.exact) > self.threshold:
+                self._to_sketch()
+            return
+        if self.exact is not None:
+            self._to_sketch()
+        if other.exact is not None:
+            for value in other.exact:
+                self.sketch.add(value)
+        else:
+            self.sketch.merge(other.sketch)
+
+    def copy(self) -> "UniqueCounter":
+        """
+        Независимая копия счётчика.
+        """
+        counter = UniqueCounter(self.threshold, self.precision)
+        if self.exact is not None:
+            counter.exact = set(self.exact)
+        else:
+            counter.exact = None
+            counter.sketch = HyperLogLog(self.precision)
+            counter.sketch.registers = bytearray(self.sketch.registers)
+        return counter
+
+    def _to_sketch(self) -> None:
+        self.sketch = HyperLogLog(self.precision)
+        for value in self.exact:
+            self.sketch.add(value)
+        self.exact = None
+
+    def __len__(self) -> int:
+        return len(self.exact) if self.exact is not None else len(self.sketch)
+
+
+def parse_line(line: str) -> Tuple[Optional[float], str]:
+    """
+    Разбирает строку журнала вида "<unix-время> <пользователь>" или "<пользователь>".
+
+    >>> parse_line("1700000000 user1\\n")
+    (1700000000.0, 'user1')
+    >>> parse_line("user2")
+    (None, 'user2')
+    """
+    fields = line.split()
+    if len(fields) == 1:
+        return None, fields[0]
+    return float(fields[0]), fields[-1]
+
+
+class VisitStats:
+    """
+    Агрегатор статистики посещений с ключами как в task04.py.
+
+    Поддерживает разбиение по временным корзинам длиной bucket_seconds
+    и объединение частичных агрегатов от параллельных обработчиков.
+
+    >>> stats = VisitStats()
+    >>> stats.update(['user1', 'user2', 'user3', 'user1', 'user4', 'user2'])
+    >>> stats.result()
+    {'Общее количество': 6, 'Уникальные посещения': 4}
+    """
+
+    def __init__(self, threshold: int = 100_000, precision: int = 14, bucket_seconds: Optional[int] = None):
+        self.threshold = threshold
+        self.precision = precision
+        self.bucket_seconds = bucket_seconds
+        self.total = 0
+        self.uniques = UniqueCounter(threshold, precision)
+        self.buckets: Dict[int, Tuple[int, UniqueCounter]] = {}
+
+    def add(self, user: Hashable, timestamp: Optional[float] = None) -> None:
+        """
+        Учитывает одно посещение.
+        """
+        self.total += 1
+        self.uniques.add(user)
+        if self.bucket_seconds is not None and timestamp is not None:
+            bucket = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+            count, counter = self.buckets.get(bucket) or (0, UniqueCounter(self.threshold, self.precision))
+            counter.add(user)
+            self.buckets[bucket] = (count + 1, counter)
+
+    def update(self, users: Iterable[Hashable]) -> None:
+        """
+        Учитывает посещения из итерируемого источника идентификаторов.
+        """
+        for user in users:
+            self.add(user)
+
+    def read_lines(self, lines: Iterable[str], parse: Callable[[str], Tuple[Optional[float], str]] = parse_line
+                   ) -> None:
+        """
+        Лениво читает строки журнала (например, открытый файл), пропуская пустые.
+
+        >>> stats = VisitStats(bucket_seconds=60)
+        >>> stats.read_lines(["0 user1", "30 user2", "", "61 user1"])
+        >>> stats.bucket_results()
+        {0: {'Общее количество': 2, 'Уникальные посещения': 2}, 60: {'Общее количество': 1, 'Уникальные посещения': 1}}
+        """
+        for line in lines:
+            if line.strip():
+                timestamp, user = parse(line)
+                self.add(user, timestamp)
+
+    def merge(self, other: "VisitStats") -> None:
+        """
+        Объединяет агрегат с частичным агрегатом другого обработчика; other не изменяется.
+
+        >>> first, second = VisitStats(), VisitStats()
+        >>> first.update(['user1', 'user2'])
+        >>> second.update(['user2', 'user3'])
+        >>> first.merge(second)
+        >>> first.result()
+        {'Общее количество': 4, 'Уникальные посещения': 3}
+        >>> first, second = VisitStats(bucket_seconds=60), VisitStats(bucket_seconds=60)
+        >>> second.add('user1', 0)
+        >>> first.merge(second)
+        >>> first.add('user2', 1)
+        >>> second.bucket_results()
+        {0: {'Общее количество': 1, 'Уникальные посещения': 1}}
+        """
+        self.total += other.total
+        self.uniques.merge(other.uniques)
+        for bucket, (count, counter) in other.buckets.items():
+            if bucket in self.buckets:
+                own_count, own_counter = self.buckets[bucket]
+                own_counter.merge(counter)
+                self.buckets[bucket] = (own_count + count, own_counter)
+            else:
+                self.buckets[bucket] = (count, counter.copy())
+
+    def result(self) -> Dict[str, int]:
+        """
+        Возвращает статистику в формате task04.py.
+        """
+        return {TOTAL_KEY: self.total, UNIQUE_KEY: len(self.uniques)}
+
+    def bucket_results(self) -> Dict[int, Dict[str, int]]:
+        """
+        Возвращает статистику по временным корзинам, упорядоченную по времени.
+        """
+        return {bucket: {TOTAL_KEY: count, UNIQUE_KEY: len(counter)}
+                for bucket, (count, counter) in sorted(self.buckets.items())}
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
+
+    users = ['user1', 'user2', 'user3', 'user1', 'user4', 'user2']
+    stat = VisitStats()
+    stat.update(users)
+    print(stat.result())
+
+    # Четыре "обработчика" по 250 тысяч посещений, порог точного подсчёта — 10 тысяч
+    parts = []
+    for worker in range(4):
+        part = VisitStats(threshold=10_000)
+        part.update(f"user{(worker * 250_000 + i) % 300_000}" for i in range(250_000))
+        parts.append(part)
+    for part in parts[1:]:
+        parts[0].merge(part)
+    print(parts[0].result(), "(точное значение уникальных: 300000)")
@@ -0,0 +1,258 @@
+import math
+from typing import Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него пакетный расчёт идёт по формулам
+    np = None
+
+# Расчёт сценариев из task01.py и task02.py без помесячной симуляции.
+# Траты в месяце k (с нуля) равны spend * (1 + increase) ** k, поэтому сумма
+# трат за n месяцев — геометрическая прогрессия.
+
+MAX_MONTHS = 10_000  # верхняя граница поиска для сценариев, где деньги не кончаются
+
+
+def _check_increase(increase: float) -> None:
+    # Формулы и бисекция в months_until_debt рассчитаны на неубывающие траты
+    if not increase >= 0:
+        raise ValueError("Рост цен increase должен быть неотрицательным числом")
+
+
+def total_spend(spend: float, increase: float, months: int) -> float:
+    """
+    Сумма трат за `months` месяцев при ежемесячном росте цен `increase`.
+
+    >>> total_spend(100, 0.0, 3)
+    300.0
+    >>> round(total_spend(100, 0.1, 2), 6)
+    210.0
+    """
+    if increase == 0:
+        return float(spend * months)
+    return spend * ((1 + increase) ** months - 1) / increase
+
+
+def required_capital(salary: float, spend: float, months: int, increase: float) -> float:
+    """
+    Подушка безопасности, чтобы протянуть `months` месяцев (аналог task02.py).
+
+    >>> round(required_capital(5000, 6000, 10, 0.03), 2)
+    18783.28
+    >>> required_capital(5000, 6000, 10, -0.03)
+    Traceback (most recent call last):
+    ...
+    ValueError: Рост цен increase должен быть неотрицательным числом
+    >>> required_capital(5000, 6000, 100_000, 0.5)
+    Traceback (most recent call last):
+    ...
+    ValueError: Сумма трат за 100000 месяцев не помещается в float
+    """
+    _check_increase(increase)
+    if months < 0:
+        raise ValueError("Количество месяцев должно быть неотрицательным")
+    try:
+        capital = total_spend(spend, increase, months) - salary * months
+    except OverflowError:
+        capital = math.inf
+    if not math.isfinite(capital):
+        raise ValueError(f"Сумма трат за {months} месяцев не помещается в float")
+    return capital
+
+
+def simulate_required_capital(salary: float, spend: float, months: int, increase: float) -> float:
+    """
+    Помесячная симуляция из task02.py, используется для сверки и бенчмарка.
+
+    >>> round(simulate_required_capital(5000, 6000, 10, 0.03), 2)
+    18783.28
+    """
+    money_capital = 0
+    month_count = 0
+    while months > month_count:
+        money_capital += spend
+        money_capital -= salary
+        spend *= (1 + increase)
+        month_count += 1
+    return money_capital
+
+
+def simulate_months(money_capital: float, salary: float, spend: float, increase: float) -> int:
+    """
+    Помесячная симуляция из task01.py, включая начальное `money_capital += salary`.
+
+    >>> simulate_months(20000, 5000, 6000, 0.05)
+    8
+    """
+    months = 0
+    money_capital += salary
+    while money_capital >= spend and months < MAX_MONTHS:
+        money_capital -= spend
+        money_capital += salary
+        spend *= (1 + increase)
+        months += 1
+    return months
+
+
+def _balance(money_capital: float, salary: float, spend: float, increase: float, k: int) -> float:
+    """
+    Остаток после проверки месяца k: капитал перед месяцем k минус траты месяца k.
+
+    Капитал перед месяцем k равен money_capital + salary * (k + 1) - total_spend(k),
+    лишний salary — это начальный шаг из task01.py. Если траты не помещаются
+    в float, остаток равен минус бесконечности.
+    """
+    try:
+        return (money_capital + salary * (k + 1) - total_spend(spend, increase, k)
+                - spend * (1 + increase) ** k)
+    except OverflowError:
+        return -math.inf
+
+
+def months_until_debt(money_capital: float, salary: float, spend: float, increase: float) -> int:
+    """
+    Количество месяцев без долгов (аналог task01.py) за O(log n).
+
+    Остаток как функция номера месяца вогнутый (линейный доход минус
+    выпуклые траты), поэтому месяцы без долгов идут подряд с нуля и первый
+    отрицательный месяц ищется экспоненциальным поиском и бисекцией.
+    Если деньги не кончаются, возвращается MAX_MONTHS, как и у simulate_months.
+
+    >>> months_until_debt(20000, 5000, 6000, 0.05)
+    8
+    >>> months_until_debt(0, 5000, 6000, 0.0)
+    0
+    >>> months_until_debt(100, 5000, 4000, 0.0) == MAX_MONTHS
+    True
+    >>> months_until_debt(10 ** 300, 5000, 6000, 0.5) == simulate_months(10 ** 300, 5000, 6000, 0.5)
+    True
+    """
+    _check_increase(increase)
+    if _balance(money_capital, salary, spend, increase, 0) < 0:
+        return 0
+
+    hi = 1
+    while hi < MAX_MONTHS and _balance(money_capital, salary, spend, increase, hi) >= 0:
+        hi *= 2
+    if hi >= MAX_MONTHS:
+        if _balance(money_capital, salary, spend, increase, MAX_MONTHS - 1) >= 0:
+            return MAX_MONTHS
+        hi = MAX_MONTHS - 1
+
+    lo = hi // 2  # _balance(lo) >= 0, _balance(hi) < 0
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _balance(money_capital, salary, spend, increase, mid) >= 0:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def months_until_debt_batch(scenarios: Iterable[Tuple[float, float, float, float]]) -> List[int]:
+    """
+    Пакетный расчёт months_until_debt для набора (capital, salary, spend, increase).
+
+    При наличии NumPy формула остатка _balance считается сразу для всех
+    сценариев, а первый отрицательный месяц ищется одновременной бисекцией
+    по [0, MAX_MONTHS) — около log2(MAX_MONTHS) векторных шагов вместо
+    помесячной симуляции. Без NumPy months_until_debt вызывается для каждого
+    сценария.
+
+    >>> months_until_debt_batch([(20000, 5000, 6000, 0.05), (0, 5000, 6000, 0.0), (100, 5000, 4000, 0.0)])
+    [8, 0, 10000]
+    >>> months_until_debt_batch([(20000, 5000, 6000, -0.05)])
+    Traceback (most recent call last):
+    ...
+    ValueError: Рост цен increase должен быть неотрицательным числом
+    """
+    scenarios = list(scenarios)
+    if np is None or not scenarios:
+        return [months_until_debt(*scenario) for scenario in scenarios]
+
+    capital, salary, spend, increase = (np.array(column, dtype=float) for column in zip(*scenarios))
+    _check_increase(increase.min())  # NaN тоже даёт ошибку: min его сохраняет
+    growth = 1 + increase
+    safe = np.where(increase == 0, 1.0, increase)
+
+    def solvent(k):
+        # _balance(k) >= 0 поэлементно для массива номеров месяцев k; переполнение трат даёт -inf, то есть долг
+        with np.errstate(over="ignore"):
+            grown = growth ** k
+            spent = np.where(increase == 0, spend * k, spend * (grown - 1) / safe)
+            return capital + salary * (k + 1) - spent - spend * grown >= 0
+
+    # Месяцы без долгов идут подряд с нуля, поэтому ищется граница: solvent(lo) или lo == -1, не solvent(hi)
+    lo = np.full(len(scenarios), -1, dtype=np.int64)
+    hi = np.full(len(scenarios), MAX_MONTHS - 1, dtype=np.int64)
+    never = solvent(hi)
+    while True:
+        searching = hi - lo > 1
+        if not searching.any():
+            break
+        mid = (lo + hi) // 2
+        ok = solvent(mid)
+        lo = np.where(searching & ok, mid, lo)
+        hi = np.where(searching & ~ok, mid, hi)
+    return np.where(never, MAX_MONTHS, hi).tolist()
+
+
+def required_capital_batch(scenarios: Iterable[Tuple[float, float, int, float]]) -> List[float]:
+    """
+    Пакетный расчёт required_capital для набора (salary, spend, months, increase).
+
+    >>> [round(x, 2) for x in required_capital_batch([(5000, 6000, 10, 0.03), (5000, 6000, 2, 0.0)])]
+    [18783.28, 2000.0]
+    >>> required_capital_batch([(5000, 6000, 10, 0.03), (5000, 6000, 100_000, 0.5)])
+    Traceback (most recent call last):
+    ...
+    ValueError: Сумма трат за 100000 месяцев не помещается в float
+    """
+    scenarios = list(scenarios)
+    if np is None or not scenarios:
+        return [required_capital(*scenario) for scenario in scenarios]
+
+    salary, spend, months, increase = (np.array(column, dtype=float) for column in zip(*scenarios))
+    _check_increase(increase.min())
+    if months.min() < 0:
+        raise ValueError("Количество месяцев должно быть неотрицательным")
+    safe = np.where(increase == 0, 1.0, increase)
+    with np.errstate(over="ignore"):
+        spent = np.where(increase == 0, spend * months, spend * ((1 + increase) ** months - 1) / safe)
+    capital = spent - salary * months
+    overflow = ~np.isfinite(capital)
+    if overflow.any():
+        raise ValueError(f"Сумма трат за {months[overflow.argmax()]:.0f} месяцев не помещается в float")
+    return capital.tolist()
+
+
+def _random_scenarios(count: int, seed: int = 0) -> Sequence[Tuple[float, float, float, float]]:
+    import random
+
+    rnd = random.Random(seed)
+    return [(rnd.uniform(0, 1_000_000), rnd.uniform(1000, 10_000), rnd.uniform(1000, 12_000), rnd.uniform(0, 0.01))
+            for _ in range(count)]
+
+
+if __name__ == "__main__":
+    import doctest
+    from timeit import timeit
+
+    doctest.testmod()
+
+    scenarios = _random_scenarios(20_000)
+    loop_time = timeit(lambda: [simulate_months(*s) for s in scenarios], number=1)
+    solver_time = timeit(lambda: [months_until_debt(*s) for s in scenarios], number=1)
+    batch_time = timeit(lambda: months_until_debt_batch(scenarios), number=1)
+    mismatches = sum(simulate_months(*s) != months_until_debt(*s) for s in scenarios)
+    print(f"task01: цикл {loop_time:.3f} с, формула {solver_time:.3f} с, "
+          f"пакет {batch_time:.3f} с ({len(scenarios)} сценариев, расхождений: {mismatches})")
+
+    capital_scenarios = [(salary, spend, int(capital) % 240, increase)
+                         for capital, salary, spend, increase in scenarios]
+    loop_time = timeit(lambda: [simulate_required_capital(*s) for s in capital_scenarios], number=1)
+    batch_time = timeit(lambda: required_capital_batch(capital_scenarios), number=1)
+    max_error = max(math.fabs(simulate_required_capital(*s) - required_capital(*s)) / max(1.0, s[1] * s[2])
+                    for s in capital_scenarios)
+    print(f"task02: цикл {loop_time:.3f} с, формула {batch_time:.3f} с "
+          f"(максимальное относительное отклонение {max_error:.2e})")
@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from task03 import calculate_frequency, count_letters
+
+DEFAULT_MAX_ENTRIES = 4096
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+def content_key(text):
+    """
+    Ключ кеша — хеш содержимого строки (BLAKE2b, 16 байт)
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def merge_counts(counts_list):
+    """
+    Сумма словарей с количеством букв
+
+    >>> merge_counts([{"а": 1, "б": 2}, {"а": 3}])
+    {'а': 4, 'б': 2}
+    """
+    total = {}
+    for counts in counts_list:
+        for letter, count in counts.items():
+            total[letter] = total.get(letter, 0) + count
+    return total
+
+
+class FrequencyCache:
+    """
+    Кеш результатов count_letters и calculate_frequency.
+
+    Записи хранятся по хешу содержимого текста, количество записей ограничено
+    (вытесняются давно не использованные). Текст документа делится на абзацы,
+    количество букв документа складывается из закешированных количеств по
+    абзацам, поэтому после правки одного абзаца заново считается только он.
+    Разделители абзацев не буквы, так что сумма совпадает с count_letters
+    для всего текста. Кеш можно сохранить на диск и загрузить при создании.
+
+    >>> cache = FrequencyCache()
+    >>> cache.count_letters("Аб\\n\\nба") == count_letters("Аб\\n\\nба")
+    True
+    >>> cache.count_letters("Аб\\n\\nвв")
+    {'а': 1, 'б': 1, 'в': 2}
+    >>> cache.paragraph_hits, cache.paragraph_misses
+    (1, 3)
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None, separator=PARAGRAPH_SEPARATOR):
+        """
+        :param max_entries: Максимальное количество записей (документы и абзацы вместе)
+        :param path: Файл для сохранения кеша на диск; если он есть, кеш загружается из него
+        :param separator: Разделитель абзацев
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries должен быть положительным числом")
+        self.max_entries = max_entries
+        self.path = path
+        self.separator = separator
+        self.entries = OrderedDict()  # ключ -> [количество букв, частоты или None]
+        self.hits = self.misses = 0
+        self.paragraph_hits = self.paragraph_misses = 0
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as file:
+                self.entries.update(pickle.load(file))
+            while len(self.entries) > max_entries:
+                self.entries.popitem(last=False)
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _put(self, key, counts):
+        entry = self.entries[key] = [counts, None]
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def _paragraph_counts(self, paragraph):
+        key = content_key(paragraph)
+        entry = self._get(key)
+        if entry is not None:
+            self.paragraph_hits += 1
+            return entry[0]
+        self.paragraph_misses += 1
+        return self._put(key, count_letters(paragraph))[0]
+
+    def _entry(self, text):
+        key = content_key(text)
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        paragraphs = text.split(self.separator)
+        if len(paragraphs) == 1:
+            counts = count_letters(text)
+        else:
+            counts = merge_counts(self._paragraph_counts(paragraph) for paragraph in paragraphs)
+        return self._put(key, counts)
+
+    def count_letters(self, text):
+        """
+        Количество каждой буквы в тексте, как у count_letters
+        """
+        return dict(self._entry(text)[0])
+
+    def calculate_frequency(self, text):
+        """
+        Частота каждой буквы в тексте, как у calculate_frequency(count_letters(text))
+        """
+        entry = self._entry(text)
+        if entry[1] is None:
+            entry[1] = calculate_frequency(entry[0])
+        return dict(entry[1])
+
+    @property
+    def hit_rate(self):
+        """
+        Доля запросов документов, найденных в кеше
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self, path=None):
+        """
+        Сохранение кеша на диск; файл заменяется атомарно
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("Не задан файл для сохранения кеша")
+        with open(path + ".tmp", "wb") as file:
+            pickle.dump(list(self.entries.items()), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    import tempfile
+    from timeit import default_timer
+
+    from task03 import main_str
+
+    doctest.testmod()
+
+    rnd = random.Random(0)
+    stanzas = main_str.strip().split("\n")
+    documents = ["\n\n".join(rnd.choice(stanzas) * 20 for _ in range(50)) for _ in range(200)]
+    requests = [rnd.choice(documents) for _ in range(5000)]
+
+    start = default_timer()
+    for text in requests:
+        calculate_frequency(count_letters(text))
+    baseline = (default_timer() - start) / len(requests)
+    print(f"без кеша: {baseline * 1e6:.0f} мкс на документ")
+
+    cache = FrequencyCache()
+    start = default_timer()
+    for text in requests:
+        cache.calculate_frequency(text)
+    elapsed = (default_timer() - start) / len(requests)
+    print(f"с кешем: {elapsed * 1e6:.0f} мкс на документ, попадания документов {cache.hit_rate:.1%}, "
+          f"абзацев {cache.paragraph_hits / (cache.paragraph_hits + cache.paragraph_misses):.1%}")
+
+    # Правка одного абзаца: пересчитывается только он
+    edited = []
+    for text in documents:
+        paragraphs = text.split("\n\n")
+        paragraphs[rnd.randrange(len(paragraphs))] += " правка"
+        edited.append("\n\n".join(paragraphs))
+    misses = cache.paragraph_misses
+    start = default_timer()
+    results = [cache.count_letters(text) for text in edited]
+    elapsed = (default_timer() - start) / len(edited)
+    assert results == [count_letters(text) for text in edited]
+    print(f"после правки одного абзаца: {elapsed * 1e6:.0f} мкс на документ, "
+          f"пересчитано абзацев на документ {(cache.paragraph_misses - misses) / len(edited):.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frequency.cache")
+        cache.save(path)
+        start = default_timer()
+        restored = FrequencyCache(path=path)
+        restored.calculate_frequency(requests[0])
+        print(f"загрузка с диска: {(default_timer() - start) * 1e3:.1f} мс, {len(restored.entries)} записей, "
+              f"попадание {restored.hit_rate:.0%}")
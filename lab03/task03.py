@@ -69,9 +69,10 @@ main_str = """
 Свои мне сказки говорил.
 """
 
-# TODO Распечатайте в столбик букву и её частоту в тексте
-letter_counts = count_letters(main_str)
-letter_frequency = calculate_frequency(letter_counts)
+if __name__ == "__main__":
+    # TODO Распечатайте в столбик букву и её частоту в тексте
+    letter_counts = count_letters(main_str)
+    letter_frequency = calculate_frequency(letter_counts)
 
-for letter, frequency in letter_frequency.items():
-    print(f"{letter}: {frequency:.2f}")
+    for letter, frequency in letter_frequency.items():
+        print(f"{letter}: {frequency:.2f}")
@@ -0,0 +1,214 @@
+import csv
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from task01 import weighted_score
+
+
+class FileResult(NamedTuple):
+    """
+    Результат обработки одного файла: score для JSON, строки для CSV или текст ошибки
+    """
+    path: str
+    kind: str
+    score: Optional[float] = None
+    rows: Optional[List[Dict[str, str]]] = None
+    error: Optional[str] = None
+
+
+class BatchReport(NamedTuple):
+    """
+    Итог пакетной обработки
+    """
+    results: List[FileResult]
+    total_score: float
+    rows: List[Dict[str, str]]
+    elapsed: float
+
+    @property
+    def failed(self) -> List[FileResult]:
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def files_per_sec(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+def discover(source: str) -> List[str]:
+    """
+    Список JSON и CSV файлов в каталоге или по glob-шаблону
+    """
+    if os.path.isdir(source):
+        pattern_paths = glob.glob(os.path.join(source, "*.json")) + glob.glob(os.path.join(source, "*.csv"))
+    else:
+        pattern_paths = glob.glob(source, recursive=True)
+    return sorted(path for path in pattern_paths if path.endswith((".json", ".csv")))
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def file_kind(path: str) -> str:
+    return "json" if path.endswith(".json") else "csv"
+
+
+def failed_result(path: str, error: BaseException) -> FileResult:
+    return FileResult(path, file_kind(path), error=f"{type(error).__name__}: {error}")
+
+
+def parse_file(path: str, data: bytes) -> FileResult:
+    """
+    Разбор содержимого файла; выполняется в пуле процессов, ошибки не выходят наружу
+
+    >>> parse_file("a.json", b'[{"score": 0.5, "weight": 2}]')
+    FileResult(path='a.json', kind='json', score=1.0, rows=None, error=None)
+    >>> parse_file("b.csv", b"a,b\\n1,2\\n").rows
+    [{'a': '1', 'b': '2'}]
+    >>> parse_file("c.json", b"[{").error
+    'JSONDecodeError: Expecting property name enclosed in double quotes: line 1 column 3 (char 2)'
+    """
+    kind = file_kind(path)
+    try:
+        text = data.decode()
+        if kind == "json":
+            return FileResult(path, kind, score=weighted_score(json.loads(text)))
+        return FileResult(path, kind, rows=list(csv.DictReader(io.StringIO(text, newline=""))))
+    except Exception as e:  # сбой одного файла не должен прерывать весь пакет
+        return failed_result(path, e)
+
+
+def _parse_in_pool(jobs: Iterable[Tuple[str, bytes]], workers: Optional[int]) \
+        -> Tuple[Dict[str, FileResult], List[Tuple[str, bytes, BrokenProcessPool]]]:
+    """
+    Разбор файлов (путь, содержимое) в новом пуле процессов.
+
+    Возвращает результаты и файлы, разбор которых прервало падение процесса
+    пула: после падения все незавершённые задачи пула получают
+    BrokenProcessPool, и по ошибке нельзя понять, какой файл её вызвал.
+    """
+    results, broken = {}, []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parses = {}
+        for path, data in jobs:
+            try:
+                parses[pool.submit(parse_file, path, data)] = path, data
+            except BrokenProcessPool as e:
+                broken.append((path, data, e))
+        for future in as_completed(parses):
+            path, data = parses[future]
+            try:
+                results[path] = future.result()
+            except BrokenProcessPool as e:
+                broken.append((path, data, e))
+    return results, broken
+
+
+def run_batch(source: str, output: Optional[str] = None, workers: Optional[int] = None,
+              io_workers: int = 16) -> BatchReport:
+    """
+    Пакетная обработка файлов: чтение в пуле потоков, разбор в пуле процессов.
+
+    Чтение следующих файлов идёт одновременно с разбором уже прочитанных:
+    каждый прочитанный файл сразу отправляется на разбор. Результаты
+    JSON-файлов суммируются, строки CSV-файлов объединяются и, если задан
+    output, записываются в один JSON с отступами 4, как в task02.py. Файл,
+    который не удалось прочитать или разобрать, попадает в failed, остальные
+    файлы обрабатываются.
+
+    Если процесс пула падает, файлы, не успевшие разобраться, повторяются в
+    новом пуле, а прерванные и там делятся пополам и повторяются дальше. Так
+    ошибку BrokenProcessPool получает только файл, на котором падает процесс.
+
+    >>> import tempfile
+    >>> tmp = tempfile.mkdtemp()
+    >>> for name, text in [("a.json", '[{"score": 0.5, "weight": 2}]'), ("b.csv", "a,b\\n1,2\\n"), ("c.json", "[")]:
+    ...     with open(os.path.join(tmp, name), "w") as f:
+    ...         _ = f.write(text)
+    >>> report = run_batch(tmp, workers=1)
+    >>> report.total_score, report.rows, [result.path[len(tmp) + 1:] for result in report.failed]
+    (1.0, [{'a': '1', 'b': '2'}], ['c.json'])
+
+    Процесс, разбирающий crash.json, завершается аварийно:
+
+    >>> import batch
+    >>> original = batch.parse_file
+    >>> def parse_file(path, data):
+    ...     if path.endswith("crash.json"):
+    ...         os._exit(1)
+    ...     return original(path, data)
+    >>> for i in range(8):
+    ...     with open(os.path.join(tmp, f"d{i}.json"), "w") as f:
+    ...         _ = f.write('[{"score": 1, "weight": 1}]')
+    >>> with open(os.path.join(tmp, "crash.json"), "w") as f:
+    ...     _ = f.write("[]")
+    >>> batch.parse_file = parse_file
+    >>> try:
+    ...     report = batch.run_batch(tmp, workers=2)
+    ... finally:
+    ...     batch.parse_file = original
+    >>> report.total_score, [(result.path[len(tmp) + 1:], result.error.split(":")[0]) for result in report.failed]
+    (9.0, [('c.json', 'JSONDecodeError'), ('crash.json', 'BrokenProcessPool')])
+    """
+    paths = discover(source)
+    start = time.perf_counter()
+    results: Dict[str, FileResult] = {}
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+        reads = {io_pool.submit(read_file, path): path for path in paths}
+
+        def loaded():
+            for future in as_completed(reads):
+                try:
+                    yield reads[future], future.result()
+                except OSError as e:
+                    results[reads[future]] = failed_result(reads[future], e)
+
+        parsed, broken = _parse_in_pool(loaded(), workers)
+    results.update(parsed)
+    # Прерванные файлы повторяются в новых пулах, делясь пополам, пока упавший файл не останется один
+    groups = [broken]
+    while groups:
+        group = groups.pop()
+        if not group:
+            continue
+        parsed, broken = _parse_in_pool(((path, data) for path, data, _ in group), workers)
+        results.update(parsed)
+        if len(group) == 1 and broken:
+            path, _, error = broken[0]
+            results[path] = failed_result(path, error)
+        else:
+            groups += [broken[:len(broken) // 2], broken[len(broken) // 2:]]
+
+    ordered = [results[path] for path in paths]
+    total_score = round(sum(result.score for result in ordered if result.score is not None), 3)
+    rows = [row for result in ordered if result.rows is not None for row in result.rows]
+    if output is not None:
+        with open(output, "w") as odata:
+            json.dump(rows, odata, indent=4)
+    return BatchReport(ordered, total_score, rows, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Пакетная обработка JSON/CSV файлов lab04")
+    parser.add_argument("source", help="каталог или glob-шаблон")
+    parser.add_argument("--output", help="файл для объединённого JSON из CSV")
+    parser.add_argument("--workers", type=int, help="количество процессов разбора")
+    args = parser.parse_args()
+
+    report = run_batch(args.source, args.output, args.workers)
+    for result in report.failed:
+        print(f"Ошибка {result.path}: {result.error}")
+    print(f"Файлов: {len(report.results)}, с ошибками: {len(report.failed)}")
+    print(f"Суммарный score: {report.total_score}")
+    print(f"Строк CSV: {len(report.rows)}")
+    print(f"Скорость: {report.files_per_sec:.0f} файлов/с")
@@ -0,0 +1,216 @@
+import csv
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64  # сколько отрезков сливается за один проход
+READER_BYTES = 32 * 1024  # буферы файла, декодированный текст и csv.reader одного отрезка при слиянии
+POINTER_SIZE = 8
+# Пара (ключ, строка) и три ссылки на неё: в буфере, в массиве ключей и во временном массиве слияния list.sort
+ENTRY_SIZE = sys.getsizeof((None, None)) + 3 * POINTER_SIZE
+
+
+def _sizeof(row: List[str], row_key: object) -> int:
+    # Размер записи буфера в памяти: пара (ключ, строка), список полей, сами поля и ключ
+    return ENTRY_SIZE + sys.getsizeof(row) + sum(map(sys.getsizeof, row)) + sys.getsizeof(row_key)
+
+
+def _write_run(rows: Iterable[List[str]], tmp_dir: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=".csv", dir=tmp_dir)
+    with os.fdopen(fd, "w", newline="") as file:
+        csv.writer(file).writerows(rows)
+    return path
+
+
+def _read_run(path: str) -> Iterator[List[str]]:
+    with open(path, newline="") as file:
+        yield from csv.reader(file)
+
+
+def _merge_runs(paths: List[str], key: Callable[[List[str]], object], tmp_dir: str, fan_in: int) -> Iterator[List[str]]:
+    """
+    k-путевое слияние отрезков кучей; если отрезков больше fan_in, они сливаются в несколько проходов
+    """
+    while len(paths) > fan_in:
+        merged = []
+        for i in range(0, len(paths), fan_in):
+            group = paths[i:i + fan_in]
+            merged.append(_write_run(heapq.merge(*map(_read_run, group), key=key), tmp_dir))
+            for path in group:
+                os.remove(path)
+        paths = merged
+    yield from heapq.merge(*map(_read_run, paths), key=key)
+
+
+def sort_rows(rows: Iterable[List[str]], key: Callable[[List[str]], object], memory_bytes: int = DEFAULT_MEMORY_BYTES,
+              fan_in: int = DEFAULT_FAN_IN, tmp_dir: Optional[str] = None) -> Iterator[List[str]]:
+    """
+    Внешняя сортировка слиянием строк CSV.
+
+    Ключ каждой строки вычисляется при чтении, строка с некорректным ключом
+    сразу даёт ValueError. Строки вместе с ключами набираются, пока их размер
+    в памяти (по sys.getsizeof строки, её полей и ключа) не достигнет
+    memory_bytes за вычетом памяти на буферы чтения сливаемых отрезков, затем
+    сортируются и записываются во временный файл (отрезок). Отрезки
+    сливаются кучей с сохранением устойчивости. Если все строки поместились
+    в память, временные файлы не создаются.
+
+    >>> rows = [["b", "2"], ["a", "3"], ["c", "1"], ["d", "2"]]
+    >>> list(sort_rows(rows, key=lambda row: int(row[1]), memory_bytes=40))
+    [['c', '1'], ['b', '2'], ['d', '2'], ['a', '3']]
+    >>> list(sort_rows([["b", "2"], ["a", "x"]], key=lambda row: int(row[1])))
+    Traceback (most recent call last):
+    ...
+    ValueError: Некорректная строка 2: ['a', 'x']
+    """
+    if memory_bytes <= 0:
+        raise ValueError("memory_bytes должен быть положительным числом")
+    # На буферы чтения отрезков при слиянии отводится не больше четверти memory_bytes, остальное — на отрезок
+    fan_in = max(2, min(fan_in, memory_bytes // (4 * READER_BYTES)))
+    run_bytes = max(memory_bytes - fan_in * READER_BYTES, 1)
+    work_dir = tempfile.mkdtemp(prefix="external_sort_", dir=tmp_dir)
+    try:
+        paths, buffer, size = [], [], 0
+        for number, row in enumerate(rows, 1):
+            try:
+                row_key = key(row)
+            except (ValueError, IndexError) as error:
+                raise ValueError(f"Некорректная строка {number}: {row!r}") from error
+            buffer.append((row_key, row))
+            size += _sizeof(row, row_key)
+            if size >= run_bytes:
+                buffer.sort(key=itemgetter(0))
+                paths.append(_write_run(map(itemgetter(1), buffer), work_dir))
+                buffer, size = [], 0
+        buffer.sort(key=itemgetter(0))
+        if not paths:
+            yield from map(itemgetter(1), buffer)
+            return
+        if buffer:
+            paths.append(_write_run(map(itemgetter(1), buffer), work_dir))
+        del buffer
+        yield from _merge_runs(paths, key, work_dir, fan_in)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _column_key(header: List[str], column: str, sign: int = 1) -> Callable[[List[str]], float]:
+    """
+    Ключ по числовому столбцу; строка с другим количеством полей, чем в заголовке, считается некорректной.
+    """
+    index, width = header.index(column), len(header)
+
+    def key(row: List[str]) -> float:
+        if len(row) != width:
+            raise ValueError(f"ожидалось полей: {width}, получено: {len(row)}")
+        return sign * float(row[index])
+    return key
+
+
+def sort_csv(input_filename: str, output_filename: str, column: str, memory_bytes: int = DEFAULT_MEMORY_BYTES,
+             reverse: bool = False, tmp_dir: Optional[str] = None) -> int:
+    """
+    Сортировка CSV-файла по числовому столбцу; возвращает количество строк.
+
+    Некорректная строка (другое количество полей или нечисловое значение)
+    даёт ValueError при чтении, до записи выходного файла.
+    """
+    with open(input_filename, newline="") as idata, open(output_filename, "w", newline="") as odata:
+        reader = csv.reader(idata)
+        header = next(reader)
+        key = _column_key(header, column, -1 if reverse else 1)
+        writer = csv.writer(odata)
+        writer.writerow(header)
+        count = 0
+        for row in sort_rows(reader, key, memory_bytes, tmp_dir=tmp_dir):
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def group_by(rows: Iterable[List[str]], key: Callable[[List[str]], object], value_indices: Dict[str, int]) \
+        -> Iterator[Tuple[object, int, Dict[str, float]]]:
+    """
+    Потоковая группировка строк, отсортированных по тому же ключу key.
+
+    Для каждой группы возвращается (ключ, количество, {имя: среднее значение}).
+    В памяти хранится только текущая группа.
+
+    >>> rows = [["1", "10"], ["1.0", "20"], ["2", "5"]]
+    >>> list(group_by(rows, lambda row: float(row[0]), {"value": 1}))
+    [(1.0, 2, {'value': 15.0}), (2.0, 1, {'value': 5.0})]
+    """
+    for group_key, group in groupby(rows, key=key):
+        count = 0
+        sums = dict.fromkeys(value_indices, 0.0)
+        for row in group:
+            count += 1
+            for name, index in value_indices.items():
+                sums[name] += float(row[index])
+        yield group_key, count, {name: total / count for name, total in sums.items()}
+
+
+def group_csv(input_filename: str, column: str, value_columns: Iterable[str],
+              memory_bytes: int = DEFAULT_MEMORY_BYTES, tmp_dir: Optional[str] = None) \
+        -> Iterator[Tuple[float, int, Dict[str, float]]]:
+    """
+    Группировка CSV-файла по числовому столбцу (например, housing_median_age)
+    со средними по value_columns; файл может не помещаться в память.
+
+    Строки сортируются и группируются по одному и тому же ключу — числовому
+    значению столбца, поэтому "5" и "5.0" попадают в одну группу.
+    """
+    with open(input_filename, newline="") as idata:
+        reader = csv.reader(idata)
+        header = next(reader)
+        key = _column_key(header, column)
+        value_indices = {name: header.index(name) for name in value_columns}
+        yield from group_by(sort_rows(reader, key, memory_bytes, tmp_dir=tmp_dir), key, value_indices)
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import tracemalloc
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    memory_bytes = int(sys.argv[1]) if len(sys.argv) > 1 else 8 * 1024 * 1024
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "housing.csv"), os.path.join(tmp, "sorted.csv")
+        with open(src, "w") as file:
+            file.write("longitude,latitude,housing_median_age,total_rooms,total_bedrooms,population,"
+                       "households,median_income,median_house_value\n")
+            while file.tell() < 10 * memory_bytes:
+                file.write(f"{rnd.uniform(-124.35, -114.31):.6f},{rnd.uniform(32.54, 41.95):.6f},"
+                           f"{rnd.randint(1, 52)}.000000,{rnd.randint(2, 40000)}.000000,{rnd.randint(1, 6500)}.000000,"
+                           f"{rnd.randint(3, 35000)}.000000,{rnd.randint(1, 6000)}.000000,"
+                           f"{rnd.uniform(0.5, 15.0001):.6f},{rnd.randint(15000, 500001)}.000000\n")
+        size = os.path.getsize(src)
+        print(f"файл {size / 2 ** 20:.0f} МиБ, бюджет памяти {memory_bytes / 2 ** 20:.0f} МиБ")
+
+        start = default_timer()
+        count = sort_csv(src, dst, "median_house_value", memory_bytes, tmp_dir=tmp)
+        elapsed = default_timer() - start
+        print(f"сортировка {count} строк по median_house_value: {elapsed:.1f} с, {size / 2 ** 20 / elapsed:.1f} МиБ/с")
+
+        with open(dst, newline="") as file:
+            values = [float(row[-1]) for row in islice(csv.reader(file), 1, None)]
+        assert len(values) == count and all(a <= b for a, b in zip(values, islice(values, 1, None)))
+
+        # Пиковый объём памяти Python-объектов (tracemalloc замедляет работу, поэтому без замера времени)
+        tracemalloc.start()
+        groups = list(group_csv(src, "housing_median_age", ["median_house_value", "median_income"], memory_bytes,
+                                tmp_dir=tmp))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"группировка по housing_median_age: групп {len(groups)}, пик памяти {peak / 2 ** 20:.1f} МиБ")
+        print("возраст 1:", groups[0])
@@ -0,0 +1,258 @@
+import csv
+import math
+import os
+import struct
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+INCOME_BINS_PER_UNIT = 10
+INCOME_BIN = 1 / INCOME_BINS_PER_UNIT  # ширина корзины гистограммы median_income
+INCOME_BINS = 160  # доходы от 0 до 16 (в наборе данных максимум 15.0001)
+GRID_MAGIC = b"GRD1"
+GRID_HEADER = struct.Struct("<4sII")
+GRID_CELL = struct.Struct("<iiIddfff")
+
+Cell = Tuple[int, int]
+
+
+def cell_index(text: str, cells_per_unit: int) -> int:
+    """
+    floor(значение * cells_per_unit) для десятичной строки в целых числах.
+
+    Строка разбирается как число с фиксированной точкой, поэтому значения
+    ровно на границе ячейки не сдвигаются в соседнюю из-за округления float.
+
+    >>> cell_index("37.37", 100), cell_index("4.35", 100), cell_index("-122.05", 10)
+    (3737, 435, -1221)
+    >>> cell_index("-0.5", 1), cell_index("1e-2", 100), cell_index("15", 10)
+    (-1, 1, 150)
+    """
+    text = text.strip()
+    if "e" in text or "E" in text:
+        return math.floor(Decimal(text) * cells_per_unit)
+    whole, _, fraction = text.partition(".")
+    return int(whole + fraction) * cells_per_unit // 10 ** len(fraction)
+
+
+class GridStats:
+    """
+    Агрегаты по ячейкам сетки longitude/latitude.
+
+    Ячейка — пара целых (x, y) = (floor(longitude * cells_per_degree), floor(latitude * cells_per_degree)),
+    вычисляемых в целых числах по десятичной записи координат (см. cell_index).
+    Для каждой ячейки хранятся количество записей, суммы median_house_value и
+    population и гистограмма median_income. Все накопители складываются,
+    поэтому части файла можно обрабатывать независимо и объединять через merge.
+
+    >>> stats = GridStats(cells_per_degree=10)
+    >>> stats.add_rows([("-122.05", "37.37", "344700", "1537", "6.6085"),
+    ...                 ("-122.01", "37.31", "100000", "463", "2.5")])
+    >>> stats.cells()
+    [(-1221, 373)]
+    >>> stats.mean_value((-1221, 373)), stats.total_population((-1221, 373))
+    (222350.0, 2000.0)
+    >>> round(stats.income_percentile((-1221, 373), 50), 2)
+    2.6
+
+    Координаты ровно на границе ячейки попадают в ячейку, которая с неё начинается:
+
+    >>> boundary = GridStats(cells_per_degree=100)
+    >>> boundary.add_rows([("4.35", "37.37", "1", "1", "0.3")])
+    >>> boundary.cells(), boundary.income_hist[(435, 3737)][3]
+    ([(435, 3737)], 1)
+    """
+
+    def __init__(self, cells_per_degree: int = 10):
+        """
+        :param cells_per_degree: Количество ячеек на градус (разрешение сетки)
+        """
+        if not isinstance(cells_per_degree, int) or cells_per_degree <= 0:
+            raise ValueError("cells_per_degree должен быть положительным целым числом")
+        self.cells_per_degree = cells_per_degree
+        self.count: Dict[Cell, int] = {}
+        self.value_sum: Dict[Cell, float] = {}
+        self.population_sum: Dict[Cell, float] = {}
+        self.income_hist: Dict[Cell, array] = {}
+
+    def add_rows(self, rows: Iterable[Tuple[str, str, str, str, str]]) -> None:
+        """
+        Добавление строк (longitude, latitude, median_house_value, population, median_income)
+        """
+        scale = self.cells_per_degree
+        count, value_sum, population_sum = self.count, self.value_sum, self.population_sum
+        income_hist = self.income_hist
+        for longitude, latitude, value, population, income in rows:
+            cell = (cell_index(longitude, scale), cell_index(latitude, scale))
+            hist = income_hist.get(cell)
+            if hist is None:
+                hist = income_hist[cell] = array('l', bytes(INCOME_BINS * array('l').itemsize))
+                count[cell] = value_sum[cell] = population_sum[cell] = 0
+            count[cell] += 1
+            value_sum[cell] += float(value)
+            population_sum[cell] += float(population)
+            hist[min(max(cell_index(income, INCOME_BINS_PER_UNIT), 0), INCOME_BINS - 1)] += 1
+
+    def merge(self, other: "GridStats") -> "GridStats":
+        """
+        Объединение с агрегатами другой части данных (той же сетки)
+        """
+        if other.cells_per_degree != self.cells_per_degree:
+            raise ValueError("Нельзя объединить сетки разного разрешения")
+        for cell, hist in other.income_hist.items():
+            own = self.income_hist.get(cell)
+            if own is None:
+                self.income_hist[cell] = array('l', hist)
+                self.count[cell] = other.count[cell]
+                self.value_sum[cell] = other.value_sum[cell]
+                self.population_sum[cell] = other.population_sum[cell]
+                continue
+            for i, n in enumerate(hist):
+                if n:
+                    own[i] += n
+            self.count[cell] += other.count[cell]
+            self.value_sum[cell] += other.value_sum[cell]
+            self.population_sum[cell] += other.population_sum[cell]
+        return self
+
+    def cells(self) -> List[Cell]:
+        return sorted(self.count)
+
+    def bounds(self, cell: Cell) -> Tuple[float, float, float, float]:
+        """
+        Границы ячейки (min_longitude, min_latitude, max_longitude, max_latitude)
+        """
+        x, y = cell
+        return x / self.cells_per_degree, y / self.cells_per_degree, \
+            (x + 1) / self.cells_per_degree, (y + 1) / self.cells_per_degree
+
+    def mean_value(self, cell: Cell) -> float:
+        return self.value_sum[cell] / self.count[cell]
+
+    def total_population(self, cell: Cell) -> float:
+        return self.population_sum[cell]
+
+    def income_percentile(self, cell: Cell, q: float) -> float:
+        """
+        Процентиль median_income в ячейке по гистограмме (линейно внутри корзины)
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("Процентиль должен быть в диапазоне от 0 до 100")
+        hist = self.income_hist[cell]
+        target = self.count[cell] * q / 100
+        seen = 0
+        for i, n in enumerate(hist):
+            if n and seen + n >= target:
+                return (i + (target - seen) / n) * INCOME_BIN
+            seen += n
+        return INCOME_BINS * INCOME_BIN
+
+
+def read_chunks(filename: str, chunk_size: int = 100_000) -> Iterator[List[Tuple[str, ...]]]:
+    """
+    Чтение нужных столбцов CSV блоками по chunk_size строк
+    """
+    columns = ("longitude", "latitude", "median_house_value", "population", "median_income")
+    with open(filename, newline="") as idata:
+        reader = csv.reader(idata)
+        header = next(reader)
+        indices = [header.index(column) for column in columns]
+        while True:
+            chunk = [tuple(row[i] for i in indices) for row in islice(reader, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+
+def _aggregate_chunk(args: Tuple[int, List[Tuple[str, ...]]]) -> GridStats:
+    cells_per_degree, chunk = args
+    stats = GridStats(cells_per_degree)
+    stats.add_rows(chunk)
+    return stats
+
+
+def aggregate(filename: str, cells_per_degree: int = 10, chunk_size: int = 100_000,
+              workers: Optional[int] = 1) -> GridStats:
+    """
+    Агрегация CSV по сетке; при workers != 1 блоки обрабатываются в пуле процессов.
+
+    В обработке одновременно не больше 2 * workers блоков: следующий блок
+    читается, когда результат самого старого объединён, поэтому память не
+    зависит от размера файла.
+    """
+    chunks = ((cells_per_degree, chunk) for chunk in read_chunks(filename, chunk_size))
+    stats = GridStats(cells_per_degree)
+    if workers == 1:
+        for chunk_stats in map(_aggregate_chunk, chunks):
+            stats.merge(chunk_stats)
+        return stats
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(_aggregate_chunk, chunk) for chunk in islice(chunks, window))
+        while pending:
+            stats.merge(pending.popleft().result())
+            for chunk in islice(chunks, 1):
+                pending.append(pool.submit(_aggregate_chunk, chunk))
+    return stats
+
+
+def write_grid(filename: str, stats: GridStats) -> None:
+    """
+    Запись сетки в компактный двоичный файл.
+
+    Для каждой ячейки: x, y, количество, средняя стоимость, население и
+    процентили дохода p10, p50, p90 — 40 байт на ячейку.
+    """
+    with open(filename, "wb") as odata:
+        odata.write(GRID_HEADER.pack(GRID_MAGIC, stats.cells_per_degree, len(stats.count)))
+        for cell in stats.cells():
+            odata.write(GRID_CELL.pack(*cell, stats.count[cell], stats.mean_value(cell),
+                                       stats.total_population(cell),
+                                       *(stats.income_percentile(cell, q) for q in (10, 50, 90))))
+
+
+def read_grid(filename: str) -> Tuple[int, List[tuple]]:
+    """
+    Чтение файла сетки: (cells_per_degree, [(x, y, count, mean_value, population, p10, p50, p90), ...])
+    """
+    with open(filename, "rb") as idata:
+        magic, cells_per_degree, size = GRID_HEADER.unpack(idata.read(GRID_HEADER.size))
+        if magic != GRID_MAGIC:
+            raise ValueError("Неизвестный формат файла сетки")
+        return cells_per_degree, list(GRID_CELL.iter_unpack(idata.read(size * GRID_CELL.size)))
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import sys
+    import tempfile
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "housing.csv")
+        with open(src, "w") as file:
+            file.write("longitude,latitude,housing_median_age,total_rooms,total_bedrooms,population,"
+                       "households,median_income,median_house_value\n")
+            for _ in range(count):
+                file.write(f"{rnd.uniform(-124.35, -114.31):.6f},{rnd.uniform(32.54, 41.95):.6f},{rnd.randint(1, 52)},"
+                           f"{rnd.randint(2, 40000)},{rnd.randint(1, 6500)},{rnd.randint(3, 35000)},"
+                           f"{rnd.randint(1, 6000)},{rnd.uniform(0.5, 15.0001):.4f},{rnd.randint(15000, 500001)}\n")
+
+        for workers in (1, None):
+            start = default_timer()
+            stats = aggregate(src, cells_per_degree=10, workers=workers)
+            print(f"агрегация {count} строк, процессов {workers or os.cpu_count()}: {default_timer() - start:.2f} с, "
+                  f"ячеек {len(stats.count)}")
+
+        grid = os.path.join(tmp, "housing.grid")
+        write_grid(grid, stats)
+        print(f"файл сетки: {os.path.getsize(grid)} байт (CSV {os.path.getsize(src) // 2 ** 20} МиБ)")
+        assert read_grid(grid)[1][0][:3] == (*stats.cells()[0], stats.count[stats.cells()[0]])
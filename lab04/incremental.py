@@ -0,0 +1,215 @@
+import csv
+import hashlib
+import io
+import json
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+HASH_BLOCK_BYTES = 1 << 20
+
+
+class ConvertStats(NamedTuple):
+    """
+    Итог конвертации: сколько строк добавлено, сколько всего и была ли полная пересборка
+    """
+    added: int
+    total: int
+    rebuilt: bool
+
+
+def _update_digest(digest, file, start: int, end: int):
+    """
+    Дополняет хеш байтами файла с start до end, читая блоками по 1 МиБ.
+    """
+    file.seek(start)
+    while start < end:
+        block = file.read(min(end - start, HASH_BLOCK_BYTES))
+        if not block:
+            break
+        digest.update(block)
+        start += len(block)
+    return digest
+
+
+def _read_rows(file, offset: int) -> Tuple[List[List[str]], int]:
+    """
+    Записи CSV начиная с offset и смещение сразу после последней полной записи.
+
+    Разбор идёт модулем csv, как в csv.DictReader: поле в кавычках может
+    содержать переводы строк, пустые строки пропускаются. Незавершённая
+    последняя запись (без перевода строки или с незакрытой кавычкой)
+    остаётся на следующий запуск.
+
+    >>> rows, end = _read_rows(io.BytesIO(b'a,b\\n\\n1,"x\\ny"\\n2,"z'), 0)
+    >>> rows, end
+    ([['a', 'b'], ['1', 'x\\ny']], 13)
+    """
+    file.seek(offset)
+    data = file.read()
+    text = data[:max(data.rfind(b"\n"), data.rfind(b"\r")) + 1].decode()
+    consumed, exhausted = 0, False
+
+    def lines():
+        nonlocal consumed, exhausted
+        for line in io.StringIO(text, newline=""):
+            consumed += len(line)
+            yield line
+        exhausted = True
+
+    rows, end = [], 0
+    for row in csv.reader(lines()):
+        if exhausted:  # запись оборвалась внутри кавычек
+            break
+        if row:
+            rows.append(row)
+        end = consumed
+    return rows, offset + len(text[:end].encode())
+
+
+def _record(header: List[str], row: List[str]) -> dict:
+    """
+    Словарь записи, как его строит csv.DictReader: лишние поля под ключом None, недостающие — None.
+
+    >>> _record(["a", "b"], ["1"]), _record(["a"], ["1", "2"])
+    ({'a': '1', 'b': None}, {'a': '1', None: ['2']})
+    """
+    record = dict(zip(header, row))
+    if len(row) > len(header):
+        record[None] = row[len(header):]
+    else:
+        for key in header[len(row):]:
+            record[key] = None
+    return record
+
+
+def _render(records: List[dict], fmt: str) -> str:
+    if fmt == "jsonl":
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    # Элементы массива в том же виде, в каком их записывает json.dump(data, indent=4)
+    return json.dumps(records, indent=4)[2:-2]
+
+
+def convert(input_filename: str, output_filename: str, checkpoint_filename: Optional[str] = None,
+            fmt: str = "json") -> ConvertStats:
+    """
+    Инкрементальная конвертация CSV в JSON для файлов, в которые только дописывают.
+
+    В файле контрольной точки хранятся смещение и количество уже обработанных
+    строк, заголовок CSV, хеш (BLAKE2b) всей обработанной части и размер
+    выходного файла.
+    При следующем запуске файл читается с сохранённого смещения, а новые
+    записи дописываются в выходной файл: в режиме "json" закрывающая скобка
+    массива заменяется новыми элементами (результат совпадает с task02.py
+    побайтно), в режиме "jsonl" добавляются строки JSON Lines.
+
+    Если входной файл стал короче, был перезаписан или выходной файл изменился
+    вне конвертера, выполняется полная пересборка.
+
+    >>> import tempfile
+    >>> tmp = tempfile.mkdtemp()
+    >>> src, dst = os.path.join(tmp, "in.csv"), os.path.join(tmp, "out.json")
+    >>> with open(src, "w") as f:
+    ...     _ = f.write("a,b\\n1,2\\n")
+    >>> convert(src, dst)
+    ConvertStats(added=1, total=1, rebuilt=True)
+    >>> with open(src, "a") as f:
+    ...     _ = f.write("3,4\\n5,")
+    >>> convert(src, dst)
+    ConvertStats(added=1, total=2, rebuilt=False)
+    >>> with open(dst) as f:
+    ...     json.load(f)
+    [{'a': '1', 'b': '2'}, {'a': '3', 'b': '4'}]
+    >>> with open(src, "w") as f:
+    ...     _ = f.write("a,b\\n7,8\\n")
+    >>> convert(src, dst)
+    ConvertStats(added=1, total=1, rebuilt=True)
+    """
+    if fmt not in ("json", "jsonl"):
+        raise ValueError("Формат должен быть 'json' или 'jsonl'!")
+    if checkpoint_filename is None:
+        checkpoint_filename = output_filename + ".checkpoint"
+
+    try:
+        with open(checkpoint_filename) as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError):
+        checkpoint = None
+
+    with open(input_filename, "rb") as idata:
+        size = os.fstat(idata.fileno()).st_size
+        digest = hashlib.blake2b(digest_size=16)
+        resume = (checkpoint is not None and checkpoint.get("format") == fmt and checkpoint["header"]
+                  and checkpoint["offset"] <= size
+                  and os.path.exists(output_filename)
+                  and os.path.getsize(output_filename) == checkpoint["output_size"]
+                  and _update_digest(digest, idata, 0, checkpoint["offset"]).hexdigest() == checkpoint["digest"])
+
+        if resume:
+            header, start, total = checkpoint["header"], checkpoint["offset"], checkpoint["rows"]
+            rows, offset = _read_rows(idata, start)
+        else:
+            digest, start = hashlib.blake2b(digest_size=16), 0
+            rows, offset = _read_rows(idata, 0)
+            header, rows, total = (rows[0] if rows else []), rows[1:], 0
+        records = [_record(header, row) for row in rows]
+
+        if resume:
+            with open(output_filename, "r+") as odata:
+                if records and fmt == "json":
+                    if total:
+                        odata.seek(checkpoint["output_size"] - 2)  # перед "\n]"
+                        odata.write(",\n" + _render(records, fmt) + "\n]")
+                    else:
+                        odata.truncate(0)
+                        json.dump(records, odata, indent=4)
+                elif records:
+                    odata.seek(0, os.SEEK_END)
+                    odata.write(_render(records, fmt))
+        else:
+            with open(output_filename, "w") as odata:
+                if fmt == "json":
+                    json.dump(records, odata, indent=4)
+                else:
+                    odata.write(_render(records, fmt))
+
+        checkpoint = {"format": fmt, "offset": offset, "rows": total + len(records), "header": header,
+                      "digest": _update_digest(digest, idata, start, offset).hexdigest(),
+                      "output_size": os.path.getsize(output_filename)}
+
+    with open(checkpoint_filename + ".tmp", "w") as file:
+        json.dump(checkpoint, file)
+    os.replace(checkpoint_filename + ".tmp", checkpoint_filename)
+    return ConvertStats(len(records), checkpoint["rows"], not resume)
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import tempfile
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    rnd = random.Random(0)
+    columns = ["longitude", "latitude", "housing_median_age", "total_rooms", "population", "median_house_value"]
+
+    def rows(count: int) -> str:
+        return "".join(f"{rnd.uniform(-124, -114):.2f},{rnd.uniform(32, 42):.2f},{rnd.randint(1, 52)},"
+                       f"{rnd.randint(2, 40000)},{rnd.randint(3, 35000)},{rnd.randint(15000, 500000)}\n"
+                       for _ in range(count))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "input.csv"), os.path.join(tmp, "output.json")
+        with open(src, "w") as file:
+            file.write(",".join(columns) + "\n" + rows(500_000))
+
+        start = default_timer()
+        print(convert(src, dst), f"полная конвертация: {default_timer() - start:.2f} с")
+        for _ in range(3):
+            with open(src, "a") as file:
+                file.write(rows(1000))
+            start = default_timer()
+            print(convert(src, dst), f"дописано 1000 строк: {(default_timer() - start) * 1e3:.1f} мс")
+
+        with open(src) as idata, open(dst) as odata:
+            assert json.load(odata) == list(csv.DictReader(idata))
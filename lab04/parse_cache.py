@@ -0,0 +1,255 @@
+import csv
+import hashlib
+import json
+import os
+import pickle
+import time
+from array import array
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = ".parse_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_FILENAME = "index.json"
+
+
+def file_digest(path: str) -> str:
+    """
+    Хеш содержимого файла (BLAKE2b), читается блоками по 1 МиБ.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def to_columns(records: list) -> Optional[Dict[str, object]]:
+    """
+    Перевод списка словарей с одинаковыми ключами в колонки.
+
+    Однородные числовые колонки хранятся в array ('q' для int, 'd' для float) и
+    сериализуются pickle одним блоком байт, остальные — списками. Если записи
+    не табличные или в них нет ни одного ключа (из колонок нельзя восстановить
+    количество пустых словарей), возвращается None.
+
+    >>> to_columns([{"score": 0.5, "weight": 1}, {"score": 0.25, "weight": 2}])
+    {'score': array('d', [0.5, 0.25]), 'weight': array('q', [1, 2])}
+    >>> to_columns([{}, {}]) is None
+    True
+    """
+    if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+        return None
+    keys = list(records[0])
+    if not keys or any(list(record) != keys for record in records):
+        return None
+
+    columns = {}
+    for key in keys:
+        values = [record[key] for record in records]
+        types = set(map(type, values))
+        if types == {int} and all(-2 ** 63 <= v < 2 ** 63 for v in values):
+            columns[key] = array('q', values)
+        elif types == {float}:
+            columns[key] = array('d', values)
+        else:
+            columns[key] = values
+    return columns
+
+
+def from_columns(columns: Dict[str, object]) -> List[dict]:
+    """
+    Восстановление списка словарей из колонок.
+
+    >>> from_columns({'score': array('d', [0.5]), 'weight': array('q', [1])})
+    [{'score': 0.5, 'weight': 1}]
+    """
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def parse_json(path: str):
+    with open(path) as file:
+        return json.load(file)
+
+
+def parse_csv(path: str) -> List[dict]:
+    with open(path, newline="") as file:
+        return list(csv.DictReader(file))
+
+
+class ParseCache:
+    """
+    Кеш результатов разбора файлов.
+
+    Запись кеша привязана к пути, размеру, времени изменения и хешу содержимого
+    файла. Если размер и время изменения совпадают, данные загружаются из
+    кеша без чтения исходного файла. Если изменились — сверяется хеш содержимого,
+    и при расхождении файл разбирается заново. Общий размер кеша ограничен,
+    давно не использованные записи вытесняются (LRU).
+
+    Индекс кеша записывается на диск только при изменении записей (разбор,
+    вытеснение, новое время изменения файла); время последнего использования
+    при попадании обновляется в памяти и сохраняется вместе со следующим
+    изменением.
+
+    >>> import tempfile
+    >>> tmp = tempfile.mkdtemp()
+    >>> path = os.path.join(tmp, "input.json")
+    >>> with open(path, "w") as f:
+    ...     _ = f.write("[{}, {}]")
+    >>> cache = ParseCache(os.path.join(tmp, "cache"))
+    >>> cache.load_json(path)
+    [{}, {}]
+    >>> index_mtime = os.stat(cache.index_path).st_mtime_ns
+    >>> cache.load_json(path), os.stat(cache.index_path).st_mtime_ns == index_mtime
+    ([{}, {}], True)
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 verify_content: bool = False):
+        """
+        :param cache_dir: Каталог кеша
+        :param max_bytes: Максимальный суммарный размер записей кеша
+        :param verify_content: Сверять хеш содержимого при каждой загрузке
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.verify_content = verify_content
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        try:
+            with open(self.index_path) as file:
+                self.index: Dict[str, dict] = json.load(file)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def load_json(self, path: str):
+        """
+        Содержимое JSON-файла, из кеша или с разбором.
+        """
+        return self.load(path, parse_json, "json")
+
+    def load_csv(self, path: str) -> List[dict]:
+        """
+        Записи CSV-файла (как csv.DictReader), из кеша или с разбором.
+        """
+        return self.load(path, parse_csv, "csv")
+
+    def load_columns(self, path: str, parser: Callable[[str], object] = parse_json, kind: str = "json"):
+        """
+        Колонки табличного файла без восстановления словарей (самый быстрый путь).
+        """
+        entry = self._entry(path, parser, kind)
+        if entry["columnar"]:
+            return self._read(entry)
+        return to_columns(self._read(entry))
+
+    def load(self, path: str, parser: Callable[[str], object], kind: str):
+        """
+        Результат parser(path) с кешированием.
+        """
+        entry = self._entry(path, parser, kind)
+        data = self._read(entry)
+        return from_columns(data) if entry["columnar"] else data
+
+    def _entry(self, path: str, parser: Callable[[str], object], kind: str) -> dict:
+        key = f"{kind}:{os.path.abspath(path)}"
+        stat = os.stat(path)
+        entry = self.index.get(key)
+        fresh = (entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+                 and os.path.exists(self._blob_path(entry)))
+        changed = False
+        if fresh and self.verify_content:
+            fresh = file_digest(path) == entry["digest"]
+        elif not fresh and entry is not None and entry["size"] == stat.st_size \
+                and os.path.exists(self._blob_path(entry)):
+            # Время изменения другое, но содержимое могло остаться прежним
+            fresh = changed = file_digest(path) == entry["digest"]
+            if fresh:
+                entry["mtime_ns"] = stat.st_mtime_ns
+
+        if not fresh:
+            entry = self._store(key, path, stat, parser(path))
+            changed = True
+        entry["used"] = time.time()
+        if changed:
+            self._save_index()
+        return entry
+
+    def _store(self, key: str, path: str, stat: os.stat_result, data) -> dict:
+        old = self.index.pop(key, None)
+        if old is not None:
+            self._remove_blob(old)
+
+        digest = file_digest(path)
+        columns = to_columns(data)
+        payload = columns if columns is not None else data
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest,
+                 "blob": f"{hashlib.blake2b(key.encode(), digest_size=10).hexdigest()}-{digest[:16]}.pkl",
+                 "columnar": columns is not None, "used": time.time()}
+        blob_path = self._blob_path(entry)
+        with open(blob_path + ".tmp", "wb") as file:
+            pickle.dump(payload, file, protocol=5)
+        os.replace(blob_path + ".tmp", blob_path)
+        entry["bytes"] = os.path.getsize(blob_path)
+        self.index[key] = entry
+        self._evict(keep=key)
+        return entry
+
+    def _read(self, entry: dict):
+        with open(self._blob_path(entry), "rb") as file:
+            return pickle.load(file)
+
+    def _evict(self, keep: str) -> None:
+        total = sum(entry["bytes"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry["bytes"]
+            self._remove_blob(entry)
+            del self.index[key]
+
+    def _blob_path(self, entry: dict) -> str:
+        return os.path.join(self.cache_dir, entry["blob"])
+
+    def _remove_blob(self, entry: dict) -> None:
+        try:
+            os.remove(self._blob_path(entry))
+        except FileNotFoundError:
+            pass
+
+    def _save_index(self) -> None:
+        with open(self.index_path + ".tmp", "w") as file:
+            json.dump(self.index, file)
+        os.replace(self.index_path + ".tmp", self.index_path)
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import tempfile
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.json")
+        rnd = random.Random(0)
+        with open(path, "w") as file:
+            json.dump([{"score": rnd.random(), "weight": rnd.randint(1, 5)} for _ in range(1_000_000)], file)
+
+        cache = ParseCache(os.path.join(tmp, "cache"))
+        for title in ("первая загрузка (разбор JSON)", "повторная загрузка из кеша"):
+            start = default_timer()
+            columns = cache.load_columns(path)
+            print(f"{title}: {(default_timer() - start) * 1e3:.0f} мс")
+        start = default_timer()
+        records = cache.load_json(path)
+        print(f"загрузка записей из кеша: {(default_timer() - start) * 1e3:.0f} мс, {len(records)} записей")
+
+        os.utime(path)  # время изменения другое, содержимое то же
+        start = default_timer()
+        cache.load_columns(path)
+        print(f"после touch (сверка хеша): {(default_timer() - start) * 1e3:.0f} мс")
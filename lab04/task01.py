@@ -4,19 +4,29 @@ INPUT_FILE = "input.json"
 
 
 # TODO решите задачу
-def task() -> float:
+def task(input_file: str = INPUT_FILE, cache=None) -> float:
     """
     Функция читает JSON файл и ищет сумму произведений двух значений в каждом словаре
-    """
-    with open(INPUT_FILE) as file:
-        data = json.load(file)
 
-    # Вычисляем произведение "score" * "weight" в каждом словаре
-    # и находим сумму этих произведений
-    accumulator = sum(record["score"] * record["weight"] for record in data)
+    Если передан кеш (parse_cache.ParseCache), повторные чтения неизменённого
+    файла берутся из него без разбора JSON.
+    """
+    if cache is not None:
+        data = cache.load_json(input_file)
+    else:
+        with open(input_file) as file:
+            data = json.load(file)
 
     # Возвращаем значение с плавающей запятой, округленное до 3 знаков
-    return round(accumulator, 3)
+    return round(weighted_score(data), 3)
+
+
+def weighted_score(data: list) -> float:
+    """
+    Сумма произведений "score" * "weight" по всем словарям
+    """
+    return sum(record["score"] * record["weight"] for record in data)
 
 
-print(task())
+if __name__ == '__main__':
+    print(task())
@@ -2,11 +2,18 @@
 import csv
 import json
 
+from incremental import convert
+
 INPUT_FILENAME = "input.csv"
 OUTPUT_FILENAME = "output.json"
 
 
-def task() -> None:
+def task(incremental: bool = False) -> None:
+    if incremental:
+        # Конвертируются только строки, дописанные с прошлого запуска
+        convert(INPUT_FILENAME, OUTPUT_FILENAME)
+        return
+
     # TODO считать содержимое csv файла
     with open(INPUT_FILENAME, 'r') as idata:
         ibuff = csv.DictReader(idata)
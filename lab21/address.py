@@ -0,0 +1,349 @@
+import math
+import re
+from hashlib import blake2b, sha256
+from typing import Iterable, List, Optional
+
+# Предварительная проверка адресов получателей до обращения к реестру:
+# формат и контрольная сумма (Base58Check, EIP-55) и фильтр Блума известных адресов.
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_INDEX = {char: i for i, char in enumerate(BASE58_ALPHABET)}
+BASE58_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{25,35}")
+HEX_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
+KECCAK_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+# Сдвиги rho для дорожки (x, y) и её позиция после перестановки pi, в порядке индексов x + 5 * y
+KECCAK_ROTATIONS = [0, 1, 62, 28, 27, 36, 44, 6, 55, 20, 3, 10, 43, 25, 39, 41, 45, 15, 21, 8, 18, 2, 61, 56, 14]
+KECCAK_PI = [(x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5)) for y in range(5) for x in range(5)]
+MASK64 = (1 << 64) - 1
+
+
+def _keccak_f(lanes: List[int]) -> List[int]:
+    for round_constant in KECCAK_ROUND_CONSTANTS:
+        c = [lanes[x] ^ lanes[x + 5] ^ lanes[x + 10] ^ lanes[x + 15] ^ lanes[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & MASK64) for x in range(5)]
+        b = [0] * 25
+        for source, target in KECCAK_PI:
+            lane, shift = lanes[source] ^ d[source % 5], KECCAK_ROTATIONS[source]
+            b[target] = ((lane << shift) | (lane >> (64 - shift))) & MASK64 if shift else lane
+        lanes = [b[i] ^ (~b[i - i % 5 + (i + 1) % 5] & b[i - i % 5 + (i + 2) % 5]) for i in range(25)]
+        lanes[0] ^= round_constant
+    return lanes
+
+
+def keccak256(data: bytes) -> bytes:
+    """
+    Keccak-256 (вариант Ethereum, отличается от SHA3-256 дополнением).
+
+    В hashlib его нет, поэтому он реализован здесь; используется только для
+    проверки контрольной суммы EIP-55 в 40-символьных адресах.
+
+    :param data: Данные
+
+    :type data: bytes
+
+    :rtype: bytes
+
+    >>> keccak256(b'').hex()
+    'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'
+    """
+    rate = 136
+    padded = bytearray(data + b"\x01" + bytes(-(len(data) + 1) % rate))
+    padded[-1] |= 0x80
+    lanes = [0] * 25
+    for offset in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            lanes[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], "little")
+        lanes = _keccak_f(lanes)
+    return b"".join(lane.to_bytes(8, "little") for lane in lanes[:4])
+
+
+def base58_decode(text: str) -> bytes:
+    """
+    Декодирование строки Base58 (ведущие "1" соответствуют нулевым байтам).
+
+    :param text: Строка Base58
+
+    :type text: str
+
+    :rtype: bytes
+    """
+    value = 0
+    for char in text:
+        value = value * 58 + BASE58_INDEX[char]
+    zeros = len(text) - len(text.lstrip("1"))
+    return bytes(zeros) + value.to_bytes((value.bit_length() + 7) // 8, "big")
+
+
+def is_valid_base58check(address: str) -> bool:
+    """
+    Проверка адреса Base58Check: 21 байт данных и 4 байта двойного SHA-256.
+
+    :param address: Адрес
+
+    :type address: str
+
+    :rtype: bool
+
+    >>> is_valid_base58check('1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+    True
+    >>> is_valid_base58check('1BoatSLRHtKNngkdXEeobR76b53LETtpyU')
+    False
+    """
+    if not BASE58_RE.fullmatch(address):
+        return False
+    raw = base58_decode(address)
+    return len(raw) == 25 and sha256(sha256(raw[:-4]).digest()).digest()[:4] == raw[-4:]
+
+
+def is_valid_hex_address(address: str) -> bool:
+    """
+    Проверка адреса вида 0x + 40 шестнадцатеричных символов.
+
+    Адрес в одном регистре принимается без контрольной суммы, в смешанном
+    регистре регистр букв должен совпадать с контрольной суммой EIP-55.
+
+    :param address: Адрес
+
+    :type address: str
+
+    :rtype: bool
+
+    >>> is_valid_hex_address('0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed')
+    True
+    >>> is_valid_hex_address('0x5aaeb6053F3E94C9b9A09f33669435E7Ef1BeAed')
+    False
+    """
+    if not HEX_RE.fullmatch(address):
+        return False
+    body = address[2:]
+    if body.islower() or body.isupper() or body.isdigit():
+        return True
+    digest = keccak256(body.lower().encode()).hex()
+    return all(char == (char.upper() if int(digest[i], 16) >= 8 else char.lower()) for i, char in enumerate(body))
+
+
+def is_valid_address(address: str) -> bool:
+    """
+    Адрес в формате Base58Check или 0x-hex с верной контрольной суммой.
+
+    :param address: Адрес
+
+    :type address: str
+
+    :rtype: bool
+    """
+    if not isinstance(address, str):
+        return False
+    if address.startswith("0x"):
+        return is_valid_hex_address(address)
+    return is_valid_base58check(address)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума известных адресов.
+
+    Размер битового массива и число хеш-функций подбираются по ожидаемому
+    количеству элементов и допустимой доле ложных срабатываний. Позиции
+    битов получаются двойным хешированием из одного BLAKE2b.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """
+        :param capacity: Ожидаемое количество адресов
+        :param false_positive_rate: Допустимая доля ложных срабатываний
+
+        :type capacity: int
+        :type false_positive_rate: float
+
+        >>> bloom = BloomFilter(1000, 0.01)
+        >>> bloom.size, bloom.hashes
+        (9586, 7)
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity должен быть положительным целым числом")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate должен быть в интервале (0, 1)")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def required_bytes(capacity: int, false_positive_rate: float) -> int:
+        """
+        Размер битового массива в байтах для заданных параметров.
+
+        :rtype: int
+        """
+        return math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2 / 8)
+
+    def _positions(self, item: str) -> range:
+        digest = int.from_bytes(blake2b(item.encode(), digest_size=16).digest(), "little")
+        h1, h2 = digest & MASK64, (digest >> 64) | 1
+        return range(h1, h1 + self.hashes * h2, h2)
+
+    def add(self, item: str) -> None:
+        """
+        Добавление адреса.
+
+        :param item: Адрес
+
+        :type item: str
+        """
+        bits, size = self.bits, self.size
+        for position in self._positions(item):
+            position %= size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        """
+        Добавление набора адресов.
+
+        :param items: Адреса
+
+        :type items: Iterable[str]
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits, size = self.bits, self.size
+        for position in self._positions(item):
+            position %= size
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def contains_many(self, items: Iterable[str]) -> List[bool]:
+        """
+        Пакетная проверка адресов.
+
+        :param items: Адреса
+
+        :type items: Iterable[str]
+
+        :rtype: List[bool]
+        """
+        bits, size, hashes = self.bits, self.size, self.hashes
+        result = []
+        append = result.append
+        for item in items:
+            digest = int.from_bytes(blake2b(item.encode(), digest_size=16).digest(), "little")
+            h1, h2 = digest & MASK64, (digest >> 64) | 1
+            for position in range(h1, h1 + hashes * h2, h2):
+                position %= size
+                if not bits[position >> 3] >> (position & 7) & 1:
+                    append(False)
+                    break
+            else:
+                append(True)
+        return result
+
+
+class AddressValidator:
+    """
+    Проверка адресов получателей перед переводом.
+
+    Адрес отклоняется, если он некорректен по формату или контрольной сумме,
+    либо, когда задан фильтр известных адресов, заведомо отсутствует в нём
+    (фильтр Блума не даёт ложноотрицательных ответов).
+
+    >>> known = BloomFilter(100)
+    >>> known.add('1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+    >>> validator = AddressValidator(known)
+    >>> validator.validate_batch(['1BoatSLRHtKNngkdXEeobR76b53LETtpyT', 'bob',
+    ...                           '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'])
+    [True, False, False]
+    >>> validator.check('bob')
+    Traceback (most recent call last):
+    ...
+    ValueError: Некорректный адрес: 'bob'
+    """
+
+    def __init__(self, known: Optional[BloomFilter] = None):
+        """
+        :param known: Фильтр известных адресов; если не задан, проверяется только формат
+
+        :type known: Optional[BloomFilter]
+        """
+        self.known = known
+
+    def check(self, address: str) -> None:
+        """
+        Проверка одного адреса.
+
+        :param address: Адрес
+
+        :type address: str
+
+        :raises ValueError: Если адрес некорректен или неизвестен
+        """
+        if not is_valid_address(address):
+            raise ValueError(f"Некорректный адрес: {address!r}")
+        if self.known is not None and address not in self.known:
+            raise ValueError(f"Неизвестный адрес: {address!r}")
+
+    def validate_batch(self, addresses: Iterable[str]) -> List[bool]:
+        """
+        Пакетная проверка адресов: сначала формат, затем фильтр для прошедших проверку формата.
+
+        :param addresses: Адреса
+
+        :type addresses: Iterable[str]
+
+        :rtype: List[bool]
+        """
+        addresses = list(addresses)
+        result = list(map(is_valid_address, addresses))
+        if self.known is not None:
+            indices = [i for i, valid in enumerate(result) if valid]
+            for i, known in zip(indices, self.known.contains_many(addresses[i] for i in indices)):
+                result[i] = known
+        return result
+
+
+if __name__ == "__main__":
+    import doctest
+    import os
+    import sys
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    addresses = [f"0x{os.urandom(20).hex()}" for _ in range(count)]
+    for rate in (0.01, 0.001):
+        bloom = BloomFilter(count, rate)
+        start = default_timer()
+        bloom.update(addresses)
+        elapsed = default_timer() - start
+        print(f"фильтр на {count} адресов, p={rate}: {len(bloom.bits) / 2 ** 20:.1f} МиБ, k={bloom.hashes}, "
+              f"вставка {count / elapsed:,.0f} адресов/с; на 100 млн адресов нужно "
+              f"{BloomFilter.required_bytes(100_000_000, rate) / 2 ** 20:.0f} МиБ")
+
+        unknown = [f"0x{os.urandom(20).hex()}" for _ in range(min(count, 200_000))]
+        start = default_timer()
+        false_positives = sum(bloom.contains_many(unknown))
+        elapsed = default_timer() - start
+        assert all(bloom.contains_many(addresses[:10_000]))
+        print(f"    проверка: {len(unknown) / elapsed:,.0f} адресов/с, "
+              f"ложных срабатываний {false_positives / len(unknown):.4f}")
+
+    validator = AddressValidator(bloom)
+    batch = addresses[:50_000] + ["1BoatSLRHtKNngkdXEeobR76b53LETtpyT"] * 50_000
+    start = default_timer()
+    valid = validator.validate_batch(batch)
+    print(f"пакетная проверка формата и фильтра: {len(batch) / (default_timer() - start):,.0f} адресов/с, "
+          f"принято {sum(valid)}")
@@ -0,0 +1,273 @@
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ledger import Ledger, Transfer
+
+# Параллельное исполнение пакета переводов для Ledger.
+# Переводы, затрагивающие связанные между собой счета, попадают в одну группу
+# и исполняются в ней по порядку. Группы не пересекаются по счетам, поэтому
+# их параллельное исполнение даёт тот же результат, что и последовательное.
+
+Group = List[Tuple[int, str, str, int]]
+
+
+def validate_format(transfer: Transfer) -> Optional[str]:
+    """
+    Проверка формата перевода без обращения к балансам.
+
+    :param transfer: Перевод (отправитель, получатель, сумма)
+
+    :type transfer: Tuple[str, str, float]
+
+    :rtype: Optional[str]
+    :return: Текст ошибки или None, если формат верный
+
+    >>> validate_format(('alice', 'bob', 1.0)) is None
+    True
+    >>> validate_format(('alice', '', 1.0))
+    'Address должен быть непустой строкой'
+    >>> validate_format(('alice', 'bob', -1))
+    'Amount должен быть положительным числом'
+    >>> validate_format(('alice', 'bob', float('nan')))
+    'Amount должен быть положительным числом'
+    """
+    try:
+        sender, recipient, amount = transfer
+    except (TypeError, ValueError):
+        return "Перевод должен состоять из отправителя, получателя и суммы"
+    if not sender or not isinstance(sender, str) or not recipient or not isinstance(recipient, str):
+        return "Address должен быть непустой строкой"
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount) or amount <= 0:
+        return "Amount должен быть положительным числом"
+    return None
+
+
+def partition(transfers: Sequence[Tuple[int, str, str, int]]) -> List[Group]:
+    """
+    Разбиение переводов на группы, не пересекающиеся по счетам.
+
+    Счета объединяются системой непересекающихся множеств; порядок переводов
+    внутри группы сохраняется.
+
+    :param transfers: Переводы (индекс, отправитель, получатель, единицы)
+
+    :rtype: List[List[Tuple[int, str, str, int]]]
+
+    >>> groups = partition([(0, 'a', 'b', 1), (1, 'c', 'd', 1), (2, 'b', 'e', 1)])
+    >>> [[item[0] for item in group] for group in groups]
+    [[0, 2], [1]]
+    """
+    parent: Dict[str, str] = {}
+
+    def find(account: str) -> str:
+        root = parent.setdefault(account, account)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    for _, sender, recipient, _ in transfers:
+        a, b = find(sender), find(recipient)
+        if a != b:
+            parent[b] = a
+
+    groups: Dict[str, Group] = {}
+    for item in transfers:
+        groups.setdefault(find(item[1]), []).append(item)
+    return list(groups.values())
+
+
+def apply_group(balances: Dict[str, int], group: Group) -> Tuple[Dict[str, int], List[Tuple[int, Optional[str]]]]:
+    """
+    Последовательное исполнение группы над копией балансов её счетов.
+
+    :param balances: Начальные балансы затронутых счетов в единицах
+    :param group: Переводы группы
+
+    :rtype: Tuple[Dict[str, int], List[Tuple[int, Optional[str]]]]
+    :return: Итоговые балансы и результат по каждому переводу
+
+    >>> apply_group({'a': 5}, [(0, 'a', 'b', 3), (1, 'a', 'b', 3)])
+    ({'a': 2, 'b': 3}, [(0, None), (1, 'Недостаточно средств на счёте a')])
+    """
+    results = []
+    for index, sender, recipient, units in group:
+        available = balances.get(sender, 0)
+        if available < units:
+            results.append((index, f"Недостаточно средств на счёте {sender}"))
+            continue
+        balances[sender] = available - units
+        balances[recipient] = balances.get(recipient, 0) + units
+        results.append((index, None))
+    return balances, results
+
+
+def _apply_group_args(args: Tuple[Dict[str, int], Group]):
+    return apply_group(*args)
+
+
+class BatchExecutor:
+    """
+    Исполнитель пакетов переводов с проверкой формата и исполнением групп в пуле процессов.
+    """
+
+    def __init__(self, ledger: Ledger, workers: Optional[int] = None, chunksize: int = 1024):
+        """
+        Инициализация исполнителя.
+
+        :param ledger: Реестр балансов
+        :param workers: Количество процессов; 1 — исполнение в текущем процессе
+        :param chunksize: Размер порции переводов для проверки формата в пуле
+
+        :type ledger: Ledger
+        :type workers: Optional[int]
+        :type chunksize: int
+        """
+        self.ledger = ledger
+        self.workers = workers
+        self.chunksize = chunksize
+        self._pool: Optional[Executor] = None
+
+    def __enter__(self) -> "BatchExecutor":
+        if self.workers != 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _map(self, func, items, chunksize: int = 1):
+        if self._pool is None:
+            return map(func, items)
+        return self._pool.map(func, items, chunksize=chunksize)
+
+    def execute(self, transfers: Sequence[Transfer]) -> List[Optional[str]]:
+        """
+        Исполнение пакета с тем же результатом, что и последовательное применение.
+
+        Невалидные переводы пропускаются, остальные применяются.
+
+        :param transfers: Переводы (отправитель, получатель, сумма)
+
+        :type transfers: Sequence[Tuple[str, str, float]]
+
+        :rtype: List[Optional[str]]
+        :return: Для каждого перевода текст ошибки или None, если он применён
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('alice', 10.0)
+        >>> with BatchExecutor(ledger, workers=1) as executor:
+        ...     executor.execute([('alice', 'bob', 4.0), ('carol', 'dave', 1.0), ('bob', 'erin', 0)])
+        [None, 'Недостаточно средств на счёте carol', 'Amount должен быть положительным числом']
+        >>> ledger.balance('alice'), ledger.balance('bob')
+        (6.0, 4.0)
+
+        Некорректная сумма даёт ошибку только для своего перевода, как в execute_serial:
+
+        >>> batch = [('alice', 'bob', float('nan')), ('alice', 'bob', float('inf')), ('alice', 'bob', 1e308),
+        ...          ('alice', 'bob', 1.0)]
+        >>> with BatchExecutor(ledger, workers=1) as executor:
+        ...     parallel = executor.execute(batch)
+        >>> serial = execute_serial(ledger, batch)
+        >>> parallel == serial, parallel
+        (True, ['Amount должен быть положительным числом', 'Amount должен быть положительным числом', \
+'Amount слишком велик', None])
+        """
+        results: List[Optional[str]] = list(self._map(validate_format, transfers, self.chunksize))
+
+        valid = []
+        for index, transfer in enumerate(transfers):
+            if results[index] is not None:
+                continue
+            sender, recipient, amount = transfer
+            try:
+                units = self.ledger.to_units(amount)
+            except ValueError as e:  # ошибка перевода суммы в единицы относится только к этому переводу
+                results[index] = str(e)
+                continue
+            if units <= 0:
+                results[index] = "Amount меньше минимальной единицы"
+                continue
+            valid.append((index, sender, recipient, units))
+
+        balances = self.ledger.balances
+        jobs = []
+        for group in partition(valid):
+            accounts = {account for _, sender, recipient, _ in group for account in (sender, recipient)}
+            jobs.append(({account: balances[account] for account in accounts if account in balances}, group))
+
+        applied = []
+        for group_balances, group_results in self._map(_apply_group_args, jobs):
+            balances.update(group_balances)
+            for index, error in group_results:
+                results[index] = error
+                if error is None:
+                    applied.append(index)
+
+        # Журнал заполняется в исходном порядке, как при последовательном исполнении
+        applied.sort()
+        units_by_index = {item[0]: item[3] for item in valid}
+        self.ledger.log.extend((transfers[i][0], transfers[i][1], units_by_index[i]) for i in applied)
+        return results
+
+
+def execute_serial(ledger: Ledger, transfers: Sequence[Transfer]) -> List[Optional[str]]:
+    """
+    Эталонное последовательное исполнение пакета.
+
+    >>> ledger = Ledger()
+    >>> ledger.issue('alice', 10.0)
+    >>> execute_serial(ledger, [('alice', 'bob', 4.0), ('carol', 'dave', 1.0)])
+    [None, 'Недостаточно средств на счёте carol']
+    """
+    results = []
+    for sender, recipient, amount in transfers:
+        error = validate_format((sender, recipient, amount))
+        if error is None:
+            try:
+                ledger.transfer(sender, recipient, amount)
+            except ValueError as e:
+                error = str(e)
+        results.append(error)
+    return results
+
+
+if __name__ == "__main__":
+    import doctest
+    import os
+    import random
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: 200 000 переводов внутри 1000 независимых групп по 100 счетов
+    rnd = random.Random(0)
+    accounts = [f"acc{i}" for i in range(100_000)]
+    transfers = []
+    for _ in range(200_000):
+        shard = rnd.randrange(1000) * 100
+        transfers.append((accounts[shard + rnd.randrange(100)], accounts[shard + rnd.randrange(100)],
+                          rnd.uniform(0.01, 200.0)))
+
+    def make_ledger() -> Ledger:
+        ledger = Ledger()
+        for account in accounts[::2]:
+            ledger.issue(account, 100.0)
+        return ledger
+
+    reference = make_ledger()
+    start = default_timer()
+    expected = execute_serial(reference, transfers)
+    print(f"последовательно: {len(transfers) / (default_timer() - start):,.0f} переводов/с")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        ledger = make_ledger()
+        with BatchExecutor(ledger, workers=workers) as executor:
+            start = default_timer()
+            results = executor.execute(transfers)
+            elapsed = default_timer() - start
+        same = results == expected and ledger.balances == reference.balances and ledger.log == reference.log
+        print(f"процессов {workers}: {len(transfers) / elapsed:,.0f} переводов/с, совпадает с эталоном: {same}")
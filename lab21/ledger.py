@@ -0,0 +1,240 @@
+import math
+from typing import Dict, Iterable, List, Tuple
+
+# Реестр балансов для CryptoCurrency.
+# Балансы хранятся в целых минимальных единицах (как сатоши в Bitcoin),
+# поэтому сумма всех балансов сохраняется точно, без ошибок округления float.
+
+Transfer = Tuple[str, str, float]
+
+
+class Ledger:
+    """
+    Реестр счетов: словарь счёт → баланс и журнал транзакций только на добавление.
+    """
+
+    def __init__(self, decimals: int = 8):
+        """
+        Инициализация пустого реестра.
+
+        :param decimals: Количество знаков после запятой минимальной единицы
+
+        :type decimals: int
+
+        >>> ledger = Ledger()
+        >>> ledger.total_supply()
+        0.0
+        """
+        if not isinstance(decimals, int) or decimals < 0:
+            raise ValueError("Decimals должен быть неотрицательным целым числом")
+        self.scale = 10 ** decimals
+        self.balances: Dict[str, int] = {}
+        self.log: List[Tuple[str, str, int]] = []
+        self.supply_units = 0
+
+    def to_units(self, amount: float) -> int:
+        """
+        Перевод суммы в минимальные единицы.
+
+        :param amount: Сумма в монетах
+
+        :type amount: float
+
+        :rtype: int
+
+        >>> Ledger(decimals=2).to_units(0.1)
+        10
+        >>> Ledger().to_units(1e308)
+        Traceback (most recent call last):
+        ...
+        ValueError: Amount слишком велик
+        """
+        scaled = amount * self.scale
+        if not math.isfinite(scaled):
+            raise ValueError("Amount слишком велик" if math.isfinite(amount) else
+                             "Amount должен быть положительным числом")
+        return round(scaled)
+
+    def issue(self, account: str, amount: float) -> None:
+        """
+        Начисление новых монет на счёт (генезис или эмиссия).
+
+        :param account: Счёт получателя
+        :param amount: Количество монет
+
+        :type account: str
+        :type amount: float
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('genesis', 100.0)
+        >>> ledger.balance('genesis')
+        100.0
+        """
+        units = self._check(account, amount)
+        self.balances[account] = self.balances.get(account, 0) + units
+        self.supply_units += units
+        self.log.append(("", account, units))
+
+    def balance(self, account: str) -> float:
+        """
+        Баланс счёта за O(1).
+
+        :param account: Счёт
+
+        :type account: str
+
+        :rtype: float
+
+        >>> Ledger().balance('nobody')
+        0.0
+        """
+        return self.balances.get(account, 0) / self.scale
+
+    def transfer(self, sender: str, recipient: str, amount: float) -> None:
+        """
+        Перевод между счетами.
+
+        :param sender: Счёт отправителя
+        :param recipient: Счёт получателя
+        :param amount: Количество монет
+
+        :type sender: str
+        :type recipient: str
+        :type amount: float
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('alice', 1.0)
+        >>> ledger.transfer('alice', 'bob', 0.25)
+        >>> ledger.balance('alice'), ledger.balance('bob')
+        (0.75, 0.25)
+        >>> ledger.transfer('bob', 'alice', 1.0)
+        Traceback (most recent call last):
+        ...
+        ValueError: Недостаточно средств на счёте bob
+        """
+        self._transfer_units(sender, recipient, self._check(recipient, amount))
+
+    def transfer_batch(self, transfers: Iterable[Transfer]) -> int:
+        """
+        Атомарное применение пакета переводов (отправитель, получатель, сумма).
+
+        Переводы применяются по порядку. Если хотя бы один невалиден или
+        применение прервано любым другим исключением, уже применённые переводы
+        пакета откатываются и реестр не меняется.
+
+        :param transfers: Переводы
+
+        :type transfers: Iterable[Tuple[str, str, float]]
+
+        :rtype: int
+        :return: Количество применённых переводов
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('alice', 1.0)
+        >>> ledger.transfer_batch([('alice', 'bob', 0.5), ('bob', 'carol', 0.5)])
+        2
+        >>> ledger.transfer_batch([('alice', 'bob', 0.5), ('carol', 'bob', 5.0)])
+        Traceback (most recent call last):
+        ...
+        ValueError: Недостаточно средств на счёте carol
+        >>> ledger.balance('alice'), ledger.balance('bob'), ledger.balance('carol')
+        (0.5, 0.0, 0.5)
+        >>> ledger.transfer_batch(map(lambda parts: ('alice', 'bob', 1 / parts), [2, 0]))
+        Traceback (most recent call last):
+        ...
+        ZeroDivisionError: division by zero
+        >>> ledger.balance('alice'), ledger.balance('bob')
+        (0.5, 0.0)
+        """
+        mark = len(self.log)
+        try:
+            for sender, recipient, amount in transfers:
+                self._transfer_units(sender, recipient, self._check(recipient, amount))
+        except BaseException:  # в том числе KeyboardInterrupt и ошибки итерации по transfers
+            self._rollback(mark)
+            raise
+        return len(self.log) - mark
+
+    def total_supply(self) -> float:
+        """
+        Общее количество монет, выпущенных в реестр.
+
+        :rtype: float
+        """
+        return self.supply_units / self.scale
+
+    def check_invariants(self) -> None:
+        """
+        Проверка, что сумма балансов равна выпуску и отрицательных балансов нет.
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('alice', 1.0)
+        >>> ledger.transfer('alice', 'bob', 0.3)
+        >>> ledger.check_invariants()
+        """
+        if sum(self.balances.values()) != self.supply_units:
+            raise AssertionError("Сумма балансов не равна общему выпуску")
+        if any(units < 0 for units in self.balances.values()):
+            raise AssertionError("Обнаружен отрицательный баланс")
+
+    def _check(self, account: str, amount: float) -> int:
+        if not account or not isinstance(account, str):
+            raise ValueError("Address должен быть непустой строкой")
+        if not isinstance(amount, (int, float)) or not math.isfinite(amount) or amount <= 0:
+            raise ValueError("Amount должен быть положительным числом")
+        units = self.to_units(amount)
+        if units <= 0:
+            raise ValueError("Amount меньше минимальной единицы")
+        return units
+
+    def _transfer_units(self, sender: str, recipient: str, units: int) -> None:
+        balances = self.balances
+        available = balances.get(sender, 0)
+        if available < units:
+            raise ValueError(f"Недостаточно средств на счёте {sender}")
+        balances[sender] = available - units
+        balances[recipient] = balances.get(recipient, 0) + units
+        self.log.append((sender, recipient, units))
+
+    def _rollback(self, mark: int) -> None:
+        balances = self.balances
+        while len(self.log) > mark:
+            sender, recipient, units = self.log.pop()
+            balances[recipient] -= units
+            balances[sender] += units
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: 1 000 000 переводов между 10 000 счетами пакетами по 1000
+    rnd = random.Random(0)
+    accounts = [f"acc{i}" for i in range(10_000)]
+    ledger = Ledger()
+    for account in accounts:
+        ledger.issue(account, 1_000_000.0)
+    batches = [[(rnd.choice(accounts), rnd.choice(accounts), rnd.uniform(0.01, 10.0)) for _ in range(1000)]
+               for _ in range(1000)]
+
+    latencies = []
+    start = default_timer()
+    for batch in batches:
+        batch_start = default_timer()
+        ledger.transfer_batch(batch)
+        latencies.append(default_timer() - batch_start)
+    elapsed = default_timer() - start
+    latencies.sort()
+    print(f"{1000 * len(batches) / elapsed:,.0f} переводов/с, задержка пакета p50 "
+          f"{latencies[len(latencies) // 2] * 1e3:.2f} мс, p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} мс")
+
+    start = default_timer()
+    for _ in range(1_000_000):
+        ledger.balance("acc42")
+    print(f"{1_000_000 / (default_timer() - start):,.0f} чтений баланса/с")
+
+    ledger.check_invariants()
+    print("Общий выпуск сохранён:", ledger.total_supply() == 1_000_000.0 * len(accounts))
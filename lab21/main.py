@@ -1,4 +1,9 @@
 import doctest
+from typing import Iterable, Optional, Tuple
+
+from address import AddressValidator
+from ledger import Ledger
+from token_history import TokenState
 
 # TODO Написать 3 класса с документацией и аннотацией типов
 
@@ -8,17 +13,24 @@ class CryptoCurrency:
     Класс описывающий криптовалюту.
     """
 
-    def __init__(self, symbol: str, blockchain: str, supply: float):
+    def __init__(self, symbol: str, blockchain: str, supply: float, address: str = "genesis",
+                 validator: Optional[AddressValidator] = None):
         """
         Инициализация криптовалюты.
 
+        Весь выпуск зачисляется на счёт address в реестре балансов.
+
         :param symbol: Символ криптовалюты
         :param blockchain: Название блокчейна
         :param supply: Общее количество монет в обороте
+        :param address: Адрес владельца кошелька
+        :param validator: Проверка адресов получателей; если не задана, принимается любой адрес
 
         :type symbol: str
         :type blockchain: str
         :type supply: float
+        :type address: str
+        :type validator: Optional[AddressValidator]
 
         >>> btc = CryptoCurrency('BTC', 'Bitcoin', 100500.0)
         """
@@ -28,10 +40,16 @@ class CryptoCurrency:
             raise ValueError("Blockchain должен быть непустой строкой")
         if not isinstance(supply, float) or supply <= 0:
             raise ValueError("Supply должен быть положительным числом")
+        if not address or not isinstance(address, str):
+            raise ValueError("Address должен быть непустой строкой")
 
         self.symbol = symbol
         self.blockchain = blockchain
         self.supply = supply
+        self.address = address
+        self.validator = validator
+        self.ledger = Ledger()
+        self.ledger.issue(address, supply)
 
     def send(self, address: str, amount: float):
         """
@@ -45,17 +63,56 @@ class CryptoCurrency:
 
         >>> btc = CryptoCurrency('BTC', 'Bitcoin', 100500.0)
         >>> btc.send('1BoatSLRHtKNngkdXEeobR76b53LETtpyT', 0.5)
+        >>> btc.check_balance('1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+        0.5
+        >>> checked = CryptoCurrency('BTC', 'Bitcoin', 1.0, validator=AddressValidator())
+        >>> checked.send('1BoatSLRHtKNngkdXEeobR76b53LETtpyT', 0.5)
+        >>> checked.validator.validate_batch(['1BoatSLRHtKNngkdXEeobR76b53'])
+        [False]
         """
-        pass
+        if self.validator is not None:
+            self.validator.check(address)
+        self.ledger.transfer(self.address, address, amount)
 
-    def check_balance(self) -> float:
+    def send_batch(self, transfers: Iterable[Tuple[str, str, float]]) -> int:
+        """
+        Атомарная отправка пакета переводов (отправитель, получатель, сумма).
+
+        :param transfers: Переводы
+
+        :type transfers: Iterable[Tuple[str, str, float]]
+
+        :rtype: int
+        :return: Количество применённых переводов
+
+        >>> btc = CryptoCurrency('BTC', 'Bitcoin', 100500.0)
+        >>> btc.send_batch([('genesis', 'alice', 500.0), ('alice', 'bob', 100.0)])
+        2
+        >>> btc.check_balance('alice')
+        400.0
+        """
+        if self.validator is not None:
+            transfers = list(transfers)
+            for (_, recipient, _), valid in zip(transfers, self.validator.validate_batch(t[1] for t in transfers)):
+                if not valid:
+                    self.validator.check(recipient)  # исключение с причиной отказа
+        return self.ledger.transfer_batch(transfers)
+
+    def check_balance(self, address: Optional[str] = None) -> float:
         """
         Проверка баланса криптовалюты.
 
+        :param address: Адрес счёта, по умолчанию — адрес владельца кошелька
+
+        :type address: str
+
+        :rtype: float
+
         >>> btc = CryptoCurrency('BTC', 'Bitcoin', 100500.0)
         >>> btc.check_balance()
+        100500.0
         """
-        pass
+        return self.ledger.balance(address or self.address)
 
 
 class CryptoToken:
@@ -87,10 +144,11 @@ class CryptoToken:
         self.name = name
         self.supply = supply
         self.owner = owner
+        self.state = TokenState(owner, supply)
 
     def mint(self, amount: int):
         """
-        Эмиссия новых токенов.
+        Эмиссия новых токенов на счёт владельца.
 
         :param amount: Количество токенов для эмиссии
 
@@ -98,12 +156,15 @@ class CryptoToken:
 
         >>> usdt = CryptoToken('TetherUSD', 1000000000, 'Tether Limited')
         >>> usdt.mint(1000000)
+        >>> usdt.supply
+        1001000000
         """
-        pass
+        self.state.mint(self.owner, amount)
+        self.supply = self.state.total_supply()
 
     def burn(self, amount: int):
         """
-        Уничтожение (сжигание) токенов.
+        Уничтожение (сжигание) токенов со счёта владельца.
 
         :param amount: Количество токенов для уничтожения
 
@@ -111,8 +172,42 @@ class CryptoToken:
 
         >>> usdt = CryptoToken('TetherUSD', 1000000000, 'Tether Limited')
         >>> usdt.burn(10000)
+        >>> usdt.supply
+        999990000
+        """
+        self.state.burn(self.owner, amount)
+        self.supply = self.state.total_supply()
+
+    def commit_block(self) -> int:
+        """
+        Закрытие текущего блока истории выпуска.
+
+        :rtype: int
+        :return: Высота закрытого блока
+
+        >>> usdt = CryptoToken('TetherUSD', 1000000000, 'Tether Limited')
+        >>> usdt.commit_block()
+        0
+        """
+        return self.state.commit_block()
+
+    def supply_at(self, height: int) -> int:
         """
-        pass
+        Общее количество токенов на конец блока height.
+
+        :param height: Высота блока
+
+        :type height: int
+
+        :rtype: int
+
+        >>> usdt = CryptoToken('TetherUSD', 1000000000, 'Tether Limited')
+        >>> _ = usdt.commit_block()
+        >>> usdt.mint(500)
+        >>> usdt.supply_at(0), usdt.supply_at(1)
+        (1000000000, 1000000500)
+        """
+        return self.state.supply_at(height)
 
 
 class NonFungibleToken:
@@ -144,19 +239,29 @@ class NonFungibleToken:
         self.name = name
         self.token_id = token_id
         self.creator = creator
+        self.owner = creator
+        self.registry = None  # реестр NFT, в котором зарегистрирован токен
 
     def transfer(self, to_owner: str):
         """
         Передача владения NFT другому пользователю.
 
+        Если токен зарегистрирован в реестре, индексы реестра тоже обновляются.
+
         :param to_owner: Новый владелец NFT
 
         :type to_owner: str
 
         >>> art = NonFungibleToken('CryptoPunk#3100', 3310, 'Larva Labs')
         >>> art.transfer('0x0...newowner')
+        >>> art.owner
+        '0x0...newowner'
         """
-        pass
+        if not to_owner or not isinstance(to_owner, str):
+            raise ValueError("Owner должен быть непустой строкой")
+        if self.registry is not None:
+            self.registry.transfer(self.token_id, to_owner)
+        self.owner = to_owner
 
     def display_info(self):
         """
@@ -164,8 +269,9 @@ class NonFungibleToken:
 
         >>> art = NonFungibleToken('CryptoPunk#3100', 3310, 'Larva Labs')
         >>> art.display_info()
+        CryptoPunk#3100 (ID 3310), автор Larva Labs, владелец Larva Labs
         """
-        pass
+        print(f"{self.name} (ID {self.token_id}), автор {self.creator}, владелец {self.owner}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+import asyncio
+import heapq
+from bisect import insort
+from collections import deque
+from itertools import count
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+# Пул ожидающих переводов CryptoCurrency.send с приоритетной выборкой в блоки.
+# У каждого отправителя своя очередь по nonce (deque): в блок может попасть только
+# перевод с наименьшим nonce отправителя. Кучи используют ленивое удаление:
+# устаревшие записи отбрасываются при извлечении.
+
+
+class PendingTransfer(NamedTuple):
+    """
+    Ожидающий перевод.
+    """
+    sender: str
+    recipient: str
+    amount: float
+    fee: float
+    nonce: int
+
+
+def by_fee(transfer: PendingTransfer) -> float:
+    """
+    Приоритет по комиссии.
+    """
+    return transfer.fee
+
+
+def by_amount(transfer: PendingTransfer) -> float:
+    """
+    Приоритет по сумме перевода.
+    """
+    return transfer.amount
+
+
+class Mempool:
+    """
+    Пул ожидающих переводов с очередями по отправителям и ограничением размера.
+    """
+
+    def __init__(self, max_size: int = 1_000_000, priority: Callable[[PendingTransfer], float] = by_fee):
+        """
+        Инициализация пула.
+
+        :param max_size: Максимальное количество ожидающих переводов
+        :param priority: Функция приоритета перевода
+
+        :type max_size: int
+        :type priority: Callable[[PendingTransfer], float]
+
+        >>> len(Mempool())
+        0
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("Max size должен быть положительным целым числом")
+        self.max_size = max_size
+        self.priority = priority
+        self.transfers: Dict[str, Dict[int, PendingTransfer]] = {}
+        self.nonces: Dict[str, Deque[int]] = {}  # отсортированные nonce отправителя
+        self._ready = []  # (-приоритет, порядковый номер, отправитель, nonce) для голов очередей
+        self._tails = []  # (приоритет, -порядковый номер, отправитель, nonce) для хвостов очередей
+        self._seq = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, transfer: PendingTransfer) -> List[PendingTransfer]:
+        """
+        Добавление перевода за O(log n).
+
+        Nonce обычно растут, поэтому новый nonce добавляется в конец очереди
+        отправителя за O(1); вставка в середину очереди стоит O(k).
+
+        Перевод с уже занятым nonce заменяет старый, только если его приоритет выше.
+        При превышении max_size вытесняются переводы с наименьшим приоритетом
+        среди последних по nonce в очередях отправителей.
+
+        :param transfer: Перевод
+
+        :type transfer: PendingTransfer
+
+        :rtype: List[PendingTransfer]
+        :return: Вытесненные переводы (возможно, включая добавляемый)
+
+        >>> pool = Mempool(max_size=2)
+        >>> pool.add(PendingTransfer('alice', 'bob', 1.0, 0.1, 0))
+        []
+        >>> pool.add(PendingTransfer('carol', 'bob', 1.0, 0.5, 0))
+        []
+        >>> pool.add(PendingTransfer('dave', 'bob', 1.0, 0.3, 0))
+        [PendingTransfer(sender='alice', recipient='bob', amount=1.0, fee=0.1, nonce=0)]
+        """
+        if not transfer.sender or not transfer.recipient:
+            raise ValueError("Address должен быть непустой строкой")
+        if transfer.amount <= 0:
+            raise ValueError("Amount должен быть положительным числом")
+
+        pending = self.transfers.setdefault(transfer.sender, {})
+        nonces = self.nonces.setdefault(transfer.sender, deque())
+        old = pending.get(transfer.nonce)
+        if old is not None:
+            if self.priority(transfer) <= self.priority(old):
+                raise ValueError("Перевод с таким nonce уже есть и имеет не меньший приоритет")
+        else:
+            if not nonces or transfer.nonce > nonces[-1]:
+                nonces.append(transfer.nonce)
+            elif transfer.nonce < nonces[0]:
+                nonces.appendleft(transfer.nonce)
+            else:
+                insort(nonces, transfer.nonce)
+            self._size += 1
+        pending[transfer.nonce] = transfer
+
+        # Новые записи для головы и хвоста очереди; старые станут устаревшими
+        if nonces[0] == transfer.nonce:
+            self._push_ready(transfer)
+        if nonces[-1] == transfer.nonce:
+            self._push_tail(transfer)
+
+        evicted = []
+        while self._size > self.max_size:
+            evicted.append(self._evict())
+        self._compact()
+        return evicted
+
+    def pop(self) -> Optional[PendingTransfer]:
+        """
+        Извлечение готового перевода с наибольшим приоритетом за O(log n).
+
+        :rtype: Optional[PendingTransfer]
+
+        >>> pool = Mempool()
+        >>> _ = pool.add(PendingTransfer('alice', 'bob', 1.0, 0.1, 1))
+        >>> _ = pool.add(PendingTransfer('alice', 'bob', 1.0, 0.01, 0))
+        >>> _ = pool.add(PendingTransfer('carol', 'bob', 1.0, 0.05, 0))
+        >>> [(t.sender, t.nonce) for t in pool.drain(3)]
+        [('carol', 0), ('alice', 0), ('alice', 1)]
+        """
+        while self._ready:
+            priority, _, sender, nonce = heapq.heappop(self._ready)
+            nonces = self.nonces.get(sender)
+            if not nonces or nonces[0] != nonce or -priority != self.priority(self.transfers[sender][nonce]):
+                continue
+            transfer = self._remove_head(sender)
+            if sender in self.nonces:
+                self._push_ready(self.transfers[sender][self.nonces[sender][0]])
+            return transfer
+        return None
+
+    def drain(self, max_transfers: int) -> List[PendingTransfer]:
+        """
+        Выборка до max_transfers переводов для блока в порядке приоритета.
+
+        :param max_transfers: Максимальное количество переводов
+
+        :type max_transfers: int
+
+        :rtype: List[PendingTransfer]
+        """
+        block = []
+        while len(block) < max_transfers:
+            transfer = self.pop()
+            if transfer is None:
+                break
+            block.append(transfer)
+        return block
+
+    def _push_ready(self, transfer: PendingTransfer) -> None:
+        heapq.heappush(self._ready, (-self.priority(transfer), next(self._seq), transfer.sender, transfer.nonce))
+
+    def _push_tail(self, transfer: PendingTransfer) -> None:
+        heapq.heappush(self._tails, (self.priority(transfer), -next(self._seq), transfer.sender, transfer.nonce))
+
+    def _remove_head(self, sender: str) -> PendingTransfer:
+        nonces = self.nonces[sender]
+        transfer = self.transfers[sender].pop(nonces.popleft())
+        self._size -= 1
+        if not nonces:
+            del self.nonces[sender]
+            del self.transfers[sender]
+        return transfer
+
+    def _evict(self) -> PendingTransfer:
+        while True:
+            priority, _, sender, nonce = heapq.heappop(self._tails)
+            nonces = self.nonces.get(sender)
+            if nonces and nonces[-1] == nonce and priority == self.priority(self.transfers[sender][nonce]):
+                break
+        transfer = self.transfers[sender].pop(nonces.pop())
+        self._size -= 1
+        if nonces:
+            self._push_tail(self.transfers[sender][nonces[-1]])
+        else:
+            del self.nonces[sender]
+            del self.transfers[sender]
+        return transfer
+
+    def _compact(self) -> None:
+        # Перестройка куч, когда устаревших записей становится больше актуальных
+        if len(self._ready) > 2 * len(self.nonces) + 1024:
+            self._ready = []
+            for sender, nonces in self.nonces.items():
+                self._push_ready(self.transfers[sender][nonces[0]])
+        if len(self._tails) > 2 * len(self.nonces) + 1024:
+            self._tails = []
+            for sender, nonces in self.nonces.items():
+                self._push_tail(self.transfers[sender][nonces[-1]])
+
+
+class AsyncMempool:
+    """
+    Интерфейс производитель/потребитель поверх Mempool для сборки блоков в asyncio.
+    """
+
+    def __init__(self, mempool: Mempool):
+        """
+        Инициализация обёртки.
+
+        :param mempool: Пул переводов
+
+        :type mempool: Mempool
+        """
+        self.mempool = mempool
+        self._available = asyncio.Condition()
+
+    async def put(self, transfer: PendingTransfer) -> List[PendingTransfer]:
+        """
+        Добавление перевода производителем.
+
+        :param transfer: Перевод
+
+        :type transfer: PendingTransfer
+
+        :rtype: List[PendingTransfer]
+        :return: Вытесненные переводы
+        """
+        async with self._available:
+            evicted = self.mempool.add(transfer)
+            self._available.notify_all()
+        return evicted
+
+    async def next_block(self, max_transfers: int) -> List[PendingTransfer]:
+        """
+        Ожидание хотя бы одного перевода и выборка блока потребителем.
+
+        :param max_transfers: Максимальное количество переводов в блоке
+
+        :type max_transfers: int
+
+        :rtype: List[PendingTransfer]
+
+        >>> async def demo():
+        ...     pool = AsyncMempool(Mempool())
+        ...     consumer = asyncio.create_task(pool.next_block(10))
+        ...     await pool.put(PendingTransfer('alice', 'bob', 1.0, 0.1, 0))
+        ...     return await consumer
+        >>> asyncio.run(demo())
+        [PendingTransfer(sender='alice', recipient='bob', amount=1.0, fee=0.1, nonce=0)]
+        """
+        async with self._available:
+            await self._available.wait_for(lambda: len(self.mempool) > 0)
+            return self.mempool.drain(max_transfers)
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: 1 000 000 ожидающих переводов от 100 000 отправителей
+    rnd = random.Random(0)
+    senders = [f"acc{i}" for i in range(100_000)]
+    next_nonce = dict.fromkeys(senders, 0)
+    transfers = []
+    for _ in range(1_000_000):
+        sender = rnd.choice(senders)
+        transfers.append(PendingTransfer(sender, rnd.choice(senders), rnd.uniform(0.01, 100.0),
+                                         rnd.uniform(0.0001, 0.01), next_nonce[sender]))
+        next_nonce[sender] += 1
+
+    pool = Mempool(max_size=1_000_000)
+    start = default_timer()
+    for transfer in transfers:
+        pool.add(transfer)
+    print(f"вставка: {len(transfers) / (default_timer() - start):,.0f} переводов/с, в пуле {len(pool)}")
+
+    start = default_timer()
+    extra = [PendingTransfer(sender, "sink", 1.0, rnd.uniform(0.0001, 0.01), next_nonce[sender] + 1_000)
+             for sender in senders[:100_000]]
+    evicted = sum(len(pool.add(transfer)) for transfer in extra)
+    print(f"вставка с вытеснением: {len(extra) / (default_timer() - start):,.0f} переводов/с, вытеснено {evicted}")
+
+    start = default_timer()
+    blocks = 0
+    while len(pool):
+        pool.drain(5000)
+        blocks += 1
+    print(f"выборка: {1_000_000 / (default_timer() - start):,.0f} переводов/с, блоков {blocks}")
+
+    # Одна длинная очередь: извлечение головы и добавление в конец очереди за O(1)
+    pool = Mempool()
+    start = default_timer()
+    for nonce in range(200_000):
+        pool.add(PendingTransfer("whale", "sink", 1.0, 0.001, nonce))
+    pool.drain(200_000)
+    print(f"очередь одного отправителя: {200_000 / (default_timer() - start):,.0f} переводов/с")
@@ -0,0 +1,436 @@
+from hashlib import sha256
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ledger import Ledger
+
+# Деревья Меркла для фиксации состояния реестров lab21.
+# Листья и внутренние узлы хешируются с разными префиксами, чтобы лист нельзя
+# было выдать за внутренний узел.
+
+Proof = List[Tuple[bytes, bool]]  # (соседний хеш, сосед справа)
+
+EMPTY_ROOT = sha256(b"").digest()
+
+
+def hash_leaf(data: bytes) -> bytes:
+    """
+    Хеш листа дерева.
+
+    :param data: Данные листа
+
+    :type data: bytes
+
+    :rtype: bytes
+    """
+    return sha256(b"\x00" + data).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """
+    Хеш внутреннего узла дерева.
+
+    :param left: Хеш левого потомка
+    :param right: Хеш правого потомка
+
+    :type left: bytes
+    :type right: bytes
+
+    :rtype: bytes
+    """
+    return sha256(b"\x01" + left + right).digest()
+
+
+def encode_transfer(sender: str, recipient: str, units: int) -> bytes:
+    """
+    Каноническое байтовое представление перевода.
+
+    >>> encode_transfer('alice', 'bob', 5)
+    b'alice\\x00bob\\x005'
+    """
+    return f"{sender}\x00{recipient}\x00{units}".encode()
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """
+    Корень дерева Меркла над списком данных листьев.
+
+    При нечётном числе узлов на уровне последний узел поднимается без изменений.
+
+    :param leaves: Данные листьев
+
+    :type leaves: Sequence[bytes]
+
+    :rtype: bytes
+
+    >>> merkle_root([]) == EMPTY_ROOT
+    True
+    >>> merkle_root([b'a', b'b']) == hash_node(hash_leaf(b'a'), hash_leaf(b'b'))
+    True
+    """
+    level = [hash_leaf(leaf) for leaf in leaves]
+    if not level:
+        return EMPTY_ROOT
+    while len(level) > 1:
+        level = [hash_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def merkle_proof(leaves: Sequence[bytes], index: int) -> Proof:
+    """
+    Доказательство включения листа index в дерево merkle_root(leaves).
+
+    :param leaves: Данные листьев
+    :param index: Номер листа
+
+    :type leaves: Sequence[bytes]
+    :type index: int
+
+    :rtype: List[Tuple[bytes, bool]]
+
+    >>> leaves = [b'a', b'b', b'c']
+    >>> verify_proof(b'c', merkle_proof(leaves, 2), merkle_root(leaves))
+    True
+    """
+    if not 0 <= index < len(leaves):
+        raise ValueError("Index вне диапазона листьев")
+    level = [hash_leaf(leaf) for leaf in leaves]
+    proof = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], sibling > index))
+        level = [hash_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: Proof, root: bytes) -> bool:
+    """
+    Проверка доказательства включения листа.
+
+    :param leaf: Данные листа
+    :param proof: Доказательство
+    :param root: Ожидаемый корень
+
+    :type leaf: bytes
+    :type proof: List[Tuple[bytes, bool]]
+    :type root: bytes
+
+    :rtype: bool
+    """
+    current = hash_leaf(leaf)
+    for sibling, is_right in proof:
+        current = hash_node(current, sibling) if is_right else hash_node(sibling, current)
+    return current == root
+
+
+class StateTree:
+    """
+    Инкрементальное дерево Меркла над состоянием ключ → значение.
+
+    Каждый ключ при первом появлении получает постоянный слот. Дерево хранит
+    все уровни, поэтому изменение одного ключа пересчитывает только путь
+    до корня — O(log n) хешей. Пустые поддеревья заменяются заранее
+    посчитанными хешами, ёмкость удваивается по мере роста.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого дерева.
+
+        >>> StateTree().root == hash_leaf(b'')
+        True
+        """
+        self.slots: Dict[str, int] = {}
+        self.values: List[bytes] = []
+        self.levels: List[List[bytes]] = [[]]
+        self.zeros: List[bytes] = [hash_leaf(b"")]
+
+    @property
+    def depth(self) -> int:
+        """
+        Глубина дерева.
+        """
+        return len(self.levels) - 1
+
+    @property
+    def root(self) -> bytes:
+        """
+        Корень дерева.
+        """
+        top = self.levels[-1]
+        return top[0] if top else self.zeros[self.depth]
+
+    def _node(self, level: int, index: int) -> bytes:
+        nodes = self.levels[level]
+        return nodes[index] if index < len(nodes) else self.zeros[level]
+
+    def _grow(self) -> None:
+        self.zeros.append(hash_node(self.zeros[-1], self.zeros[-1]))
+        top = self.levels[-1]
+        self.levels.append([hash_node(top[0], self.zeros[self.depth])] if top else [])
+
+    def update(self, key: str, value: bytes) -> bytes:
+        """
+        Установка значения ключа с пересчётом пути до корня.
+
+        :param key: Ключ (например, адрес счёта)
+        :param value: Сериализованное значение
+
+        :type key: str
+        :type value: bytes
+
+        :rtype: bytes
+        :return: Новый корень
+
+        >>> tree = StateTree()
+        >>> root = tree.update('alice', b'10')
+        >>> tree.update('bob', b'5') != root
+        True
+        >>> verify_proof(b'alice\\x0010', tree.proof('alice'), tree.root)
+        True
+        """
+        index = self.slots.get(key)
+        if index is None:
+            index = self.slots[key] = len(self.values)
+            self.values.append(value)
+            while index >= 1 << self.depth:
+                self._grow()
+        else:
+            self.values[index] = value
+
+        current = hash_leaf(key.encode() + b"\x00" + value)
+        for level in range(self.depth):
+            nodes = self.levels[level]
+            if index < len(nodes):
+                nodes[index] = current
+            else:
+                nodes.append(current)
+            sibling = self._node(level, index ^ 1)
+            current = hash_node(current, sibling) if index % 2 == 0 else hash_node(sibling, current)
+            index //= 2
+        top = self.levels[self.depth]
+        if top:
+            top[0] = current
+        else:
+            top.append(current)
+        return current
+
+    def extend(self, items: Iterable[Tuple[str, bytes]]) -> bytes:
+        """
+        Массовое добавление новых ключей с пересчётом дерева снизу вверх за O(n).
+
+        :param items: Пары (ключ, значение) с ключами, которых ещё нет в дереве
+
+        :type items: Iterable[Tuple[str, bytes]]
+
+        :rtype: bytes
+        :return: Новый корень
+
+        >>> first, second = StateTree(), StateTree()
+        >>> _ = first.update('alice', b'1'), first.update('bob', b'2'), first.update('carol', b'3')
+        >>> second.extend([('alice', b'1'), ('bob', b'2'), ('carol', b'3')]) == first.root
+        True
+
+        Пакет проверяется целиком до изменения дерева:
+
+        >>> second.extend([('dave', b'4'), ('erin', b'5'), ('dave', b'6')])
+        Traceback (most recent call last):
+        ...
+        ValueError: Ключ dave повторяется в пакете
+        >>> second.extend([('dave', b'4'), ('bob', b'5')])
+        Traceback (most recent call last):
+        ...
+        ValueError: Ключ bob уже есть в дереве
+        >>> len(second.values), second.root == first.root
+        (3, True)
+        """
+        items = list(items)
+        batch = set()
+        hashes = []
+        for key, value in items:
+            if key in self.slots:
+                raise ValueError(f"Ключ {key} уже есть в дереве")
+            if key in batch:
+                raise ValueError(f"Ключ {key} повторяется в пакете")
+            batch.add(key)
+            hashes.append(hash_leaf(key.encode() + b"\x00" + value))
+
+        leaves = self.levels[0]
+        for key, value in items:
+            self.slots[key] = len(self.values)
+            self.values.append(value)
+        leaves.extend(hashes)
+        while len(leaves) > 1 << self.depth:
+            self.zeros.append(hash_node(self.zeros[-1], self.zeros[-1]))
+            self.levels.append([])
+        for level in range(self.depth):
+            nodes = self.levels[level]
+            zero = self.zeros[level]
+            self.levels[level + 1] = [hash_node(nodes[i], nodes[i + 1] if i + 1 < len(nodes) else zero)
+                                      for i in range(0, len(nodes), 2)]
+        return self.root
+
+    def proof(self, key: str) -> Proof:
+        """
+        Доказательство того, что ключ имеет текущее значение.
+
+        Данные листа для verify_proof — key, нулевой байт и значение.
+
+        :param key: Ключ
+
+        :type key: str
+
+        :rtype: List[Tuple[bytes, bool]]
+        """
+        if key not in self.slots:
+            raise ValueError(f"Ключ {key} отсутствует в дереве")
+        index = self.slots[key]
+        proof = []
+        for level in range(self.depth):
+            sibling = index ^ 1
+            proof.append((self._node(level, sibling), sibling > index))
+            index //= 2
+        return proof
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Текущее значение ключа или None.
+        """
+        index = self.slots.get(key)
+        return None if index is None else self.values[index]
+
+
+class Block(NamedTuple):
+    """
+    Блок: высота, хеш предыдущего блока, корни транзакций и состояния, транзакции.
+    """
+    height: int
+    prev_hash: bytes
+    tx_root: bytes
+    state_root: bytes
+    transactions: Tuple[Tuple[str, str, int], ...]
+
+    @property
+    def hash(self) -> bytes:
+        """
+        Хеш заголовка блока.
+        """
+        return sha256(self.height.to_bytes(8, "big") + self.prev_hash + self.tx_root + self.state_root).digest()
+
+
+class BlockBuilder:
+    """
+    Сборщик блоков поверх Ledger с инкрементальным корнем состояния балансов.
+    """
+
+    def __init__(self, ledger: Ledger, max_transactions: int = 1000):
+        """
+        Инициализация сборщика; текущие балансы реестра заносятся в дерево состояния.
+
+        :param ledger: Реестр балансов
+        :param max_transactions: Максимальное количество транзакций в блоке
+
+        :type ledger: Ledger
+        :type max_transactions: int
+        """
+        if not isinstance(max_transactions, int) or max_transactions <= 0:
+            raise ValueError("Max transactions должен быть положительным целым числом")
+        self.ledger = ledger
+        self.max_transactions = max_transactions
+        self.state = StateTree()
+        self.state.extend((account, str(units).encode()) for account, units in ledger.balances.items())
+        self.blocks: List[Block] = []
+        self.pending: List[Tuple[str, str, int]] = []
+
+    def add(self, sender: str, recipient: str, amount: float) -> Optional[Block]:
+        """
+        Применение перевода к реестру и добавление его в текущий блок.
+
+        :param sender: Отправитель
+        :param recipient: Получатель
+        :param amount: Сумма
+
+        :type sender: str
+        :type recipient: str
+        :type amount: float
+
+        :rtype: Optional[Block]
+        :return: Запечатанный блок, если он заполнен, иначе None
+
+        >>> ledger = Ledger()
+        >>> ledger.issue('alice', 10.0)
+        >>> builder = BlockBuilder(ledger, max_transactions=2)
+        >>> builder.add('alice', 'bob', 1.0) is None
+        True
+        >>> block = builder.add('bob', 'carol', 0.5)
+        >>> block.height, len(block.transactions)
+        (0, 2)
+        >>> tx = block.transactions[1]
+        >>> verify_proof(encode_transfer(*tx), builder.transaction_proof(block, 1), block.tx_root)
+        True
+        >>> verify_proof(b'carol\\x0050000000', builder.state.proof('carol'), block.state_root)
+        True
+        """
+        self.ledger.transfer(sender, recipient, amount)
+        transaction = self.ledger.log[-1]
+        self.pending.append(transaction)
+        balances = self.ledger.balances
+        for account in (sender, recipient):
+            self.state.update(account, str(balances[account]).encode())
+        if len(self.pending) >= self.max_transactions:
+            return self.seal()
+        return None
+
+    def seal(self) -> Block:
+        """
+        Запечатывание текущего блока.
+
+        :rtype: Block
+        """
+        prev_hash = self.blocks[-1].hash if self.blocks else bytes(32)
+        transactions = tuple(self.pending)
+        block = Block(len(self.blocks), prev_hash, merkle_root([encode_transfer(*tx) for tx in transactions]),
+                      self.state.root, transactions)
+        self.blocks.append(block)
+        self.pending = []
+        return block
+
+    @staticmethod
+    def transaction_proof(block: Block, index: int) -> Proof:
+        """
+        Доказательство включения транзакции index в блок.
+
+        :param block: Блок
+        :param index: Номер транзакции в блоке
+
+        :type block: Block
+        :type index: int
+
+        :rtype: List[Tuple[bytes, bool]]
+        """
+        return merkle_proof([encode_transfer(*tx) for tx in block.transactions], index)
+
+
+if __name__ == "__main__":
+    import doctest
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: задержка обновления корня при росте числа счетов
+    tree = StateTree()
+    filled = 0
+    for target in (10_000, 100_000, 1_000_000, 2_000_000):
+        start = default_timer()
+        tree.extend((f"acc{i}", b"100") for i in range(filled, target))
+        filled = target
+        fill_time = default_timer() - start
+        start = default_timer()
+        for i in range(10_000):
+            tree.update(f"acc{i * 7919 % target}", str(i).encode())
+        update_us = (default_timer() - start) / 10_000 * 1e6
+        print(f"{target:>9} счетов: глубина {tree.depth}, обновление корня {update_us:.1f} мкс, "
+              f"заполнение {fill_time:.1f} с")
@@ -0,0 +1,282 @@
+import sys
+from array import array
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from main import NonFungibleToken
+
+# Реестр NFT с индексами по владельцу и автору.
+# Токены хранятся не объектами, а в словарях по token_id; строки владельцев
+# и авторов интернируются, а журнал передач хранит номера владельцев в массивах.
+
+
+class NFTRegistry:
+    """
+    Реестр невзаимозаменяемых токенов.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого реестра.
+
+        >>> len(NFTRegistry())
+        0
+        """
+        self.names: Dict[int, str] = {}
+        self.creators: Dict[int, str] = {}
+        self.owners: Dict[int, str] = {}
+        self.by_owner: Dict[str, List[int]] = {}  # отсортированные token_id владельца
+        self.by_creator: Dict[str, array] = {}
+        # Журнал передач: token_id и номер нового владельца в owner_names
+        self.log_tokens = array('q')
+        self.log_owners = array('l')
+        self.owner_names: List[str] = []
+        self._owner_numbers: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def __contains__(self, token_id: int) -> bool:
+        return token_id in self.owners
+
+    def mint(self, name: str, token_id: int, creator: str, owner: Optional[str] = None) -> None:
+        """
+        Выпуск токена; по умолчанию владельцем становится автор.
+
+        :param name: Название NFT
+        :param token_id: Уникальный идентификатор токена
+        :param creator: Автор NFT
+        :param owner: Первый владелец NFT
+
+        :type name: str
+        :type token_id: int
+        :type creator: str
+        :type owner: Optional[str]
+
+        >>> registry = NFTRegistry()
+        >>> registry.mint('CryptoPunk#3100', 3310, 'Larva Labs')
+        >>> registry.mint('CryptoPunk#3100', 3310, 'Larva Labs')
+        Traceback (most recent call last):
+        ...
+        ValueError: Токен с ID 3310 уже существует
+        """
+        NonFungibleToken(name, token_id, creator)  # проверка аргументов как у самого токена
+        owner = owner or creator
+        if not isinstance(owner, str):
+            raise ValueError("Owner должен быть непустой строкой")
+        if token_id in self.owners:
+            raise ValueError(f"Токен с ID {token_id} уже существует")
+        creator, owner = sys.intern(creator), sys.intern(owner)
+        self.names[token_id] = name
+        self.creators[token_id] = creator
+        self.by_creator.setdefault(creator, array('q')).append(token_id)
+        self._set_owner(token_id, owner)
+
+    def bulk_mint(self, tokens: Iterable[Tuple[str, int, str]]) -> int:
+        """
+        Массовый выпуск токенов (название, token_id, автор).
+
+        Сначала проверяется весь пакет (аргументы и уникальность ID в пакете и
+        в реестре), затем токены вставляются; при ошибке реестр не меняется.
+        Индекс по владельцу сортируется один раз после вставки всех токенов.
+
+        :param tokens: Токены
+
+        :type tokens: Iterable[Tuple[str, int, str]]
+
+        :rtype: int
+        :return: Количество выпущенных токенов
+
+        >>> registry = NFTRegistry()
+        >>> registry.bulk_mint([('A', 2, 'bob'), ('B', 1, 'bob')])
+        2
+        >>> registry.tokens_of('bob')
+        [1, 2]
+        >>> registry.bulk_mint([('C', 4, 'bob'), ('D', 3, 'bob'), ('E', 1, 'carol')])
+        Traceback (most recent call last):
+        ...
+        ValueError: Токен с ID 1 уже существует
+        >>> registry.bulk_mint([('C', 5, 'bob'), ('D', 5, 'bob')])
+        Traceback (most recent call last):
+        ...
+        ValueError: Токен с ID 5 повторяется в пакете
+        >>> registry.tokens_of('bob'), registry.history(4)
+        ([1, 2], [])
+        """
+        tokens = list(tokens)
+        seen = set()
+        for name, token_id, creator in tokens:
+            NonFungibleToken(name, token_id, creator)
+            if token_id in self.owners:
+                raise ValueError(f"Токен с ID {token_id} уже существует")
+            if token_id in seen:
+                raise ValueError(f"Токен с ID {token_id} повторяется в пакете")
+            seen.add(token_id)
+
+        touched = set()
+        for name, token_id, creator in tokens:
+            creator = sys.intern(creator)
+            self.names[token_id] = name
+            self.creators[token_id] = creator
+            self.owners[token_id] = creator
+            self.by_creator.setdefault(creator, array('q')).append(token_id)
+            self.by_owner.setdefault(creator, []).append(token_id)
+            self._log(token_id, creator)
+            touched.add(creator)
+        for owner in touched:
+            self.by_owner[owner].sort()
+        return len(tokens)
+
+    def get(self, token_id: int) -> NonFungibleToken:
+        """
+        Токен по идентификатору за O(1), привязанный к реестру.
+
+        :param token_id: Идентификатор токена
+
+        :type token_id: int
+
+        :rtype: NonFungibleToken
+
+        >>> registry = NFTRegistry()
+        >>> registry.mint('CryptoPunk#3100', 3310, 'Larva Labs')
+        >>> art = registry.get(3310)
+        >>> art.transfer('0x0...newowner')
+        >>> registry.owner_of(3310), registry.tokens_of('Larva Labs')
+        ('0x0...newowner', [])
+        """
+        if token_id not in self.owners:
+            raise ValueError(f"Токена с ID {token_id} не существует")
+        token = NonFungibleToken(self.names[token_id], token_id, self.creators[token_id])
+        token.owner = self.owners[token_id]
+        token.registry = self
+        return token
+
+    def owner_of(self, token_id: int) -> str:
+        """
+        Текущий владелец токена.
+
+        :param token_id: Идентификатор токена
+
+        :type token_id: int
+
+        :rtype: str
+        """
+        if token_id not in self.owners:
+            raise ValueError(f"Токена с ID {token_id} не существует")
+        return self.owners[token_id]
+
+    def transfer(self, token_id: int, to_owner: str) -> None:
+        """
+        Передача токена с обновлением индекса владельцев и журнала.
+
+        :param token_id: Идентификатор токена
+        :param to_owner: Новый владелец
+
+        :type token_id: int
+        :type to_owner: str
+        """
+        if not to_owner or not isinstance(to_owner, str):
+            raise ValueError("Owner должен быть непустой строкой")
+        old_owner = self.owner_of(token_id)
+        tokens = self.by_owner[old_owner]
+        del tokens[bisect_right(tokens, token_id) - 1]
+        if not tokens:
+            del self.by_owner[old_owner]
+        self._set_owner(token_id, sys.intern(to_owner))
+
+    def tokens_of(self, owner: str, after: Optional[int] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Страница токенов владельца в порядке возрастания token_id.
+
+        :param owner: Владелец
+        :param after: Вернуть токены с ID строго больше after (курсор страницы)
+        :param limit: Максимальный размер страницы
+
+        :type owner: str
+        :type after: Optional[int]
+        :type limit: Optional[int]
+
+        :rtype: List[int]
+
+        >>> registry = NFTRegistry()
+        >>> registry.bulk_mint((f'Art#{i}', i, 'alice') for i in range(1, 8))
+        7
+        >>> registry.tokens_of('alice', limit=3)
+        [1, 2, 3]
+        >>> registry.tokens_of('alice', after=3, limit=3)
+        [4, 5, 6]
+        """
+        tokens = self.by_owner.get(owner, [])
+        start = 0 if after is None else bisect_right(tokens, after)
+        end = len(tokens) if limit is None else start + limit
+        return tokens[start:end]
+
+    def tokens_by_creator(self, creator: str) -> List[int]:
+        """
+        Все токены автора в порядке выпуска.
+
+        :param creator: Автор
+
+        :type creator: str
+
+        :rtype: List[int]
+        """
+        return self.by_creator.get(creator, array('q')).tolist()
+
+    def history(self, token_id: int) -> List[str]:
+        """
+        Владельцы токена по порядку, начиная с первого (полный проход по журналу).
+
+        :param token_id: Идентификатор токена
+
+        :type token_id: int
+
+        :rtype: List[str]
+
+        >>> registry = NFTRegistry()
+        >>> registry.mint('Art', 1, 'alice')
+        >>> registry.transfer(1, 'bob')
+        >>> registry.history(1)
+        ['alice', 'bob']
+        """
+        return [self.owner_names[number]
+                for logged, number in zip(self.log_tokens, self.log_owners) if logged == token_id]
+
+    def _set_owner(self, token_id: int, owner: str) -> None:
+        self.owners[token_id] = owner
+        insort(self.by_owner.setdefault(owner, []), token_id)
+        self._log(token_id, owner)
+
+    def _log(self, token_id: int, owner: str) -> None:
+        number = self._owner_numbers.get(owner)
+        if number is None:
+            number = self._owner_numbers[owner] = len(self.owner_names)
+            self.owner_names.append(owner)
+        self.log_tokens.append(token_id)
+        self.log_owners.append(number)
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    import tracemalloc
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: 1 000 000 токенов, 100 000 владельцев, 500 000 передач
+    rnd = random.Random(0)
+    tracemalloc.start()
+    registry = NFTRegistry()
+    start = default_timer()
+    registry.bulk_mint((f"Art#{i}", i, f"creator{i % 1000}") for i in range(1, 1_000_001))
+    print(f"массовый выпуск: {1_000_000 / (default_timer() - start):,.0f} токенов/с")
+    memory, _ = tracemalloc.get_traced_memory()
+    print(f"память реестра: {memory / 2 ** 20:.0f} МиБ")
+
+    owners = [f"owner{i}" for i in range(100_000)]
+    start = default_timer()
+    for _ in range(500_000):
+        registry.transfer(rnd.randint(1, 1_000_000), rnd.choice(owners))
+    print(f"передачи: {500_000 / (default_timer() - start):,.0f} передач/с")
+    tracemalloc.stop()
@@ -0,0 +1,249 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict
+
+# История состояния CryptoToken по высотам блоков.
+# Вместо копий всего словаря балансов для каждого счёта и для общего выпуска
+# хранится список контрольных точек (высота, значение). Значение на высоте H
+# находится бинарным поиском за O(log H), память растёт только на изменения.
+
+
+class Checkpoints:
+    """
+    Контрольные точки значения по высотам в двух компактных массивах.
+    """
+
+    __slots__ = ("heights", "values")
+
+    def __init__(self):
+        """
+        Инициализация пустой истории.
+
+        >>> Checkpoints().at(10)
+        0
+        """
+        self.heights = array('q')
+        self.values = array('q')
+
+    def push(self, height: int, value: int) -> None:
+        """
+        Запись значения на высоте; повторная запись на той же высоте заменяет значение.
+
+        :param height: Высота блока, не меньше последней записанной
+        :param value: Значение
+
+        :type height: int
+        :type value: int
+        """
+        if self.heights and self.heights[-1] == height:
+            self.values[-1] = value
+            return
+        if self.heights and self.heights[-1] > height:
+            raise ValueError("Height не может уменьшаться")
+        self.heights.append(height)
+        self.values.append(value)
+
+    def at(self, height: int) -> int:
+        """
+        Значение на конец блока height.
+
+        :param height: Высота блока
+
+        :type height: int
+
+        :rtype: int
+
+        >>> history = Checkpoints()
+        >>> history.push(1, 10)
+        >>> history.push(5, 7)
+        >>> history.at(0), history.at(3), history.at(5), history.at(100)
+        (0, 10, 7, 7)
+        """
+        pos = bisect_right(self.heights, height)
+        return self.values[pos - 1] if pos else 0
+
+    def latest(self) -> int:
+        """
+        Последнее записанное значение.
+
+        :rtype: int
+        """
+        return self.values[-1] if self.values else 0
+
+
+class TokenState:
+    """
+    Балансы и общий выпуск токена с историей по высотам блоков.
+    """
+
+    def __init__(self, owner: str, supply: int):
+        """
+        Инициализация состояния: весь начальный выпуск принадлежит владельцу на высоте 0.
+
+        :param owner: Владелец токена
+        :param supply: Начальный выпуск
+
+        :type owner: str
+        :type supply: int
+
+        >>> state = TokenState('Tether Limited', 1000)
+        >>> state.supply_at(0), state.balance_at('Tether Limited', 0)
+        (1000, 1000)
+        """
+        self.height = 0
+        self.supply = Checkpoints()
+        self.balances: Dict[str, Checkpoints] = {}
+        self.supply.push(0, 0)
+        self.mint(owner, supply)
+
+    def commit_block(self) -> int:
+        """
+        Закрытие текущего блока; следующие изменения относятся к новой высоте.
+
+        :rtype: int
+        :return: Высота закрытого блока
+        """
+        self.height += 1
+        return self.height - 1
+
+    def total_supply(self) -> int:
+        """
+        Текущий общий выпуск.
+
+        :rtype: int
+        """
+        return self.supply.latest()
+
+    def balance(self, account: str) -> int:
+        """
+        Текущий баланс счёта.
+
+        :param account: Счёт
+
+        :type account: str
+
+        :rtype: int
+        """
+        history = self.balances.get(account)
+        return history.latest() if history is not None else 0
+
+    def mint(self, account: str, amount: int) -> None:
+        """
+        Эмиссия токенов на счёт в текущем блоке.
+
+        :param account: Счёт получателя
+        :param amount: Количество токенов
+
+        :type account: str
+        :type amount: int
+        """
+        self._check(account, amount)
+        self._set_balance(account, self.balance(account) + amount)
+        self.supply.push(self.height, self.total_supply() + amount)
+
+    def burn(self, account: str, amount: int) -> None:
+        """
+        Сжигание токенов со счёта в текущем блоке.
+
+        :param account: Счёт
+        :param amount: Количество токенов
+
+        :type account: str
+        :type amount: int
+
+        >>> state = TokenState('owner', 100)
+        >>> state.burn('owner', 150)
+        Traceback (most recent call last):
+        ...
+        ValueError: Недостаточно токенов на счёте owner
+        """
+        self._check(account, amount)
+        available = self.balance(account)
+        if available < amount:
+            raise ValueError(f"Недостаточно токенов на счёте {account}")
+        self._set_balance(account, available - amount)
+        self.supply.push(self.height, self.total_supply() - amount)
+
+    def supply_at(self, height: int) -> int:
+        """
+        Общий выпуск на конец блока height за O(log H).
+
+        :param height: Высота блока
+
+        :type height: int
+
+        :rtype: int
+
+        >>> state = TokenState('owner', 100)
+        >>> _ = state.commit_block()
+        >>> state.mint('alice', 50)
+        >>> _ = state.commit_block()
+        >>> state.burn('owner', 30)
+        >>> state.supply_at(0), state.supply_at(1), state.supply_at(2)
+        (100, 150, 120)
+        >>> state.balance_at('alice', 0), state.balance_at('alice', 2)
+        (0, 50)
+        """
+        return self.supply.at(height)
+
+    def balance_at(self, account: str, height: int) -> int:
+        """
+        Баланс счёта на конец блока height за O(log H).
+
+        :param account: Счёт
+        :param height: Высота блока
+
+        :type account: str
+        :type height: int
+
+        :rtype: int
+        """
+        history = self.balances.get(account)
+        return history.at(height) if history is not None else 0
+
+    def _set_balance(self, account: str, value: int) -> None:
+        history = self.balances.get(account)
+        if history is None:
+            history = self.balances[account] = Checkpoints()
+        history.push(self.height, value)
+
+    @staticmethod
+    def _check(account: str, amount: int) -> None:
+        if not account or not isinstance(account, str):
+            raise ValueError("Account должен быть непустой строкой")
+        if isinstance(amount, bool) or not isinstance(amount, int) or amount <= 0:
+            raise ValueError("Amount должен быть положительным целым числом")
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    import tracemalloc
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    # Бенчмарк: 1 000 000 событий mint/burn по 10 000 счетам, 100 событий на блок
+    rnd = random.Random(0)
+    accounts = [f"acc{i}" for i in range(10_000)]
+    tracemalloc.start()
+    state = TokenState("owner", 10 ** 9)
+    start = default_timer()
+    for event in range(1_000_000):
+        account = rnd.choice(accounts)
+        if rnd.random() < 0.6 or state.balance(account) == 0:
+            state.mint(account, rnd.randint(1, 1000))
+        else:
+            state.burn(account, rnd.randint(1, state.balance(account)))
+        if event % 100 == 99:
+            state.commit_block()
+    elapsed = default_timer() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{1_000_000 / elapsed:,.0f} событий/с, высота {state.height}, память {memory / 2 ** 20:.1f} МиБ")
+
+    start = default_timer()
+    for _ in range(100_000):
+        state.balance_at(rnd.choice(accounts), rnd.randrange(state.height))
+        state.supply_at(rnd.randrange(state.height))
+    print(f"исторический запрос: {(default_timer() - start) / 200_000 * 1e6:.2f} мкс")
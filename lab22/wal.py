@@ -0,0 +1,341 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from typing import Optional
+
+from task02 import Book, Library
+
+RECORD_HEADER = struct.Struct("<II")  # длина записи и её CRC32
+SYNC_MODES = ("always", "group", "none")
+WAL_FILENAME = "library.wal"
+SNAPSHOT_FILENAME = "library.snapshot"
+
+
+class DurableLibrary(Library):
+    """Библиотека с журналом упреждающей записи (WAL).
+
+    Каждое изменение (добавление, удаление, обновление книги) сначала
+    дописывается в журнал, затем применяется к списку книг. При создании
+    библиотека восстанавливается из последнего снимка и записей журнала
+    после него; повреждённый хвост журнала (запись, оборванная при сбое)
+    отбрасывается. Когда в журнале накапливается compact_every записей,
+    состояние сохраняется в новый снимок, а журнал очищается.
+
+    Режимы синхронизации:
+        "always" — fsync после каждой операции, операция надёжна сразу;
+        "group" — групповая фиксация: каждая запись сразу передаётся ОС, а один
+            fsync выполняется на group_size операций и не позже чем через
+            group_interval секунд после первой незафиксированной операции
+            (фоновым потоком, даже если новых операций нет); close() и выход
+            из блока with фиксируют оставшиеся операции;
+        "none" — запись передаётся ОС без fsync (переживает падение процесса,
+            но не отключение питания).
+
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> with DurableLibrary(directory) as library:
+    ...     book = library.add_book("test_name_1", 200)
+    ...     _ = library.add_book("test_name_2", 400)
+    ...     library.update_book(book.id, pages=250)
+    ...     library.remove_book(2)
+    >>> DurableLibrary(directory).books
+    [Book(id_=1, name='test_name_1', pages=250)]
+
+    Хвост журнала из нулевых байт (файл удлинён при сбое) тоже отбрасывается:
+
+    >>> with open(os.path.join(directory, WAL_FILENAME), "ab") as file:
+    ...     _ = file.write(bytes(16))
+    >>> with DurableLibrary(directory) as library:
+    ...     _ = library.add_book("test_name_4", 100)
+    >>> [book.name for book in DurableLibrary(directory).books]
+    ['test_name_1', 'test_name_4']
+
+    Операция без последующих записей фиксируется по истечении group_interval:
+
+    >>> library = DurableLibrary(tempfile.mkdtemp(), group_interval=0.01)
+    >>> _ = library.add_book("test_name_3", 300)
+    >>> time.sleep(0.2)
+    >>> library._pending, os.path.getsize(library.wal_path) > 0
+    (0, True)
+    >>> library.close()
+    """
+
+    def __init__(self, directory: str, sync: str = "group", group_size: int = 128, group_interval: float = 0.01,
+                 compact_every: int = 100_000) -> None:
+        """Открывает библиотеку в каталоге, восстанавливая её состояние.
+
+        Args:
+            directory (str): Каталог для снимка и журнала.
+            sync (str): Режим синхронизации: "always", "group" или "none".
+            group_size (int): Максимальное количество операций в одной групповой фиксации.
+            group_interval (float): Максимальное время в секундах между групповыми фиксациями.
+            compact_every (int): Количество записей журнала, после которого создаётся снимок.
+
+        Raises:
+            ValueError: Если режим синхронизации неизвестен.
+        """
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Режим синхронизации должен быть одним из {SYNC_MODES}")
+        super().__init__()
+        self.directory = directory
+        self.sync = sync
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.compact_every = compact_every
+        self.lsn = 0  # номер последней записи журнала
+        self.log_records = 0  # количество записей в журнале после снимка
+        self._pending = 0
+        self._pending_since = 0.0
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.wal_path = os.path.join(directory, WAL_FILENAME)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILENAME)
+        self._recover()
+        self._file = open(self.wal_path, "ab")
+
+    def __enter__(self) -> "DurableLibrary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_index_by_book_id(self, book_id: int) -> int:
+        """Возвращает индекс книги по идентификатору двоичным поиском.
+
+        Книги добавляются с возрастающими id, поэтому список отсортирован по id.
+
+        Args:
+            book_id (int): Идентификатор книги.
+
+        Returns:
+            int: Индекс книги в списке.
+
+        Raises:
+            ValueError: Если книги с запрашиваемым id не существует.
+        """
+        i = bisect_left(self.books, book_id, key=lambda book: book.id)
+        if i == len(self.books) or self.books[i].id != book_id:
+            raise ValueError("Книги с запрашиваемым id не существует")
+        return i
+
+    def add_book(self, name: str, pages: int) -> Book:
+        """Добавляет книгу с id от get_next_book_id.
+
+        Returns:
+            Book: Добавленная книга.
+        """
+        return self._execute({"op": "add", "id": self.get_next_book_id(), "name": name, "pages": pages})
+
+    def remove_book(self, book_id: int) -> None:
+        """Удаляет книгу.
+
+        Raises:
+            ValueError: Если книги с запрашиваемым id не существует.
+        """
+        self.get_index_by_book_id(book_id)
+        self._execute({"op": "remove", "id": book_id})
+
+    def update_book(self, book_id: int, name: Optional[str] = None, pages: Optional[int] = None) -> None:
+        """Изменяет название и/или количество страниц книги.
+
+        Raises:
+            ValueError: Если книги с запрашиваемым id не существует.
+        """
+        self.get_index_by_book_id(book_id)
+        record = {"op": "update", "id": book_id}
+        if name is not None:
+            record["name"] = name
+        if pages is not None:
+            record["pages"] = pages
+        self._execute(record)
+
+    def _execute(self, record: dict) -> Optional[Book]:
+        self._log(record)
+        result = self._apply(record)
+        if self.log_records >= self.compact_every:
+            self.checkpoint()
+        return result
+
+    def _apply(self, record: dict) -> Optional[Book]:
+        if record["op"] == "add":
+            book = Book(record["id"], record["name"], record["pages"])
+            self.books.append(book)
+            return book
+        index = self.get_index_by_book_id(record["id"])
+        if record["op"] == "remove":
+            del self.books[index]
+        else:
+            book = self.books[index]
+            book.name = record.get("name", book.name)
+            book.pages = record.get("pages", book.pages)
+        return None
+
+    def _log(self, record: dict) -> None:
+        self.lsn += 1
+        record["lsn"] = self.lsn
+        payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+        with self._lock:
+            self._file.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self.log_records += 1
+
+            if self.sync == "always":
+                self.commit()
+                return
+            self._file.flush()
+            if self.sync == "group":
+                if not self._pending:
+                    self._pending_since = time.monotonic()
+                    self._start_flusher()
+                    self._wakeup.set()
+                self._pending += 1
+                if self._pending >= self.group_size:
+                    self.commit()
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        # Фоновая фиксация группы через group_interval после её первой операции
+        while True:
+            self._wakeup.wait()
+            if self._file.closed:
+                return
+            self._closing.wait(max(0.0, self._pending_since + self.group_interval - time.monotonic()))
+            with self._lock:
+                if self._file.closed:
+                    return
+                if self._pending:
+                    self.commit()
+                self._wakeup.clear()
+
+    def commit(self) -> None:
+        """Делает надёжными все записанные операции (flush и fsync журнала)."""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def checkpoint(self) -> None:
+        """Сохраняет снимок состояния и очищает журнал (компактизация).
+
+        Снимок записывается во временный файл и атомарно заменяет старый; если
+        сбой произойдёт до очистки журнала, при восстановлении записи с номером
+        не больше номера снимка будут пропущены.
+        """
+        with self._lock:
+            self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        self.commit()
+        snapshot = {"lsn": self.lsn, "books": [[book.id, book.name, book.pages] for book in self.books]}
+        with open(self.snapshot_path + ".tmp", "w") as file:
+            json.dump(snapshot, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.snapshot_path + ".tmp", self.snapshot_path)
+        self._fsync_directory()
+        self._file.truncate(0)
+        self._file.seek(0)
+        os.fsync(self._file.fileno())
+        self.log_records = 0
+
+    def close(self) -> None:
+        """Фиксирует незавершённую группу операций и закрывает журнал."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self.commit()
+            self._file.close()
+            self._closing.set()
+            self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def _recover(self) -> None:
+        snapshot_lsn = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as file:
+                snapshot = json.load(file)
+            snapshot_lsn = self.lsn = snapshot["lsn"]
+            self.books = [Book(*fields) for fields in snapshot["books"]]
+
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, "rb") as file:
+            data = file.read()
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, crc = RECORD_HEADER.unpack_from(data, offset)
+            payload = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+            # Пустая запись — хвост из нулевых байт (файл удлинён при сбое, а данные не записаны)
+            if length == 0 or len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            try:
+                record = json.loads(payload)
+            except ValueError:
+                break
+            offset += RECORD_HEADER.size + length
+            if record["lsn"] > snapshot_lsn:
+                self._apply(record)
+                self.lsn = record["lsn"]
+                self.log_records += 1
+        if offset < len(data):
+            # Оборванная при сбое запись или нулевой хвост: отбрасываем, чтобы новые записи шли за последней целой
+            with open(self.wal_path, "r+b") as file:
+                file.truncate(offset)
+
+    def _fsync_directory(self) -> None:
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import sys
+    import tempfile
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    settings = [("always", 1), ("group", 16), ("group", 128), ("group", 1024), ("none", 1)]
+    for sync, group_size in settings:
+        count = operations // 10 if sync == "always" else operations
+        rnd = random.Random(0)
+        with tempfile.TemporaryDirectory() as directory:
+            library = DurableLibrary(directory, sync=sync, group_size=group_size, group_interval=1.0,
+                                     compact_every=count // 4)
+            start = default_timer()
+            for i in range(count):
+                action = rnd.random()
+                if action < 0.7 or len(library.books) < 2:
+                    library.add_book(f"Книга {i}", rnd.randint(50, 900))
+                elif action < 0.9:
+                    library.update_book(rnd.choice(library.books).id, pages=rnd.randint(50, 900))
+                else:
+                    library.remove_book(rnd.choice(library.books).id)
+            library.close()
+            elapsed = default_timer() - start
+
+            start = default_timer()
+            restored = DurableLibrary(directory)
+            recovery = default_timer() - start
+            assert repr(restored.books) == repr(library.books)
+            restored.close()
+        label = sync if sync != "group" else f"group ({group_size})"
+        print(f"{label:<13} {count / elapsed:>10.0f} операций/с, восстановление {recovery * 1e3:.0f} мс")
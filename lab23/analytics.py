@@ -0,0 +1,221 @@
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from catalog import SlottedAudioBook, SlottedPaperBook
+from task01 import AudioBook, PaperBook
+
+
+class CatalogColumns:
+    """
+    Колоночное хранилище для аналитики по смешанным коллекциям книг.
+
+    Поля pages и duration считываются из объектов один раз при добавлении
+    и хранятся в типизированных массивах вместе с номером автора. Суммы по
+    авторам обновляются инкрементально, отсортированные копии для процентилей
+    строятся лениво и сбрасываются при добавлении книг.
+
+    Атрибуты:
+    authors (List[str]): Авторы в порядке первого появления.
+    paper_authors (array): Номера авторов бумажных книг.
+    pages (array): Количество страниц бумажных книг.
+    audio_authors (array): Номера авторов аудиокниг.
+    durations (array): Продолжительность аудиокниг в часах.
+
+    >>> columns = CatalogColumns([PaperBook('a', 'Пушкин', 100), AudioBook('b', 'Пушкин', 2.5),
+    ...                           PaperBook('c', 'Гоголь', 300)])
+    >>> columns.total_pages_by_author()
+    {'Пушкин': 100, 'Гоголь': 300}
+    >>> columns.total_hours()
+    2.5
+    """
+
+    def __init__(self, books: Iterable = ()):
+        """
+        Конструктор класса.
+
+        Параметры:
+        books (Iterable): Начальный набор книг.
+        """
+        self.authors: List[str] = []
+        self._author_ids: Dict[str, int] = {}
+        self.paper_authors = array('l')
+        self.pages = array('q')
+        self.audio_authors = array('l')
+        self.durations = array('d')
+        self._pages_sum = array('q')
+        self._hours_sum = array('d')
+        self._sorted: Dict[str, Optional[array]] = {"pages": None, "duration": None}
+        self.extend(books)
+
+    def _author_id(self, author: str) -> int:
+        author_id = self._author_ids.get(author)
+        if author_id is None:
+            author_id = self._author_ids[author] = len(self.authors)
+            self.authors.append(author)
+            self._pages_sum.append(0)
+            self._hours_sum.append(0.0)
+        return author_id
+
+    def add(self, book) -> None:
+        """
+        Добавление одной книги.
+
+        Параметры:
+        book (PaperBook | AudioBook): Книга (в том числе вариант со __slots__).
+
+        Исключения:
+        TypeError: Если книга не бумажная и не аудиокнига.
+        """
+        if isinstance(book, (PaperBook, SlottedPaperBook)):
+            author_id = self._author_id(book.author)
+            pages = book.pages
+            self.paper_authors.append(author_id)
+            self.pages.append(pages)
+            self._pages_sum[author_id] += pages
+            self._sorted["pages"] = None
+        elif isinstance(book, (AudioBook, SlottedAudioBook)):
+            author_id = self._author_id(book.author)
+            duration = book.duration
+            self.audio_authors.append(author_id)
+            self.durations.append(duration)
+            self._hours_sum[author_id] += duration
+            self._sorted["duration"] = None
+        else:
+            raise TypeError("Поддерживаются только PaperBook и AudioBook!")
+
+    def extend(self, books: Iterable) -> None:
+        """
+        Добавление набора книг.
+
+        Параметры:
+        books (Iterable): Книги.
+        """
+        for book in books:
+            self.add(book)
+
+    def total_pages_by_author(self) -> Dict[str, int]:
+        """
+        Сумма страниц бумажных книг по авторам.
+
+        Возвращает:
+        Dict[str, int]: Автор → количество страниц (только авторы бумажных книг).
+        """
+        return {self.authors[i]: total for i, total in enumerate(self._pages_sum) if total}
+
+    def total_hours_by_author(self) -> Dict[str, float]:
+        """
+        Суммарная продолжительность аудиокниг по авторам.
+
+        Возвращает:
+        Dict[str, float]: Автор → часы (только авторы аудиокниг).
+        """
+        return {self.authors[i]: total for i, total in enumerate(self._hours_sum) if total}
+
+    def total_pages(self) -> int:
+        """
+        Общее количество страниц.
+
+        Возвращает:
+        int: Сумма страниц всех бумажных книг.
+        """
+        return sum(self._pages_sum)
+
+    def total_hours(self) -> float:
+        """
+        Общая продолжительность прослушивания.
+
+        Возвращает:
+        float: Сумма часов всех аудиокниг.
+        """
+        return sum(self.durations)
+
+    def group_sum(self, field: str) -> Dict[str, float]:
+        """
+        Сумма поля по авторам.
+
+        Параметры:
+        field (str): "pages" или "duration".
+
+        Возвращает:
+        Dict[str, float]: Автор → сумма.
+        """
+        if field == "pages":
+            return self.total_pages_by_author()
+        if field == "duration":
+            return self.total_hours_by_author()
+        raise ValueError(f"Неизвестное поле: {field!r}")
+
+    def percentile(self, field: str, q: float, author: Optional[str] = None) -> float:
+        """
+        Процентиль поля с линейной интерполяцией между соседними значениями.
+
+        Параметры:
+        field (str): "pages" или "duration".
+        q (float): Процентиль от 0 до 100.
+        author (str): Ограничить выборку книгами автора.
+
+        Возвращает:
+        float: Значение процентиля.
+
+        Исключения:
+        ValueError: Если выборка пуста или q вне диапазона.
+
+        >>> columns = CatalogColumns(AudioBook(str(i), 'a', float(i)) for i in range(1, 11))
+        >>> columns.percentile("duration", 50), columns.percentile("duration", 90)
+        (5.5, 9.1)
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("Процентиль должен быть в диапазоне от 0 до 100!")
+        values = self._values(field, author)
+        if not values:
+            raise ValueError("Нет данных для расчёта процентиля!")
+        position = (len(values) - 1) * q / 100
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    def _values(self, field: str, author: Optional[str]) -> array:
+        if field == "pages":
+            authors, column, typecode = self.paper_authors, self.pages, 'q'
+        elif field == "duration":
+            authors, column, typecode = self.audio_authors, self.durations, 'd'
+        else:
+            raise ValueError(f"Неизвестное поле: {field!r}")
+
+        if author is not None:
+            author_id = self._author_ids.get(author)
+            return array(typecode, sorted(value for a, value in zip(authors, column) if a == author_id))
+        if self._sorted[field] is None:
+            self._sorted[field] = array(typecode, sorted(column))
+        return self._sorted[field]
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    rnd = random.Random(0)
+    count = 1_000_000
+    books = [PaperBook(f'Книга {i}', f'Автор {rnd.randrange(5000)}', rnd.randint(50, 1500)) if i % 2 else
+             AudioBook(f'Книга {i}', f'Автор {rnd.randrange(5000)}', rnd.uniform(0.5, 40.0)) for i in range(count)]
+
+    start = default_timer()
+    columns = CatalogColumns(books)
+    print(f"извлечение {count} книг: {default_timer() - start:.2f} с")
+
+    start = default_timer()
+    naive = {}
+    for book in books:
+        if isinstance(book, PaperBook):
+            naive[book.author] = naive.get(book.author, 0) + book.pages
+    print(f"страницы по авторам через свойства: {default_timer() - start:.3f} с")
+    start = default_timer()
+    assert columns.total_pages_by_author() == naive
+    print(f"страницы по авторам из колонок: {default_timer() - start:.3f} с")
+
+    start = default_timer()
+    p50, p95 = columns.percentile("duration", 50), columns.percentile("duration", 95)
+    print(f"процентили длительности p50={p50:.1f} ч, p95={p95:.1f} ч: {default_timer() - start:.3f} с")
@@ -0,0 +1,299 @@
+from typing import Iterable, Iterator, TextIO
+
+from task01 import AudioBook, Book, PaperBook
+
+
+class SlottedBook:
+    """
+    Вариант Book со __slots__ и кешированными строковыми представлениями.
+
+    Название и автор доступны только для чтения, поэтому строки __str__
+    и __repr__ строятся один раз при первом обращении.
+
+    Атрибуты:
+    name (str): Название книги (только для чтения).
+    author (str): Автор книги (только для чтения).
+
+    >>> book = SlottedBook('Война и мир', 'Толстой')
+    >>> print(book)
+    Книга Война и мир. Автор Толстой
+    >>> book
+    SlottedBook(name='Война и мир', author='Толстой')
+    """
+
+    __slots__ = ("_name", "_author", "_str", "_repr")
+
+    def __init__(self, name: str, author: str):
+        """
+        Конструктор класса.
+
+        Параметры:
+        name (str): Название книги.
+        author (str): Автор книги.
+        """
+        self._name = name
+        self._author = author
+        self._str = None
+        self._repr = None
+
+    def __str__(self):
+        """
+        Метод для строкового представления объекта класса.
+
+        Возвращает:
+        str: Строка в формате "Книга {название}. Автор {автор}".
+        """
+        if self._str is None:
+            self._str = f"Книга {self._name}. Автор {self._author}"
+        return self._str
+
+    def __repr__(self):
+        """
+        Метод для формального строкового представления объекта класса.
+
+        Возвращает:
+        str: Строка в формате "SlottedBook(name={название}, author={автор})".
+        """
+        if self._repr is None:
+            self._repr = self._build_repr()
+        return self._repr
+
+    def _build_repr(self) -> str:
+        return f"{self.__class__.__name__}(name={self._name!r}, author={self._author!r})"
+
+    @property
+    def name(self) -> str:
+        """
+        Свойство для получения названия книги.
+
+        Возвращает:
+        str: Название книги.
+        """
+        return self._name
+
+    @property
+    def author(self) -> str:
+        """
+        Свойство для получения автора книги.
+
+        Возвращает:
+        str: Автор книги.
+        """
+        return self._author
+
+
+class SlottedPaperBook(SlottedBook):
+    """
+    Вариант PaperBook со __slots__; кеш __repr__ сбрасывается при изменении страниц.
+
+    Атрибуты:
+    pages (int): Количество страниц в книге.
+
+    >>> book = SlottedPaperBook('name', 'author', 123)
+    >>> book.pages = 200
+    >>> book
+    SlottedPaperBook(name='name', author='author', pages=200)
+    """
+
+    __slots__ = ("_pages",)
+
+    def __init__(self, name: str, author: str, pages: int):
+        """
+        Конструктор класса.
+
+        Параметры:
+        name (str): Название книги.
+        author (str): Автор книги.
+        pages (int): Количество страниц в книге.
+        """
+        super().__init__(name, author)
+        self.pages = pages
+
+    def _build_repr(self) -> str:
+        return (f"{self.__class__.__name__}(name={self._name!r}, author={self._author!r}, "
+                f"pages={self._pages!r})")
+
+    @property
+    def pages(self):
+        """
+        Свойство для получения количества страниц.
+
+        Возвращает:
+        int: Количество страниц в книге.
+        """
+        return self._pages
+
+    @pages.setter
+    def pages(self, value):
+        """
+        Метод для установки количества страниц.
+
+        Параметры:
+        value (int): Количество страниц в книге.
+
+        Исключения:
+        TypeError: Если 'value' не является целым числом.
+        ValueError: Если 'value' меньше или равно 0.
+        """
+        if not isinstance(value, int):
+            raise TypeError("Количество страниц имеет неправильный тип!")
+        if value <= 0:
+            raise ValueError("Количество страниц задано не верно!")
+        self._pages = value
+        self._repr = None
+
+
+class SlottedAudioBook(SlottedBook):
+    """
+    Вариант AudioBook со __slots__; кеш __repr__ сбрасывается при изменении продолжительности.
+
+    Атрибуты:
+    duration (float): Продолжительность аудиокниги в часах.
+
+    >>> SlottedAudioBook('name', 'author', 12.3)
+    SlottedAudioBook(name='name', author='author', duration=12.3)
+    """
+
+    __slots__ = ("_duration",)
+
+    def __init__(self, name: str, author: str, duration: float):
+        """
+        Конструктор класса.
+
+        Параметры:
+        name (str): Название аудиокниги.
+        author (str): Автор аудиокниги.
+        duration (float): Продолжительность аудиокниги в часах.
+        """
+        super().__init__(name, author)
+        self.duration = duration
+
+    def _build_repr(self) -> str:
+        return (f"{self.__class__.__name__}(name={self._name!r}, author={self._author!r}, "
+                f"duration={self._duration!r})")
+
+    @property
+    def duration(self):
+        """
+        Свойство для получения продолжительности аудиокниги.
+
+        Возвращает:
+        float: Продолжительность аудиокниги в часах.
+        """
+        return self._duration
+
+    @duration.setter
+    def duration(self, value):
+        """
+        Метод для установки продолжительности аудиокниги.
+
+        Параметры:
+        value (float): Продолжительность аудиокниги в часах.
+
+        Исключения:
+        TypeError: Если 'value' не является int или float.
+        ValueError: Если 'value' меньше или равно 0.
+        """
+        if not isinstance(value, (int, float)):
+            raise TypeError("Продолжительность имеет неправильный тип!")
+        if value <= 0:
+            raise ValueError("Продолжительность задана не верно!")
+        self._duration = value
+        self._repr = None
+
+
+def slotted(book: Book) -> SlottedBook:
+    """
+    Преобразование книги из task01.py в вариант со __slots__.
+
+    Параметры:
+    book (Book): Книга, бумажная книга или аудиокнига.
+
+    Возвращает:
+    SlottedBook: Книга того же вида со __slots__.
+
+    >>> slotted(PaperBook('name', 'author', 123))
+    SlottedPaperBook(name='name', author='author', pages=123)
+    """
+    if isinstance(book, PaperBook):
+        return SlottedPaperBook(book.name, book.author, book.pages)
+    if isinstance(book, AudioBook):
+        return SlottedAudioBook(book.name, book.author, book.duration)
+    return SlottedBook(book.name, book.author)
+
+
+def iter_catalog(books: Iterable, formal: bool = False) -> Iterator[str]:
+    """
+    Ленивый генератор строк каталога, по одной на книгу.
+
+    Параметры:
+    books (Iterable): Книги любого варианта.
+    formal (bool): Использовать __repr__ вместо __str__.
+
+    Возвращает:
+    Iterator[str]: Строки каталога с переводом строки.
+
+    >>> list(iter_catalog([SlottedBook('a', 'b')]))
+    ['Книга a. Автор b\\n']
+    """
+    convert = repr if formal else str
+    for book in books:
+        yield convert(book) + "\n"
+
+
+def render_catalog(books: Iterable, stream: TextIO, formal: bool = False, chunk_size: int = 1000) -> int:
+    """
+    Потоковая запись каталога порциями, без построения одной большой строки.
+
+    Параметры:
+    books (Iterable): Книги любого варианта.
+    stream (TextIO): Поток для записи (файл, ответ сервера, sys.stdout).
+    formal (bool): Использовать __repr__ вместо __str__.
+    chunk_size (int): Количество строк в одной записи в поток.
+
+    Возвращает:
+    int: Количество записанных книг.
+
+    >>> import io
+    >>> out = io.StringIO()
+    >>> render_catalog([SlottedPaperBook('a', 'b', 1), SlottedAudioBook('c', 'd', 2.5)], out, formal=True)
+    2
+    >>> print(out.getvalue(), end="")
+    SlottedPaperBook(name='a', author='b', pages=1)
+    SlottedAudioBook(name='c', author='d', duration=2.5)
+    """
+    written = 0
+    buffer = []
+    for line in iter_catalog(books, formal):
+        buffer.append(line)
+        if len(buffer) >= chunk_size:
+            stream.writelines(buffer)
+            written += len(buffer)
+            buffer.clear()
+    stream.writelines(buffer)
+    return written + len(buffer)
+
+
+if __name__ == '__main__':
+    import doctest
+    import io
+    import tracemalloc
+    from timeit import timeit
+
+    doctest.testmod()
+
+    count = 100_000
+    plain = [PaperBook(f'Книга {i}', f'Автор {i % 1000}', i % 900 + 1) if i % 2 else
+             AudioBook(f'Книга {i}', f'Автор {i % 1000}', i % 40 + 0.5) for i in range(count)]
+
+    tracemalloc.start()
+    fast = [slotted(book) for book in plain]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"память {count} книг со __slots__: {memory / 2 ** 20:.1f} МиБ")
+
+    for title, books in (("task01", plain), ("со __slots__ и кешем", fast)):
+        for formal in (False, True):
+            elapsed = timeit(lambda: render_catalog(books, io.StringIO(), formal=formal), number=5) / 5
+            kind = "__repr__" if formal else "__str__"
+            print(f"{title}, {kind}: {count / elapsed:,.0f} книг/с")
@@ -0,0 +1,255 @@
+import math
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from task01 import AudioBook, Book, PaperBook
+
+TOKEN_RE = re.compile(r"\w+")
+NAME_WEIGHT = 2.0  # совпадение в названии важнее совпадения в авторе
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбиение текста на слова в нижнем регистре; "ё" приравнивается к "е".
+
+    Параметры:
+    text (str): Текст.
+
+    Возвращает:
+    List[str]: Слова.
+
+    >>> tokenize('Ёжик в тумане, Юрий Норштейн')
+    ['ежик', 'в', 'тумане', 'юрий', 'норштейн']
+    """
+    return TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+class BookIndex:
+    """
+    Инвертированный индекс по названию и автору книг.
+
+    Для каждого слова хранятся отсортированные массивы номеров книг
+    отдельно для названия и для автора. Книги добавляются инкрементально,
+    номер книги — её позиция в индексе.
+
+    >>> index = BookIndex()
+    >>> index.extend([PaperBook('Капитанская дочка', 'Пушкин', 200),
+    ...               AudioBook('Мёртвые души', 'Гоголь', 12.5),
+    ...               PaperBook('Пиковая дама', 'Пушкин', 80)])
+    >>> [book.name for book in index.search('пушкин дама')]
+    ['Пиковая дама']
+    >>> [book.name for book in index.search('пушкин гоголь', mode='or')]
+    ['Мёртвые души', 'Капитанская дочка', 'Пиковая дама']
+    >>> [book.name for book in index.search('мертв', prefix=True)]
+    ['Мёртвые души']
+    """
+
+    def __init__(self):
+        """
+        Конструктор класса.
+        """
+        self.books: List[Tuple[str, str, str, float]] = []  # (вид, название, автор, страницы/часы)
+        self.name_postings: Dict[str, array] = {}
+        self.author_postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def add(self, book: Book) -> int:
+        """
+        Добавление книги в индекс.
+
+        Параметры:
+        book (Book): Книга, бумажная книга или аудиокнига.
+
+        Возвращает:
+        int: Номер книги в индексе.
+        """
+        doc_id = len(self.books)
+        if isinstance(book, PaperBook):
+            self.books.append(("paper", book.name, book.author, book.pages))
+        elif isinstance(book, AudioBook):
+            self.books.append(("audio", book.name, book.author, book.duration))
+        else:
+            self.books.append(("book", book.name, book.author, 0))
+        self._index(self.name_postings, book.name, doc_id)
+        self._index(self.author_postings, book.author, doc_id)
+        return doc_id
+
+    def extend(self, books: Iterable[Book]) -> None:
+        """
+        Добавление набора книг.
+
+        Параметры:
+        books (Iterable[Book]): Книги.
+        """
+        for book in books:
+            self.add(book)
+
+    def _index(self, postings: Dict[str, array], text: str, doc_id: int) -> None:
+        for term in set(tokenize(text)):
+            doc_ids = postings.get(term)
+            if doc_ids is None:
+                doc_ids = postings[term] = array('l')
+                self._vocabulary_dirty = True
+            doc_ids.append(doc_id)
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term]
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.name_postings.keys() | self.author_postings.keys())
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _idf(self, postings: array) -> float:
+        return math.log(1 + len(self.books) / len(postings))
+
+    def _term_scores(self, term: str, prefix: bool) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for word in self._expand(term, prefix):
+            for postings, weight in ((self.name_postings.get(word), NAME_WEIGHT),
+                                     (self.author_postings.get(word), 1.0)):
+                if postings:
+                    score = weight * self._idf(postings)
+                    for doc_id in postings:
+                        if scores.get(doc_id, 0.0) < score:
+                            scores[doc_id] = score
+        return scores
+
+    def search_ids(self, query: str, mode: str = "and", prefix: bool = False, limit: int = 10) -> List[int]:
+        """
+        Поиск номеров книг с ранжированием по сумме весов совпавших слов.
+
+        Вес слова — его idf, умноженный на NAME_WEIGHT при совпадении в названии.
+        При равенстве веса выше книга, добавленная раньше.
+
+        Параметры:
+        query (str): Запрос.
+        mode (str): "and" — все слова запроса, "or" — хотя бы одно.
+        prefix (bool): Считать слова запроса префиксами.
+        limit (int): Максимальное количество результатов.
+
+        Возвращает:
+        List[int]: Номера найденных книг.
+        """
+        if mode not in ("and", "or"):
+            raise ValueError("Режим поиска должен быть 'and' или 'or'!")
+        per_term = sorted((self._term_scores(term, prefix) for term in set(tokenize(query))), key=len)
+        if not per_term:
+            return []
+
+        if mode == "and":
+            candidates = set(per_term[0])
+            for scores in per_term[1:]:
+                candidates.intersection_update(scores)
+        else:
+            candidates = set().union(*per_term)
+        ranked = sorted(candidates, key=lambda doc_id: (-sum(s.get(doc_id, 0.0) for s in per_term), doc_id))
+        return ranked[:limit]
+
+    def search(self, query: str, mode: str = "and", prefix: bool = False, limit: int = 10) -> List[Book]:
+        """
+        Поиск книг; параметры как у search_ids.
+
+        Возвращает:
+        List[Book]: Найденные книги, восстановленные из индекса.
+        """
+        return [self.book(doc_id) for doc_id in self.search_ids(query, mode, prefix, limit)]
+
+    def book(self, doc_id: int) -> Book:
+        """
+        Восстановление книги по номеру.
+
+        Параметры:
+        doc_id (int): Номер книги в индексе.
+
+        Возвращает:
+        Book: Книга того же вида, что и добавленная.
+        """
+        kind, name, author, value = self.books[doc_id]
+        if kind == "paper":
+            return PaperBook(name, author, value)
+        if kind == "audio":
+            return AudioBook(name, author, value)
+        return Book(name, author)
+
+    def save(self, path: str) -> None:
+        """
+        Сохранение индекса на диск; файл заменяется атомарно.
+
+        Параметры:
+        path (str): Путь к файлу индекса.
+        """
+        state = (self.books, self.name_postings, self.author_postings)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BookIndex":
+        """
+        Загрузка индекса с диска без переиндексации.
+
+        Параметры:
+        path (str): Путь к файлу индекса.
+
+        Возвращает:
+        BookIndex: Загруженный индекс.
+        """
+        index = cls()
+        with open(path, "rb") as file:
+            index.books, index.name_postings, index.author_postings = pickle.load(file)
+        index._vocabulary_dirty = True
+        return index
+
+
+if __name__ == '__main__':
+    import doctest
+    import random
+    import tempfile
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    rnd = random.Random(0)
+    words = ["".join(rnd.choice("абвгдеёжзийклмнопрстуфхцчшщэюя") for _ in range(rnd.randint(3, 9)))
+             for _ in range(20_000)]
+    authors = [f"{rnd.choice(words).title()} {rnd.choice(words).title()}" for _ in range(20_000)]
+    count = 1_000_000
+
+    index = BookIndex()
+    start = default_timer()
+    for i in range(count):
+        name = " ".join(rnd.choice(words) for _ in range(rnd.randint(1, 4))).capitalize()
+        author = rnd.choice(authors)
+        index.add(PaperBook(name, author, rnd.randint(50, 900)) if i % 2 else
+                  AudioBook(name, author, rnd.uniform(0.5, 30.0)))
+    print(f"индексация {count} книг: {default_timer() - start:.1f} с")
+
+    queries = [" ".join(rnd.choice(words) for _ in range(2)) for _ in range(1000)]
+    for mode, prefix in (("and", False), ("or", False), ("and", True)):
+        start = default_timer()
+        for query in queries:
+            index.search_ids(query, mode=mode, prefix=prefix)
+        elapsed_ms = (default_timer() - start) / len(queries) * 1e3
+        print(f"запрос {mode}{', префиксы' if prefix else ''}: {elapsed_ms:.3f} мс")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "books.idx")
+        start = default_timer()
+        index.save(path)
+        print(f"сохранение: {default_timer() - start:.1f} с, {os.path.getsize(path) / 2 ** 20:.0f} МиБ")
+        start = default_timer()
+        loaded = BookIndex.load(path)
+        print(f"загрузка: {default_timer() - start:.1f} с")
+        assert loaded.search_ids(queries[0]) == index.search_ids(queries[0])
@@ -0,0 +1,288 @@
+import heapq
+import random
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from task01 import Bus, EBus, RouteTransport, Tram
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class RouteMetrics(NamedTuple):
+    """
+    Показатели загруженности маршрута.
+
+    Атрибуты:
+        route_number (str): Номер маршрута.
+        vehicles (int): Количество транспортных средств на маршруте.
+        passengers (int): Количество пассажиров, пришедших на остановки.
+        boarded (int): Количество пассажиров, севших в транспорт.
+        denied_boardings (int): Количество отказов в посадке (пассажир ждал, но мест не было).
+        mean_wait (float): Среднее время ожидания севших пассажиров в минутах.
+        mean_load_factor (float): Средняя заполненность при отправлении с остановки (доля вместимости).
+        max_load_factor (float): Максимальная заполненность.
+        full_departures (int): Количество отправлений с полностью заполненным салоном.
+    """
+    route_number: str
+    vehicles: int
+    passengers: int
+    boarded: int
+    denied_boardings: int
+    mean_wait: float
+    mean_load_factor: float
+    max_load_factor: float
+    full_departures: int
+
+
+def parse_time(value: str) -> int:
+    """
+    Переводит время вида "ЧЧ:ММ" в минуты от начала суток.
+
+    Returns:
+        int: Количество минут.
+
+    >>> parse_time("05:30")
+    330
+    """
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def service_window(vehicle: RouteTransport) -> Tuple[int, int]:
+    """
+    Время работы транспортного средства в минутах; окончание после полуночи переносится на следующие сутки.
+
+    Returns:
+        Tuple[int, int]: Начало и окончание работы.
+
+    >>> service_window(Tram("ГЭТ", "303-1", 100, (48.8566, 2.3522), "3", True, "05:30", "01:00", 2.25, True))
+    (330, 1500)
+    """
+    start, end = parse_time(vehicle.start_time), parse_time(vehicle.end_time)
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def check_route(n_stops: int, travel_time: float) -> None:
+    """
+    Проверка параметров маршрута: при нулевом времени в пути или одной остановке
+    события модели не продвигаются во времени.
+
+    Возбуждает:
+        ValueError: Если остановок меньше двух или время в пути не положительно.
+
+    >>> check_route(20, 0)
+    Traceback (most recent call last):
+    ...
+    ValueError: Время движения между остановками должно быть положительным.
+    >>> check_route(1, 3.0)
+    Traceback (most recent call last):
+    ...
+    ValueError: На маршруте должно быть не меньше двух остановок.
+    """
+    if n_stops < 2:
+        raise ValueError("На маршруте должно быть не меньше двух остановок.")
+    if not travel_time > 0:
+        raise ValueError("Время движения между остановками должно быть положительным.")
+
+
+def generate_demand(n_stops: int, count: int, start: float, end: float,
+                    rnd: random.Random) -> Tuple[List[array], List[array]]:
+    """
+    Случайные пассажиры маршрута: время прихода на остановку равномерно в интервале [start, end),
+    остановка назначения — любая дальше по маршруту.
+
+    Returns:
+        Tuple[List[array], List[array]]: Для каждой остановки отсортированные времена прихода и остановки назначения.
+    """
+    if n_stops < 2:
+        raise ValueError("На маршруте должно быть не меньше двух остановок.")
+    per_stop: List[List[Tuple[float, int]]] = [[] for _ in range(n_stops)]
+    uniform, randrange = rnd.uniform, rnd.randrange
+    for _ in range(count):
+        origin = randrange(n_stops - 1)
+        per_stop[origin].append((uniform(start, end), randrange(origin + 1, n_stops)))
+    times, destinations = [], []
+    for passengers in per_stop:
+        passengers.sort()
+        times.append(array('d', (t for t, _ in passengers)))
+        destinations.append(array('l', (d for _, d in passengers)))
+    return times, destinations
+
+
+def simulate_route(vehicles: List[RouteTransport], times: List[array], destinations: List[array],
+                   travel_time: float) -> RouteMetrics:
+    """
+    Событийная модель одного маршрута с учётом max_passenger_capacity.
+
+    Транспортные средства равномерно распределены по кругу рейсов и в пределах
+    своего времени работы ходят от первой остановки до последней, после чего
+    возвращаются к первой без пассажиров. Прибытия на остановки обрабатываются
+    в порядке времени через кучу. На остановке сначала выходят доехавшие
+    пассажиры, затем в порядке очереди садятся ожидающие, пока есть места;
+    каждый оставшийся в очереди пассажир даёт один отказ в посадке.
+
+    Параметры:
+        vehicles (List[RouteTransport]): Транспорт одного маршрута.
+        times (List[array]): Отсортированные времена прихода пассажиров для каждой остановки (минуты).
+        destinations (List[array]): Остановки назначения пассажиров.
+        travel_time (float): Время движения между соседними остановками в минутах.
+
+    Returns:
+        RouteMetrics: Показатели загруженности маршрута.
+
+    >>> bus = Bus("АП-3", "318И", 2, (55.7558, 37.6173), "А12", True, "06:00", "06:30", 55, 150)
+    >>> times = [array('d', [360, 360, 360]), array('d', [361]), array('d')]
+    >>> destinations = [array('l', [2, 2, 2]), array('l', [2]), array('l')]
+    >>> simulate_route([bus], times, destinations, travel_time=5)
+    RouteMetrics(route_number='А12', vehicles=1, passengers=4, boarded=4, denied_boardings=2, mean_wait=11.0, \
+mean_load_factor=0.875, max_load_factor=1.0, full_departures=3)
+    """
+    if not vehicles:
+        raise ValueError("На маршруте должно быть хотя бы одно транспортное средство.")
+    if len(times) != len(destinations):
+        raise ValueError("Количество остановок в times и destinations должно совпадать.")
+    n_stops = len(times)
+    check_route(n_stops, travel_time)
+    last = n_stops - 1
+    cycle = 2 * last * travel_time
+    headway = cycle / len(vehicles)
+
+    capacities = [vehicle.max_passenger_capacity for vehicle in vehicles]
+    if min(capacities) <= 0:
+        raise ValueError("Вместимость транспортного средства должна быть положительной.")
+    windows = [service_window(vehicle) for vehicle in vehicles]
+    events = [(start + i * headway, i, 0) for i, (start, _) in enumerate(windows)]
+    heapq.heapify(events)
+    loads = [0] * len(vehicles)
+    alighting = [[0] * n_stops for _ in vehicles]
+    prefix = [array('d', accumulate(stop_times, initial=0.0)) for stop_times in times]
+    next_waiting = [0] * n_stops
+
+    boarded = denied = departures = full_departures = 0
+    wait_sum = load_sum = max_load = 0.0
+    while events:
+        t, i, stop = heapq.heappop(events)
+        loads[i] -= alighting[i][stop]
+        alighting[i][stop] = 0
+        if stop == last:
+            next_start = t + last * travel_time
+            if next_start <= windows[i][1]:
+                heapq.heappush(events, (next_start, i, 0))
+            continue
+
+        first = next_waiting[stop]
+        waiting = bisect_right(times[stop], t, first) - first
+        taken = min(capacities[i] - loads[i], waiting)
+        denied += waiting - taken
+        if taken:
+            wait_sum += taken * t - (prefix[stop][first + taken] - prefix[stop][first])
+            counts = alighting[i]
+            for destination in destinations[stop][first:first + taken]:
+                counts[destination] += 1
+            loads[i] += taken
+            boarded += taken
+            next_waiting[stop] = first + taken
+
+        load_factor = loads[i] / capacities[i]
+        load_sum += load_factor
+        max_load = max(max_load, load_factor)
+        departures += 1
+        full_departures += loads[i] == capacities[i]
+        heapq.heappush(events, (t + travel_time, i, stop + 1))
+
+    return RouteMetrics(vehicles[0].route_number, len(vehicles), sum(map(len, times)), boarded, denied,
+                        wait_sum / boarded if boarded else 0.0, load_sum / departures if departures else 0.0,
+                        max_load, full_departures)
+
+
+def _simulate_job(job: Tuple[List[RouteTransport], int, int, float, int]) -> RouteMetrics:
+    vehicles, passengers, n_stops, travel_time, seed = job
+    windows = [service_window(vehicle) for vehicle in vehicles]
+    rnd = random.Random(f"{seed}:{vehicles[0].route_number}")
+    times, destinations = generate_demand(n_stops, passengers, min(w[0] for w in windows),
+                                          max(w[1] for w in windows), rnd)
+    return simulate_route(vehicles, times, destinations, travel_time)
+
+
+def simulate_network(fleet: Iterable[RouteTransport], demand: Dict[str, int], n_stops: int = 20,
+                     travel_time: float = 3.0, seed: int = 0, workers: Optional[int] = None) -> Dict[str, RouteMetrics]:
+    """
+    Моделирование всех маршрутов; маршруты независимы и считаются в параллельных процессах.
+
+    Пассажиры генерируются внутри процесса маршрута, поэтому между процессами
+    передаются только транспортные средства и итоговые показатели.
+
+    Параметры:
+        fleet (Iterable[RouteTransport]): Автобусы, трамваи и электробусы.
+        demand (Dict[str, int]): Количество пассажиров за сутки для каждого номера маршрута.
+        n_stops (int): Количество остановок на маршруте.
+        travel_time (float): Время между соседними остановками в минутах.
+        seed (int): Начальное значение генератора случайных чисел.
+        workers (int): Количество процессов; 1 — без пула процессов.
+
+    Returns:
+        Dict[str, RouteMetrics]: Показатели по номерам маршрутов.
+
+    Возбуждает:
+        ValueError: Если остановок меньше двух или время в пути не положительно.
+
+    >>> simulate_network([], {}, travel_time=0, workers=1)
+    Traceback (most recent call last):
+    ...
+    ValueError: Время движения между остановками должно быть положительным.
+    """
+    check_route(n_stops, travel_time)
+    routes: Dict[str, List[RouteTransport]] = defaultdict(list)
+    for vehicle in fleet:
+        routes[vehicle.route_number].append(vehicle)
+    jobs = [(vehicles, demand.get(route, 0), n_stops, travel_time, seed) for route, vehicles in routes.items()]
+    if workers == 1:
+        results = map(_simulate_job, jobs)
+        return {metrics.route_number: metrics for metrics in results}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return {metrics.route_number: metrics for metrics in pool.map(_simulate_job, jobs)}
+
+
+if __name__ == "__main__":
+    import doctest
+    import os
+    import sys
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    total_passengers = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rnd = random.Random(0)
+    fleet = []
+    for r in range(30):
+        kind = r % 3
+        for n in range(rnd.randint(4, 12)):
+            common = (f"П{r}", f"{r}-{n}", (59.9386, 30.3141))
+            if kind == 0:
+                fleet.append(Bus(common[0], common[1], 60, common[2], f"А{r}", False, "05:30", "00:30", 45.0, 150.0))
+            elif kind == 1:
+                fleet.append(Tram(common[0], common[1], 120, common[2], f"Т{r}", True, "06:00", "23:00", 45.0, True))
+            else:
+                fleet.append(EBus(common[0], common[1], 50, common[2], f"Э{r}", False, "06:00", "22:00", 45.0,
+                                  False, 90.0))
+    routes = sorted({vehicle.route_number for vehicle in fleet})
+    demand = {route: total_passengers // len(routes) for route in routes}
+
+    for workers in (1, None):
+        start = default_timer()
+        metrics = simulate_network(fleet, demand, workers=workers)
+        elapsed = default_timer() - start
+        print(f"{sum(demand.values())} пассажиров, {len(routes)} маршрутов, процессов {workers or os.cpu_count()}: "
+              f"{elapsed:.1f} с ({sum(demand.values()) / elapsed / 1e6:.2f} млн пассажиров/с)")
+
+    print(f"{'маршрут':>8} {'ТС':>3} {'отказы':>8} {'ожидание':>9} {'загрузка':>9} {'полные':>7}")
+    for route in sorted(metrics, key=lambda r: -metrics[r].denied_boardings)[:10]:
+        m = metrics[route]
+        print(f"{route:>8} {m.vehicles:>3} {m.denied_boardings:>8} {m.mean_wait:>8.1f}м {m.mean_load_factor:>9.2f} "
+              f"{m.full_departures:>7}")
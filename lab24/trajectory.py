@@ -0,0 +1,274 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from task01 import Transport
+
+COORDINATE_SCALE = 1_000_000  # координаты хранятся целыми микроградусами
+DEFAULT_SEGMENT_SIZE = 1024
+
+Point = Tuple[int, float, float]  # (время, широта, долгота)
+
+
+def encode_column(values: Iterable[int]) -> bytes:
+    """
+    Кодирование столбца целых чисел: разности соседних значений, zigzag и varint.
+
+    Returns:
+        bytes: Закодированный столбец.
+
+    >>> encode_column([1000, 1001, 1001, 999]).hex()
+    'd00f020003'
+    """
+    out = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        n = (delta << 1) ^ (delta >> 63)  # zigzag: небольшие по модулю разности дают короткие коды
+        while n >= 0x80:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+    return bytes(out)
+
+
+def decode_column(data: bytes, count: int) -> array:
+    """
+    Декодирование столбца, закодированного encode_column.
+
+    Returns:
+        array: Значения столбца.
+
+    >>> list(decode_column(bytes.fromhex('d00f020003'), 4))
+    [1000, 1001, 1001, 999]
+    """
+    values = array('q', bytes(8 * count))
+    previous = position = 0
+    for i in range(count):
+        n = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += (n >> 1) ^ -(n & 1)
+        values[i] = previous
+    return values
+
+
+class Segment(NamedTuple):
+    """
+    Закрытый сегмент траектории одного транспортного средства.
+
+    Атрибуты:
+        count (int): Количество точек.
+        t_min, t_max (int): Границы времени.
+        lat_min, lat_max, lon_min, lon_max (int): Границы координат в микроградусах.
+        times, lats, lons (bytes): Закодированные столбцы.
+    """
+    count: int
+    t_min: int
+    t_max: int
+    lat_min: int
+    lat_max: int
+    lon_min: int
+    lon_max: int
+    times: bytes
+    lats: bytes
+    lons: bytes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.times) + len(self.lats) + len(self.lons)
+
+    def decode(self) -> Tuple[array, array, array]:
+        return (decode_column(self.times, self.count), decode_column(self.lats, self.count),
+                decode_column(self.lons, self.count))
+
+
+class TrajectoryStore:
+    """
+    Хранилище истории координат транспорта.
+
+    Точки (время, широта, долгота) каждого fleet_number дописываются в
+    открытый буфер; когда в нём набирается segment_size точек, он
+    закрывается в сегмент из трёх сжатых столбцов с индексом минимумов и
+    максимумов. Запросы по интервалу времени и по прямоугольнику координат
+    декодируют только сегменты, пересекающие условие.
+
+    >>> store = TrajectoryStore(segment_size=2)
+    >>> for t, (lat, lon) in enumerate([(55.75, 37.61), (55.76, 37.62), (55.77, 37.63)]):
+    ...     store.append("318И", t, lat, lon)
+    >>> store.query("318И", 1, 2)
+    [(1, 55.76, 37.62), (2, 55.77, 37.63)]
+    >>> list(store.scan_bbox(55.755, 55.8, 37.0, 38.0))
+    [('318И', 1, 55.76, 37.62), ('318И', 2, 55.77, 37.63)]
+    """
+
+    def __init__(self, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        """
+        Инициализирует пустое хранилище.
+
+        Параметры:
+            segment_size (int): Количество точек в сегменте.
+        """
+        if segment_size <= 0:
+            raise ValueError("Размер сегмента должен быть положительным.")
+        self.segment_size = segment_size
+        self.segments: Dict[str, List[Segment]] = {}
+        self._t_max: Dict[str, List[int]] = {}  # t_max сегментов для двоичного поиска по времени
+        self._buffers: Dict[str, Tuple[array, array, array]] = {}
+
+    def append(self, fleet_number: str, timestamp: int, lat: float, lon: float) -> None:
+        """
+        Добавляет точку траектории; время точек одного транспортного средства не должно убывать.
+
+        Возбуждает:
+            ValueError: Если время точки меньше времени предыдущей.
+        """
+        buffer = self._buffers.get(fleet_number)
+        if buffer is None:
+            buffer = self._buffers[fleet_number] = (array('q'), array('q'), array('q'))
+            self.segments.setdefault(fleet_number, [])
+            self._t_max.setdefault(fleet_number, [])
+        times, lats, lons = buffer
+        last = times[-1] if times else (self._t_max[fleet_number][-1] if self._t_max[fleet_number] else None)
+        if last is not None and timestamp < last:
+            raise ValueError("Время точек траектории не должно убывать.")
+        times.append(timestamp)
+        lats.append(round(lat * COORDINATE_SCALE))
+        lons.append(round(lon * COORDINATE_SCALE))
+        if len(times) >= self.segment_size:
+            self._seal(fleet_number)
+
+    def record(self, vehicle: Transport, timestamp: int, coordinates: Optional[Tuple[float, float]] = None) -> None:
+        """
+        Сохраняет текущие координаты транспортного средства (или обновляет их на coordinates).
+        """
+        if coordinates is not None:
+            vehicle.coordinates = coordinates
+        self.append(vehicle.fleet_number, timestamp, *vehicle.coordinates)
+
+    def _seal(self, fleet_number: str) -> None:
+        times, lats, lons = self._buffers.pop(fleet_number)
+        self.segments[fleet_number].append(Segment(
+            len(times), times[0], times[-1], min(lats), max(lats), min(lons), max(lons),
+            encode_column(times), encode_column(lats), encode_column(lons)))
+        self._t_max[fleet_number].append(times[-1])
+
+    def flush(self) -> None:
+        """
+        Закрывает все открытые буферы в сегменты.
+        """
+        for fleet_number in list(self._buffers):
+            if self._buffers[fleet_number][0]:
+                self._seal(fleet_number)
+            else:
+                del self._buffers[fleet_number]
+
+    def _blocks(self, fleet_number: str, t_start: int) -> Iterator[Tuple[Optional[Segment], Optional[tuple]]]:
+        segments = self.segments.get(fleet_number, [])
+        for segment in segments[bisect_left(self._t_max.get(fleet_number, []), t_start):]:
+            yield segment, None
+        buffer = self._buffers.get(fleet_number)
+        if buffer is not None and buffer[0]:
+            yield None, buffer
+
+    def query(self, fleet_number: str, t_start: int, t_end: int) -> List[Point]:
+        """
+        Точки траектории в интервале времени [t_start, t_end].
+
+        Returns:
+            List[Point]: Точки (время, широта, долгота) в порядке времени.
+        """
+        result = []
+        for segment, buffer in self._blocks(fleet_number, t_start):
+            if segment is not None:
+                if segment.t_min > t_end:
+                    break
+                buffer = segment.decode()
+            times, lats, lons = buffer
+            lo, hi = bisect_left(times, t_start), bisect_left(times, t_end + 1)
+            result.extend((times[i], lats[i] / COORDINATE_SCALE, lons[i] / COORDINATE_SCALE) for i in range(lo, hi))
+        return result
+
+    def scan_bbox(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float,
+                  t_start: Optional[int] = None,
+                  t_end: Optional[int] = None) -> Iterator[Tuple[str, int, float, float]]:
+        """
+        Все точки внутри прямоугольника координат (и, если задан, интервала времени).
+
+        Сегменты, чьи границы не пересекают прямоугольник, пропускаются без декодирования.
+
+        Returns:
+            Iterator[Tuple[str, int, float, float]]: (fleet_number, время, широта, долгота).
+        """
+        la0, la1 = round(lat_min * COORDINATE_SCALE), round(lat_max * COORDINATE_SCALE)
+        lo0, lo1 = round(lon_min * COORDINATE_SCALE), round(lon_max * COORDINATE_SCALE)
+        t0 = t_start if t_start is not None else -2 ** 63
+        t1 = t_end if t_end is not None else 2 ** 63 - 1
+        for fleet_number in self.segments:
+            for segment, buffer in self._blocks(fleet_number, t0):
+                if segment is not None:
+                    if segment.t_min > t1:
+                        break
+                    if segment.lat_max < la0 or segment.lat_min > la1 or segment.lon_max < lo0 \
+                            or segment.lon_min > lo1:
+                        continue
+                    buffer = segment.decode()
+                for t, lat, lon in zip(*buffer):
+                    if t0 <= t <= t1 and la0 <= lat <= la1 and lo0 <= lon <= lo1:
+                        yield fleet_number, t, lat / COORDINATE_SCALE, lon / COORDINATE_SCALE
+
+    def __len__(self) -> int:
+        return sum(segment.count for segments in self.segments.values() for segment in segments) + \
+            sum(len(buffer[0]) for buffer in self._buffers.values())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Размер сжатых сегментов и открытых буферов в байтах.
+        """
+        return sum(segment.nbytes for segments in self.segments.values() for segment in segments) + \
+            sum(3 * 8 * len(buffer[0]) for buffer in self._buffers.values())
+
+
+if __name__ == "__main__":
+    import doctest
+    import random
+    import sys
+    from timeit import default_timer
+
+    doctest.testmod()
+
+    vehicles, points_per_vehicle = 100, int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rnd = random.Random(0)
+    store = TrajectoryStore()
+    start = default_timer()
+    for v in range(vehicles):
+        lat, lon = 59.9386 + rnd.uniform(-0.2, 0.2), 30.3141 + rnd.uniform(-0.3, 0.3)
+        t = 1_700_000_000
+        for _ in range(points_per_vehicle):
+            t += rnd.randint(1, 10)
+            lat += rnd.uniform(-0.0003, 0.0003)
+            lon += rnd.uniform(-0.0005, 0.0005)
+            store.append(f"{v:05d}", t, lat, lon)
+    store.flush()
+    elapsed = default_timer() - start
+    raw = len(store) * 3 * 8  # время и координаты как 64-битные значения
+    print(f"{len(store)} точек: запись {len(store) / elapsed:.0f} точек/с, "
+          f"{store.nbytes / len(store):.2f} байт на точку, сжатие {raw / store.nbytes:.1f}x")
+
+    queries = [(f"{rnd.randrange(vehicles):05d}", 1_700_000_000 + rnd.randrange(points_per_vehicle * 5))
+               for _ in range(200)]
+    start = default_timer()
+    found = sum(len(store.query(fleet, t, t + 600)) for fleet, t in queries)
+    print(f"запрос 10 минут траектории: {(default_timer() - start) / len(queries) * 1e3:.2f} мс, "
+          f"в среднем {found / len(queries):.0f} точек")
+
+    start = default_timer()
+    found = sum(1 for _ in store.scan_bbox(59.90, 59.98, 30.25, 30.38))
+    print(f"поиск в прямоугольнике: {default_timer() - start:.2f} с, {found} точек")